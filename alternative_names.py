@@ -0,0 +1,132 @@
+import argparse
+import asyncio
+import csv
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from config import Config
+from db import init_db
+from logic import upload as upload_module
+
+
+BATCH_SIZE = 10000
+# Columns of csv file, district and street are empty for localities
+COLUMNS = (
+    "type",
+    "code",
+    "region",
+    "area",
+    "locality",
+    "district",
+    "street",
+    "alternative_name",
+)
+PATH_COLUMNS = COLUMNS[1:-1]
+PATH_SIZES = {"locality": 4, "street": 6}
+
+
+def normalize_name(name: str) -> str:
+    """
+    Strip name and collapse whitespaces in it.
+
+    :param name: Name
+    :type name: str
+    :return: Normalized name
+    :rtype: str
+    """
+
+    return " ".join(name.split())
+
+
+def read_names(lines: Iterable[str]) -> Iterator[Tuple[str, Tuple]]:
+    """
+    Generator of alternative names from lines of csv file with header.
+
+    :param lines: Lines of csv file with COLUMNS separated by semicolon
+    :type lines: Iterable[str]
+    :raise ValueError: Type of row isn't supported
+    :return: Type of record and its path with alternative name
+    :rtype: Iterator[Tuple[str, Tuple]]
+    """
+
+    rows = csv.reader(lines, delimiter=";")
+    next(rows)  # Just skip first (header) line
+
+    for row in rows:
+        if not row:
+            continue
+
+        values = dict(zip(COLUMNS, map(normalize_name, row)))
+        address_type = values["type"]
+
+        if (path_size := PATH_SIZES.get(address_type)) is None:
+            raise ValueError(f"Unknown type of alternative name: {row}")
+
+        path = tuple(values[column] for column in PATH_COLUMNS[:path_size])
+
+        yield address_type, (*path, values["alternative_name"])
+
+
+async def main(filename: str, *, batch_size: int = BATCH_SIZE) -> None:
+    """
+    Add alternative names of localities and streets from csv file
+    and bump data version, so search results aren't served from caches.
+
+    :param filename: Path of csv file
+    :type filename: str
+    :param batch_size: Count of names added by one statement
+    :type batch_size: int
+    """
+
+    config = Config.load_config()
+    db_pool = await init_db(config=config)
+    counts: Dict[str, int] = dict.fromkeys(PATH_SIZES, 0)
+
+    with open(filename, encoding="utf-8", newline="") as csv_file:
+        names = read_names(csv_file)
+
+        async with db_pool.acquire() as conn:
+            async with conn.transaction():
+                while batch := list(islice(names, batch_size)):
+                    by_type: Dict[str, List[Tuple]] = {}
+
+                    for address_type, values in batch:
+                        by_type.setdefault(address_type, []).append(values)
+
+                    for address_type, values in by_type.items():
+                        added = await upload_module.bulk_add_alternative_names(
+                            conn, address_type=address_type, names=values
+                        )
+                        counts[address_type] += added
+
+                version = await upload_module.bump_data_version(conn)
+
+    await db_pool.close()
+
+    print(
+        f"Added {counts['locality']} alternative names of localities "
+        f"and {counts['street']} alternative names of streets"
+    )
+    print(f"Data version is bumped to {version}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Add alternative names of localities and streets"
+    )
+    parser.add_argument(
+        "filename",
+        help="Csv file separated by semicolon with columns: "
+        + ", ".join(COLUMNS),
+    )
+    parser.add_argument(
+        "--batch-size",
+        help="Count of names added by one statement",
+        type=int,
+        default=BATCH_SIZE,
+    )
+
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(
+        main(args.filename, batch_size=args.batch_size)
+    )
@@ -0,0 +1,455 @@
+import argparse
+import asyncio
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import functools
+import gc
+import json
+import os
+from os import makedirs, path
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Dict, Iterator, Optional
+
+from aiohttp.test_utils import TestClient, TestServer
+from asyncpg.connection import Connection
+from asyncpg.pool import PoolConnectionProxy
+
+from benchmarks.dataset import write_dataset
+from config import UPLOADS_DIR, Config
+from logic import api
+import main as application
+import upload
+
+
+RESULTS_DIR = path.join(UPLOADS_DIR, "benchmarks")
+DATASET_DIR = path.join(UPLOADS_DIR, "synthetic-api")
+# Fixed hierarchy seeded once, its first locality is used by all cases
+SEED_SHAPE = {
+    "regions": 2,
+    "areas": 2,
+    "localities": 3,
+    "streets": 8,
+    "houses": 30,
+    "seed": 0,
+}
+SEED_LOCALITY = "Село 0-0-0"
+FULL_HOUSES = 50
+QUERY_METHODS = (
+    "execute",
+    "executemany",
+    "fetch",
+    "fetchrow",
+    "fetchval",
+    "cursor",
+)
+TRACED_CALLS = 20
+
+IDS_SQL = """
+SELECT
+    region.country_id,
+    area.region_id,
+    locality.area_id,
+    district.locality_id,
+    street.district_id,
+    house.street_id,
+    house.id AS house_id
+FROM locality
+    JOIN area ON area.id = locality.area_id
+    JOIN region ON region.id = area.region_id
+    JOIN district ON district.locality_id = locality.id
+    JOIN street ON street.district_id = district.id
+    JOIN house ON house.street_id = street.id
+WHERE locality.name = $1
+ORDER BY street.id, house.id
+LIMIT 1
+"""
+HOUSE_IDS_SQL = """
+SELECT house.id
+FROM house
+    JOIN street ON street.id = house.street_id
+    JOIN district ON district.id = street.district_id
+WHERE district.locality_id = $1
+ORDER BY house.id
+LIMIT $2
+"""
+
+Call = Callable[[], Awaitable]
+
+
+@contextmanager
+def count_queries() -> Iterator[Counter]:
+    """
+    Context manager to count statements sent by connections.
+
+    :return: Counter of statements by method of connection
+    :rtype: Iterator[Counter]
+    """
+
+    counter = Counter()
+    originals = {name: getattr(Connection, name) for name in QUERY_METHODS}
+
+    def wrap(name: str, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            counter[name] += 1
+            return method(*args, **kwargs)
+
+        return wrapper
+
+    for name, method in originals.items():
+        setattr(Connection, name, wrap(name, method))
+
+    try:
+        yield counter
+    finally:
+        for name, method in originals.items():
+            setattr(Connection, name, method)
+
+
+async def measure(call: Call, *, repeat: int, warmup: int) -> dict:
+    """
+    Measure wall and CPU time, statements and memory of call.
+
+    :param call: Coroutine function to measure
+    :type call: Call
+    :param repeat: Count of measured calls
+    :type repeat: int
+    :param warmup: Count of calls before measuring
+    :type warmup: int
+    :return: Per call wall and CPU time in microseconds, statements,
+        peak traced memory in KiB and retained memory blocks
+    :rtype: dict
+    """
+
+    for _ in range(warmup):
+        await call()
+
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+
+    with count_queries() as queries:
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+
+        for _ in range(repeat):
+            await call()
+
+        cpu_seconds = time.process_time() - cpu_started
+        seconds = time.perf_counter() - started
+
+    gc.collect()
+    retained_blocks = sys.getallocatedblocks() - blocks
+    peak = 0
+
+    for _ in range(TRACED_CALLS):
+        tracemalloc.start()
+
+        try:
+            await call()
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "wall_us": round(seconds / repeat * 1e6, 1),
+        "cpu_us": round(cpu_seconds / repeat * 1e6, 1),
+        "queries": round(sum(queries.values()) / repeat, 2),
+        "peak_kib": round(peak / 1024, 1),
+        "retained_blocks": round(retained_blocks / repeat, 2),
+    }
+
+
+async def seed(conn: PoolConnectionProxy) -> dict:
+    """
+    Upload fixed synthetic hierarchy if it isn't uploaded yet
+    and get ids of its records.
+
+    :param conn: Connection to database
+    :type conn: PoolConnectionProxy
+    :return: Ids of records of the first locality of hierarchy
+    :rtype: dict
+    """
+
+    if (ids := await conn.fetchrow(IDS_SQL, SEED_LOCALITY)) is None:
+        dataset = write_dataset(DATASET_DIR, **SEED_SHAPE)
+        await upload.main(
+            "Ukrposhta",
+            url=f"file://{path.abspath(dataset['zip'])}",
+            bulk=True,
+            force=True,
+            quiet=True,
+            progress_interval=float("inf"),
+        )
+        ids = await conn.fetchrow(IDS_SQL, SEED_LOCALITY)
+
+    house_ids = await conn.fetch(
+        HOUSE_IDS_SQL, ids["locality_id"], FULL_HOUSES
+    )
+
+    return {**ids, "house_ids": [record["id"] for record in house_ids]}
+
+
+def endpoint_cases(client: TestClient, ids: dict) -> Dict[str, Call]:
+    """
+    Make cases of requests to handlers of views.
+
+    :param client: Test client of application
+    :type client: TestClient
+    :param ids: Ids of seeded records
+    :type ids: dict
+    :return: Cases by name
+    :rtype: Dict[str, Call]
+    """
+
+    paths = {
+        "/countries": "/countries",
+        "/regions/country-{id}": f"/regions/country-{ids['country_id']}",
+        "/areas/region-{id}": f"/areas/region-{ids['region_id']}",
+        "/localities/area-{id}": f"/localities/area-{ids['area_id']}",
+        "/locality/{id}": f"/locality/{ids['locality_id']}",
+        "/districts/locality-{id}": (
+            f"/districts/locality-{ids['locality_id']}"
+        ),
+        "/streets/locality-{id}": f"/streets/locality-{ids['locality_id']}",
+        "/streets/district-{id}": f"/streets/district-{ids['district_id']}",
+        "/street/{id}": f"/street/{ids['street_id']}",
+        "/houses/street-{id}": f"/houses/street-{ids['street_id']}",
+        "/houses/street-{id}?q=1": f"/houses/street-{ids['street_id']}?q=1",
+        "/house/{id}": f"/house/{ids['house_id']}",
+        "/house/{id}/full": f"/house/{ids['house_id']}/full",
+        "/autocomplete/street": (
+            f"/autocomplete/street?locality_id={ids['locality_id']}&q=вул"
+        ),
+    }
+
+    async def get(request_path: str) -> None:
+        async with client.get(request_path) as response:
+            await response.read()
+
+            if response.status != 200:
+                raise ValueError(f"{request_path}: {response.status}")
+
+    async def post_full_addresses() -> None:
+        async with client.post(
+            "/houses/full", json=ids["house_ids"]
+        ) as response:
+            await response.read()
+
+    cases = {
+        name: functools.partial(get, request_path)
+        for name, request_path in paths.items()
+    }
+    cases["POST /houses/full"] = post_full_addresses
+
+    return cases
+
+
+def function_cases(conn: PoolConnectionProxy, ids: dict) -> Dict[str, Call]:
+    """
+    Make cases of calls of query functions of logic.api.
+
+    :param conn: Connection to database
+    :type conn: PoolConnectionProxy
+    :param ids: Ids of seeded records
+    :type ids: dict
+    :return: Cases by name
+    :rtype: Dict[str, Call]
+    """
+
+    async def full_addresses() -> None:
+        async with conn.transaction():
+            async for _ in api.get_full_addresses_by_houses(
+                conn, house_ids=ids["house_ids"]
+            ):
+                pass
+
+    return {
+        "get_all_countries": functools.partial(api.get_all_countries, conn),
+        "get_locality": functools.partial(
+            api.get_locality, conn, locality_id=ids["locality_id"]
+        ),
+        "get_all_streets_in_locality": functools.partial(
+            api.get_all_streets_in_locality,
+            conn,
+            locality_id=ids["locality_id"],
+        ),
+        "get_all_houses_in_street": functools.partial(
+            api.get_all_houses_in_street, conn, street_id=ids["street_id"]
+        ),
+        "get_full_address_by_house": functools.partial(
+            api.get_full_address_by_house, conn, house_id=ids["house_id"]
+        ),
+        "get_full_address_by_house(flat=True)": functools.partial(
+            api.get_full_address_by_house,
+            conn,
+            house_id=ids["house_id"],
+            flat=True,
+        ),
+        "get_full_addresses_by_houses": full_addresses,
+    }
+
+
+def current_commit() -> Optional[str]:
+    """
+    Get short hash of current git commit.
+
+    :return: Hash or None out of git repository
+    :rtype: Optional[str]
+    """
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: dict, baseline: Optional[dict] = None) -> None:
+    """
+    Print results with change of CPU time against baseline results.
+
+    :param results: Results of benchmark
+    :type results: dict
+    :param baseline: Results of another commit
+    :type baseline: Optional[dict]
+    """
+
+    print(
+        f"{'case':40} {'wall us':>9} {'cpu us':>9} {'queries':>8} "
+        f"{'peak KiB':>9} {'blocks':>7} {'cpu diff':>9}"
+    )
+
+    for group in ("endpoints", "functions"):
+        for name, result in results[group].items():
+            diff = ""
+
+            if baseline and (base := baseline[group].get(name)):
+                change = result["cpu_us"] / base["cpu_us"] - 1
+                diff = f"{change:+.1%}"
+
+            print(
+                f"{name:40} {result['wall_us']:9} {result['cpu_us']:9} "
+                f"{result['queries']:8} {result['peak_kib']:9} "
+                f"{result['retained_blocks']:7} {diff:>9}"
+            )
+
+
+async def main(
+    *,
+    repeat: int,
+    warmup: int,
+    response_cache: bool,
+    output: Optional[str],
+    compare: Optional[str],
+) -> None:
+    """
+    Measure handlers of views and query functions with seeded database
+    and store results as json.
+
+    :param repeat: Count of measured calls of every case
+    :type repeat: int
+    :param warmup: Count of calls before measuring
+    :type warmup: int
+    :param response_cache: Keep response cache enabled
+    :type response_cache: bool
+    :param output: Path of json results, named by commit by default
+    :type output: Optional[str]
+    :param compare: Path of json results to compare with
+    :type compare: Optional[str]
+    """
+
+    if not response_cache:
+        os.environ["RESPONSE_CACHE_SIZE"] = "0"
+
+    app = await application.init_app(config=Config.load_config())
+    commit = current_commit()
+    results = {
+        "commit": commit,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "response_cache": response_cache,
+        "endpoints": {},
+        "functions": {},
+    }
+
+    async with TestClient(TestServer(app)) as client:
+        async with app["db"].acquire() as conn:
+            ids = await seed(conn)
+
+            for name, call in function_cases(conn, ids).items():
+                results["functions"][name] = await measure(
+                    call, repeat=repeat, warmup=warmup
+                )
+
+        for name, call in endpoint_cases(client, ids).items():
+            results["endpoints"][name] = await measure(
+                call, repeat=repeat, warmup=warmup
+            )
+
+    baseline = None
+
+    if compare:
+        with open(compare) as file:
+            baseline = json.load(file)
+
+    print_results(results, baseline)
+
+    output = output or path.join(RESULTS_DIR, f"api-{commit or 'local'}.json")
+    makedirs(path.dirname(output) or ".", exist_ok=True)
+
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2, ensure_ascii=False)
+
+    print(f"\nResults are written to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure api handlers and query functions with "
+        "seeded database of DB_URL"
+    )
+    parser.add_argument(
+        "-n",
+        "--repeat",
+        help="Count of measured calls of every case",
+        type=int,
+        default=200,
+    )
+    parser.add_argument(
+        "--warmup",
+        help="Count of calls before measuring",
+        type=int,
+        default=20,
+    )
+    parser.add_argument(
+        "--response-cache",
+        help="Keep response cache enabled",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-o", "--output", help="Path of json results, named by commit"
+    )
+    parser.add_argument(
+        "--compare", help="Path of json results of another commit"
+    )
+
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(
+        main(
+            repeat=args.repeat,
+            warmup=args.warmup,
+            response_cache=args.response_cache,
+            output=args.output,
+            compare=args.compare,
+        )
+    )
@@ -0,0 +1,187 @@
+import argparse
+import csv
+from os import makedirs, path
+import random
+from typing import Iterator, List
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from config import UPLOADS_DIR
+
+
+DATASET_DIR = path.join(UPLOADS_DIR, "synthetic")
+HEADER = (
+    "Область",
+    "Район",
+    "Населений пункт",
+    "Поштовий індекс",
+    "Вулиця",
+    "Будинки",
+)
+STREET_NAMES = (
+    "вул. Шевченка",
+    "вул. Лесі Українки",
+    "вул. Франка",
+    "просп. Перемоги",
+    "пров. Садовий",
+    "вул. Соборна",
+    "вул. Незалежності",
+    "бульв. Миру",
+)
+MEMBER_NAME = "houses.csv"
+ENCODING = "cp1251"
+
+
+def generate_rows(
+    *,
+    regions: int,
+    areas: int,
+    localities: int,
+    streets: int,
+    houses: int,
+    seed: int = 0,
+) -> Iterator[List[str]]:
+    """
+    Generator of csv rows in format of Ukrposhta source, one row
+    is a street with list of its houses.
+
+    :param regions: Count of regions
+    :type regions: int
+    :param areas: Count of areas per region
+    :type areas: int
+    :param localities: Count of localities per area
+    :type localities: int
+    :param streets: Count of streets per locality
+    :type streets: int
+    :param houses: Max count of houses per street, count of every street
+        is random from 1 to it
+    :type houses: int
+    :param seed: Seed of random counts of houses
+    :type seed: int
+    :return: Csv row
+    :rtype: Iterator[List[str]]
+    """
+
+    rand = random.Random(seed)
+    index = 0
+
+    for region in range(regions):
+        for area in range(areas):
+            for locality in range(localities):
+                for street in range(streets):
+                    name = STREET_NAMES[street % len(STREET_NAMES)]
+                    count = rand.randint(1, houses)
+                    numbers = [
+                        f"{number}" if number % 7 else f"{number}А"
+                        for number in range(1, count + 1)
+                    ]
+
+                    yield [
+                        f"Область {region}",
+                        f"Район {region}-{area}",
+                        f"Село {region}-{area}-{locality}",
+                        f"{index % 100000:05}",
+                        f"{name} {street}",
+                        ",".join(numbers),
+                    ]
+
+                    index += 1
+
+
+def write_dataset(directory: str = DATASET_DIR, **shape) -> dict:
+    """
+    Write generated rows to houses.csv and houses.zip archive
+    of directory.
+
+    :param directory: Directory of dataset
+    :type directory: str
+    :param shape: Params of generate_rows
+    :return: Paths of csv and zip files and counts of rows and houses
+    :rtype: dict
+    """
+
+    makedirs(directory, exist_ok=True)
+    csv_path = path.join(directory, MEMBER_NAME)
+    zip_path = path.join(directory, "houses.zip")
+    rows_count = 0
+    houses_count = 0
+
+    with open(csv_path, "w", encoding=ENCODING, newline="") as csv_file:
+        writer = csv.writer(csv_file, delimiter=";")
+        writer.writerow(HEADER)
+
+        for row in generate_rows(**shape):
+            writer.writerow(row)
+            rows_count += 1
+            houses_count += row[5].count(",") + 1
+
+    with ZipFile(zip_path, "w", compression=ZIP_DEFLATED) as zip_file:
+        zip_file.write(csv_path, arcname=MEMBER_NAME)
+
+    return {
+        "csv": csv_path,
+        "zip": zip_path,
+        "rows": rows_count,
+        "houses": houses_count,
+    }
+
+
+def add_shape_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add arguments of dataset shape to parser.
+
+    :param parser: Parser of command line arguments
+    :type parser: argparse.ArgumentParser
+    """
+
+    parser.add_argument(
+        "--regions", help="Count of regions", type=int, default=5
+    )
+    parser.add_argument(
+        "--areas", help="Count of areas per region", type=int, default=10
+    )
+    parser.add_argument(
+        "--localities",
+        help="Count of localities per area",
+        type=int,
+        default=20,
+    )
+    parser.add_argument(
+        "--streets",
+        help="Count of streets per locality",
+        type=int,
+        default=10,
+    )
+    parser.add_argument(
+        "--houses",
+        help="Max count of houses per street",
+        type=int,
+        default=20,
+    )
+    parser.add_argument(
+        "--seed", help="Seed of random counts", type=int, default=0
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic dataset in Ukrposhta format"
+    )
+    parser.add_argument(
+        "-o", "--output", help="Directory of dataset", default=DATASET_DIR
+    )
+    add_shape_arguments(parser)
+
+    args = parser.parse_args()
+    dataset = write_dataset(
+        args.output,
+        regions=args.regions,
+        areas=args.areas,
+        localities=args.localities,
+        streets=args.streets,
+        houses=args.houses,
+        seed=args.seed,
+    )
+    print(
+        f"{dataset['rows']} rows with {dataset['houses']} houses "
+        f"are written to {dataset['zip']}"
+    )
@@ -0,0 +1,79 @@
+import argparse
+import json
+import timeit
+
+from asyncpg.protocol.protocol import _create_record
+
+from utils.json_serializer import perfect_json_serializer, to_json_bytes
+
+
+def legacy_to_json(data) -> bytes:
+    """Previous implementation of utils.json_serializer.to_json."""
+
+    return json.dumps(data, indent=4, default=perfect_json_serializer).encode(
+        "utf-8"
+    )
+
+
+def make_streets(count: int) -> list:
+    """
+    Make list of street records like the ones fetched by asyncpg.
+
+    :param count: Count of records
+    :type count: int
+    :return: List of records
+    :rtype: list
+    """
+
+    mapping = {"id": 0, "district_id": 1, "name": 2}
+
+    return [
+        _create_record(mapping, (number, 42, f"вул. Шевченка {number}"))
+        for number in range(count)
+    ]
+
+
+def main(*, rows: int, repeat: int) -> None:
+    """
+    Compare previous and current json serializers.
+
+    :param rows: Count of records in response
+    :type rows: int
+    :param repeat: Count of serializations
+    :type repeat: int
+    """
+
+    data = make_streets(rows)
+    cases = {
+        "legacy (indent=4, default hook)": lambda: legacy_to_json(data),
+        "to_json_bytes": lambda: to_json_bytes(data),
+        "to_json_bytes(pretty=True)": lambda: to_json_bytes(data, pretty=True),
+    }
+
+    print(f"{rows} records, {repeat} serializations")
+
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=repeat, repeat=5))
+        print(
+            f"{name:35} {seconds / repeat * 1e6:10.1f} us/response "
+            f"{len(case()):8} bytes"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark json serialization of records"
+    )
+    parser.add_argument(
+        "-r", "--rows", help="Count of records", type=int, default=200
+    )
+    parser.add_argument(
+        "-n",
+        "--repeat",
+        help="Count of serializations",
+        type=int,
+        default=1000,
+    )
+
+    args = parser.parse_args()
+    main(rows=args.rows, repeat=args.repeat)
@@ -0,0 +1,437 @@
+import argparse
+import asyncio
+from os import environ, getenv, path
+import random
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+from benchmarks.dataset import DATASET_DIR, add_shape_arguments, write_dataset
+from config import Config
+from db import init_db
+from db.schema import data_versions, metadata
+import upload
+
+
+# Path template of endpoint and table of ids put to it
+ENDPOINTS: Tuple[Tuple[str, Optional[str]], ...] = (
+    ("/countries", None),
+    ("/regions/country-{id}", "country"),
+    ("/areas/region-{id}", "region"),
+    ("/localities/area-{id}", "area"),
+    ("/streets/locality-{id}", "locality"),
+    ("/houses/street-{id}", "street"),
+    ("/house/{id}/full", "house"),
+    ("/autocomplete/street?locality_id={id}&q=вул", "locality"),
+)
+SAMPLE_SIZE = 1000
+# Tables which are truncated before upload of every mode, materialized
+# views are refreshed by upload and data version is only bumped by it
+RESET_TABLES = tuple(
+    table.name
+    for table in metadata.sorted_tables
+    if not table.info.get("is_view") and table is not data_versions
+)
+PERCENTILES = (50, 95, 99)
+STARTUP_TIMEOUT = 30.0
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """
+    Get percentile of values by nearest rank.
+
+    :param values: Sorted values
+    :type values: List[float]
+    :param percent: Percent from 0 to 100
+    :type percent: float
+    :return: Value of percentile
+    :rtype: float
+    """
+
+    rank = max(int(round(percent / 100 * len(values))), 1)
+
+    return values[min(rank, len(values)) - 1]
+
+
+async def reset_database() -> None:
+    """Delete addresses uploaded to benchmark database by previous mode."""
+
+    db_pool = await init_db(config=Config.load_config())
+
+    try:
+        async with db_pool.acquire() as conn:
+            await conn.execute(
+                f"TRUNCATE {', '.join(RESET_TABLES)} RESTART IDENTITY CASCADE"
+            )
+    finally:
+        await db_pool.close()
+
+
+async def benchmark_upload(
+    *, zip_path: str, houses: int, mode: str, batch_size: int
+) -> float:
+    """
+    Upload dataset through upload.py and count rate of houses.
+
+    :param zip_path: Path of dataset archive
+    :type zip_path: str
+    :param houses: Count of houses in dataset
+    :type houses: int
+    :param mode: Upload mode: plain, bulk or pipeline
+    :type mode: str
+    :param batch_size: Count of address rows in one batch
+    :type batch_size: int
+    :return: Houses per second
+    :rtype: float
+    """
+
+    started = time.perf_counter()
+    await upload.main(
+        "Ukrposhta",
+        url=f"file://{path.abspath(zip_path)}",
+        force=True,
+        quiet=True,
+        progress_interval=float("inf"),
+        batch_size=batch_size,
+        bulk=mode == "bulk",
+        pipeline=mode == "pipeline",
+    )
+
+    return houses / (time.perf_counter() - started)
+
+
+async def sample_ids(*, size: int) -> Dict[str, List[int]]:
+    """
+    Get random ids of records of every table used in endpoints.
+
+    :param size: Max count of ids of every table
+    :type size: int
+    :return: Ids by table
+    :rtype: Dict[str, List[int]]
+    """
+
+    db_pool = await init_db(config=Config.load_config())
+    tables = {table for _, table in ENDPOINTS if table is not None}
+    ids = {}
+
+    try:
+        async with db_pool.acquire() as conn:
+            for table in tables:
+                records = await conn.fetch(
+                    f"SELECT id FROM {table} ORDER BY random() LIMIT $1", size
+                )
+                ids[table] = [record["id"] for record in records]
+    finally:
+        await db_pool.close()
+
+    return ids
+
+
+async def wait_server(url: str, *, timeout: float = STARTUP_TIMEOUT) -> None:
+    """
+    Wait until server answers requests.
+
+    :param url: Base url of server
+    :type url: str
+    :param timeout: Max seconds of waiting
+    :type timeout: float
+    :raise TimeoutError: Server doesn't answer
+    """
+
+    deadline = time.monotonic() + timeout
+
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(f"{url}/stats") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientConnectionError:
+                pass
+
+            await asyncio.sleep(0.2)
+
+    raise TimeoutError(f"Server {url} doesn't answer")
+
+
+async def benchmark_endpoint(
+    session: aiohttp.ClientSession,
+    *,
+    url: str,
+    template: str,
+    ids: List[int],
+    requests: int,
+    concurrency: int,
+) -> dict:
+    """
+    Send requests to endpoint by concurrent clients.
+
+    :param session: Http client session
+    :type session: aiohttp.ClientSession
+    :param url: Base url of server
+    :type url: str
+    :param template: Path template of endpoint
+    :type template: str
+    :param ids: Ids to put to path template
+    :type ids: List[int]
+    :param requests: Count of requests
+    :type requests: int
+    :param concurrency: Count of concurrent clients
+    :type concurrency: int
+    :return: Rate of requests, errors and latency percentiles in ms
+    :rtype: dict
+    """
+
+    rand = random.Random(template)
+    paths = [
+        template.format(id=rand.choice(ids) if ids else 0)
+        for _ in range(requests)
+    ]
+    latencies: List[float] = []
+    errors = 0
+
+    async def client() -> None:
+        nonlocal errors
+
+        while paths:
+            request_path = paths.pop()
+            started = time.perf_counter()
+
+            async with session.get(f"{url}{request_path}") as response:
+                await response.read()
+
+            latencies.append(time.perf_counter() - started)
+
+            if response.status != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    seconds = time.perf_counter() - started
+    latencies.sort()
+
+    return {
+        "requests_per_second": round(requests / seconds, 1),
+        "errors": errors,
+        **{
+            f"p{percent}": round(percentile(latencies, percent) * 1000, 2)
+            for percent in PERCENTILES
+        },
+    }
+
+
+async def benchmark_api(
+    *, port: int, workers: int, requests: int, concurrency: int
+) -> Dict[str, dict]:
+    """
+    Run application in subprocess and send requests to every endpoint.
+
+    :param port: Port of application
+    :type port: int
+    :param workers: Count of application workers
+    :type workers: int
+    :param requests: Count of requests to every endpoint
+    :type requests: int
+    :param concurrency: Count of concurrent clients
+    :type concurrency: int
+    :return: Results by endpoint
+    :rtype: Dict[str, dict]
+    """
+
+    ids = await sample_ids(size=SAMPLE_SIZE)
+    url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "main.py",
+            "--host=127.0.0.1",
+            f"--port={port}",
+            f"--workers={workers}",
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    results = {}
+
+    try:
+        await wait_server(url)
+        connector = aiohttp.TCPConnector(limit=concurrency)
+
+        async with aiohttp.ClientSession(connector=connector) as session:
+            for template, table in ENDPOINTS:
+                results[template] = await benchmark_endpoint(
+                    session,
+                    url=url,
+                    template=template,
+                    ids=ids.get(table, []),
+                    requests=requests,
+                    concurrency=concurrency,
+                )
+    finally:
+        server.terminate()
+        server.wait()
+
+    return results
+
+
+async def main(
+    *,
+    db_url: str,
+    shape: dict,
+    output: str,
+    modes: List[str],
+    batch_size: int,
+    skip_upload: bool,
+    port: int,
+    workers: int,
+    requests: int,
+    concurrency: int,
+) -> None:
+    """
+    Generate dataset, upload it by every mode to empty benchmark
+    database and benchmark api with uploaded addresses.
+
+    :param db_url: Url of benchmark database, its addresses are deleted
+    :type db_url: str
+    :param shape: Params of dataset shape
+    :type shape: dict
+    :param output: Directory of dataset
+    :type output: str
+    :param modes: Upload modes
+    :type modes: List[str]
+    :param batch_size: Count of address rows in one batch
+    :type batch_size: int
+    :param skip_upload: Benchmark api with addresses in database
+    :type skip_upload: bool
+    :param port: Port of application
+    :type port: int
+    :param workers: Count of application workers
+    :type workers: int
+    :param requests: Count of requests to every endpoint
+    :type requests: int
+    :param concurrency: Count of concurrent clients
+    :type concurrency: int
+    """
+
+    # Upload, sampling of ids and application subprocess use DB_URL
+    environ["DB_URL"] = db_url
+
+    if not skip_upload:
+        dataset = write_dataset(output, **shape)
+        print(f"Dataset: {dataset['rows']} rows, {dataset['houses']} houses")
+
+        for mode in modes:
+            await reset_database()
+            rate = await benchmark_upload(
+                zip_path=dataset["zip"],
+                houses=dataset["houses"],
+                mode=mode,
+                batch_size=batch_size,
+            )
+            print(f"Upload {mode:10} {rate:12.1f} rows/s")
+
+    results = await benchmark_api(
+        port=port, workers=workers, requests=requests, concurrency=concurrency
+    )
+
+    print(
+        f"\n{requests} requests by {concurrency} clients "
+        f"to {workers} workers"
+    )
+    print(
+        f"{'endpoint':45} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'errors':>7}"
+    )
+
+    for template, result in results.items():
+        print(
+            f"{template:45} {result['requests_per_second']:9} "
+            f"{result['p50']:8} {result['p95']:8} {result['p99']:8} "
+            f"{result['errors']:7}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Upload synthetic dataset to benchmark database "
+        "and benchmark api with it"
+    )
+    parser.add_argument(
+        "--db-url",
+        help="Url of benchmark database, addresses in it are deleted "
+        "before upload by every mode, BENCHMARK_DB_URL env variable "
+        "by default",
+        default=getenv("BENCHMARK_DB_URL"),
+    )
+    parser.add_argument(
+        "-o", "--output", help="Directory of dataset", default=DATASET_DIR
+    )
+    add_shape_arguments(parser)
+    parser.add_argument(
+        "--modes",
+        help="Comma separated upload modes: plain, bulk, pipeline",
+        default="bulk",
+    )
+    parser.add_argument(
+        "--batch-size",
+        help="Count of address rows in one batch",
+        type=int,
+        default=upload.BATCH_SIZE,
+    )
+    parser.add_argument(
+        "--skip-upload",
+        help="Benchmark api with addresses which are in database",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--port", help="Port of application", type=int, default=8090
+    )
+    parser.add_argument(
+        "-w", "--workers", help="Count of workers", type=int, default=1
+    )
+    parser.add_argument(
+        "-n",
+        "--requests",
+        help="Count of requests to every endpoint",
+        type=int,
+        default=1000,
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        help="Count of concurrent clients",
+        type=int,
+        default=10,
+    )
+
+    args = parser.parse_args()
+
+    if not args.db_url:
+        parser.error(
+            "Benchmark database should be set by --db-url "
+            "or BENCHMARK_DB_URL env variable, it is truncated"
+        )
+
+    asyncio.get_event_loop().run_until_complete(
+        main(
+            db_url=args.db_url,
+            shape={
+                "regions": args.regions,
+                "areas": args.areas,
+                "localities": args.localities,
+                "streets": args.streets,
+                "houses": args.houses,
+                "seed": args.seed,
+            },
+            output=args.output,
+            modes=args.modes.split(","),
+            batch_size=args.batch_size,
+            skip_upload=args.skip_upload,
+            port=args.port,
+            workers=args.workers,
+            requests=args.requests,
+            concurrency=args.concurrency,
+        )
+    )
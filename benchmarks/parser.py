@@ -0,0 +1,191 @@
+import argparse
+from itertools import islice
+import time
+import tracemalloc
+from typing import Callable, Iterator, List
+
+from benchmarks.dataset import add_shape_arguments, generate_rows
+from logic.delta import normalize_row
+from source.ukrposhta import Ukrposhta
+
+
+class LegacyEntity:
+    """Previous implementation of logic.entities.AddressEntity."""
+
+    def __init__(self, **attributes):
+        for name, value in attributes.items():
+            setattr(self, name, value)
+
+    def __setattr__(self, key, value):
+        super().__setattr__(
+            key, value.strip() if isinstance(value, str) else value
+        )
+
+
+def legacy_format_row(row: dict) -> dict:
+    """
+    Previous implementation of Ukrposhta._format_row with entities
+    which have __dict__ and trim strings on every assignment.
+
+    :param row: Raw source row
+    :type row: dict
+    :return: Formatted row
+    :rtype: dict
+    """
+
+    return {
+        "Country": LegacyEntity(name="Україна", code="UA"),
+        "Region": LegacyEntity(
+            name=row["region"], country_id=None, geoip_name=""
+        ),
+        "Area": LegacyEntity(name=row["area"], region_id=None),
+        "Locality": LegacyEntity(name=row["locality"], area_id=None),
+        "District": LegacyEntity(name="-", locality_id=None),
+        "Street": LegacyEntity(name=row["street"], district_id=None),
+        "House": LegacyEntity(
+            number=row["house"], street_id=None, index=row["index"]
+        ),
+    }
+
+
+def legacy_formatted_rows(csv_rows: List[List[str]]) -> Iterator[dict]:
+    """
+    Generator of formatted rows of previous entities.
+
+    :param csv_rows: Csv rows
+    :type csv_rows: List[List[str]]
+    :return: Formatted row
+    :rtype: Iterator[dict]
+    """
+
+    for csv_row in csv_rows:
+        for row in Ukrposhta._split_row(csv_row=csv_row):
+            yield legacy_format_row(row)
+
+
+def formatted_rows(csv_rows: List[List[str]]) -> Iterator[dict]:
+    """
+    Generator of formatted rows of current entities, like the ones
+    of get_address_rows.
+
+    :param csv_rows: Csv rows
+    :type csv_rows: List[List[str]]
+    :return: Formatted row
+    :rtype: Iterator[dict]
+    """
+
+    for csv_row in csv_rows:
+        for row in Ukrposhta._split_row(csv_row=csv_row):
+            yield Ukrposhta._format_row(row=row)
+
+
+def legacy_parse_batch(csv_rows: List[List[str]]) -> List[tuple]:
+    """
+    Previous implementation of Ukrposhta.parse_batch which normalized
+    formatted rows of entities.
+
+    :param csv_rows: Csv rows
+    :type csv_rows: List[List[str]]
+    :return: Normalized rows
+    :rtype: List[tuple]
+    """
+
+    return [normalize_row(row) for row in legacy_formatted_rows(csv_rows)]
+
+
+def measure(
+    case: Callable[[List[List[str]]], object],
+    csv_rows: List[List[str]],
+    *,
+    houses: int,
+    batch_rows: int,
+) -> dict:
+    """
+    Measure throughput of parser over all rows by batches and memory
+    of results of one batch.
+
+    :param case: Function which parses csv rows to list or generator
+    :type case: Callable[[List[List[str]]], object]
+    :param csv_rows: Csv rows
+    :type csv_rows: List[List[str]]
+    :param houses: Count of houses in csv rows
+    :type houses: int
+    :param batch_rows: Count of csv rows in batch
+    :type batch_rows: int
+    :return: Houses per second and bytes per house of kept batch
+    :rtype: dict
+    """
+
+    rows = iter(csv_rows)
+    started = time.perf_counter()
+
+    while batch := list(islice(rows, batch_rows)):
+        for _ in case(batch):
+            pass
+
+    seconds = time.perf_counter() - started
+    tracemalloc.start()
+    kept = list(case(csv_rows[:batch_rows]))
+    kept_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "houses_per_second": houses / seconds,
+        "bytes_per_house": kept_bytes / len(kept),
+    }
+
+
+def main(*, shape: dict, batch_rows: int) -> None:
+    """
+    Compare previous and current entities and parsers of upload.
+
+    :param shape: Params of dataset shape
+    :type shape: dict
+    :param batch_rows: Count of csv rows in batch
+    :type batch_rows: int
+    """
+
+    csv_rows = list(generate_rows(**shape))
+    houses = sum(row[5].count(",") + 1 for row in csv_rows)
+    cases = {
+        "legacy formatted rows": legacy_formatted_rows,
+        "formatted rows": formatted_rows,
+        "legacy parse_batch": legacy_parse_batch,
+        "parse_batch": Ukrposhta.parse_batch,
+    }
+
+    print(f"{len(csv_rows)} csv rows, {houses} houses")
+
+    for name, case in cases.items():
+        result = measure(case, csv_rows, houses=houses, batch_rows=batch_rows)
+        print(
+            f"{name:25} {result['houses_per_second']:12.0f} houses/s "
+            f"{result['bytes_per_house']:8.0f} bytes/house"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark throughput and memory of upload parser"
+    )
+    add_shape_arguments(parser)
+    parser.set_defaults(houses=400)
+    parser.add_argument(
+        "--batch-rows",
+        help="Count of csv rows in batch",
+        type=int,
+        default=100,
+    )
+
+    args = parser.parse_args()
+    main(
+        shape={
+            "regions": args.regions,
+            "areas": args.areas,
+            "localities": args.localities,
+            "streets": args.streets,
+            "houses": args.houses,
+            "seed": args.seed,
+        },
+        batch_rows=args.batch_rows,
+    )
@@ -0,0 +1,181 @@
+import argparse
+import asyncio
+import time
+import timeit
+from typing import Awaitable, Callable, Dict, Optional
+
+from asyncpg.pool import PoolConnectionProxy
+from asyncpgsa import compile_query
+from sqlalchemy.sql import select
+
+from config import Config
+from db import init_db
+from db.schema import districts, houses, streets
+from logic import api
+
+
+def legacy_all_streets_in_locality(
+    *, locality_id: int, limit: int = 0, after_id: Optional[int] = None
+):
+    """Previous query of logic.api.get_all_streets_in_locality."""
+
+    join = streets.join(districts, streets.c.district_id == districts.c.id)
+    sql = (
+        select([streets])
+        .select_from(join)
+        .where(districts.c.locality_id == locality_id)
+    )
+
+    if after_id is not None:
+        sql = sql.where(streets.c.id > after_id)
+
+    return sql.order_by(streets.c.id).limit(api.page_size(limit))
+
+
+def legacy_full_address_by_house(*, house_id: int):
+    """Previous query of logic.api.get_full_address_by_house."""
+
+    return api._full_address_select().where(houses.c.id == house_id)
+
+
+def compile_cases(*, locality_id: int, house_id: int) -> Dict[str, Callable]:
+    """
+    Make cases which prepare sql and arguments of one request.
+
+    :param locality_id: Id of locality
+    :type locality_id: int
+    :param house_id: Id of house
+    :type house_id: int
+    :return: Cases by name
+    :rtype: Dict[str, Callable]
+    """
+
+    streets_query = api.ALL_STREETS_IN_LOCALITY_QUERY
+    full_address_query = api.FULL_ADDRESS_QUERY
+    page_params = api._page_params(0, None)
+
+    return {
+        "legacy get_all_streets_in_locality": lambda: compile_query(
+            legacy_all_streets_in_locality(locality_id=locality_id)
+        ),
+        "registry get_all_streets_in_locality": lambda: (
+            streets_query.statement(locality_id=locality_id, **page_params)
+        ),
+        "legacy get_full_address_by_house": lambda: compile_query(
+            legacy_full_address_by_house(house_id=house_id)
+        ),
+        "registry get_full_address_by_house": lambda: (
+            full_address_query.statement(house_id=house_id)
+        ),
+    }
+
+
+def request_cases(
+    *, locality_id: int, house_id: int
+) -> Dict[str, Callable[[PoolConnectionProxy], Awaitable]]:
+    """
+    Make cases which fetch results of one request from database.
+
+    :param locality_id: Id of locality
+    :type locality_id: int
+    :param house_id: Id of house
+    :type house_id: int
+    :return: Cases by name
+    :rtype: Dict[str, Callable[[PoolConnectionProxy], Awaitable]]
+    """
+
+    return {
+        "legacy get_all_streets_in_locality": lambda conn: conn.fetch(
+            legacy_all_streets_in_locality(locality_id=locality_id)
+        ),
+        "registry get_all_streets_in_locality": lambda conn: (
+            api.get_all_streets_in_locality(conn, locality_id=locality_id)
+        ),
+        "legacy get_full_address_by_house": lambda conn: conn.fetchrow(
+            legacy_full_address_by_house(house_id=house_id)
+        ),
+        "registry get_full_address_by_house": lambda conn: (
+            api.get_full_address_by_house(conn, house_id=house_id)
+        ),
+    }
+
+
+async def benchmark_requests(*, repeat: int) -> None:
+    """
+    Print CPU time of process per request with database.
+
+    :param repeat: Count of requests
+    :type repeat: int
+    """
+
+    config = Config.load_config()
+    db_pool = await init_db(config=config)
+
+    async with db_pool.acquire() as conn:
+        locality_id = await conn.fetchval(
+            "SELECT locality_id FROM district ORDER BY id LIMIT 1"
+        )
+        house_id = await conn.fetchval(
+            "SELECT id FROM house ORDER BY id LIMIT 1"
+        )
+
+        if locality_id is None or house_id is None:
+            print("Database is empty, upload addresses at first")
+            return
+
+        print(f"{repeat} requests to database")
+
+        for name, case in request_cases(
+            locality_id=locality_id, house_id=house_id
+        ).items():
+            await case(conn)
+            started = time.process_time()
+
+            for _ in range(repeat):
+                await case(conn)
+
+            seconds = time.process_time() - started
+            print(f"{name:40} {seconds / repeat * 1e6:10.1f} us CPU/request")
+
+    await db_pool.close()
+
+
+def main(*, repeat: int, db: bool) -> None:
+    """
+    Compare per-request CPU time of building and compiling queries
+    with precompiled queries of registry.
+
+    :param repeat: Count of requests
+    :type repeat: int
+    :param db: Run requests against database of DB_URL too
+    :type db: bool
+    """
+
+    print(f"{repeat} preparations of query")
+
+    for name, case in compile_cases(locality_id=42, house_id=42).items():
+        seconds = min(timeit.repeat(case, number=repeat, repeat=5))
+        print(f"{name:40} {seconds / repeat * 1e6:10.1f} us/request")
+
+    if db:
+        print()
+        asyncio.get_event_loop().run_until_complete(
+            benchmark_requests(repeat=repeat)
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark precompiled queries against compiled ones"
+    )
+    parser.add_argument(
+        "-n", "--repeat", help="Count of requests", type=int, default=1000,
+    )
+    parser.add_argument(
+        "--db",
+        help="Run requests against database of DB_URL too",
+        action="store_true",
+    )
+
+    args = parser.parse_args()
+    main(repeat=args.repeat, db=args.db)
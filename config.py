@@ -1,5 +1,6 @@
 from os import getenv
 from pathlib import Path
+from typing import Optional
 
 
 BASE_PATH = Path(__file__).parent.parent.resolve()
@@ -10,6 +11,16 @@ class Config:
     """Base application configuration class"""
 
     APP_NAME = "address_api"
+    CACHE_CONTROL = {
+        "default": "no-cache",
+        "hierarchy": "public, max-age=86400",
+        "street": "public, max-age=3600",
+        "house": "public, max-age=3600",
+        "autocomplete": "public, max-age=3600",
+        "postcode": "public, max-age=3600",
+        "stats": "no-store",
+        "metrics": "no-store",
+    }
 
     def __init__(self, **kwargs):
         for attribute, value in kwargs.items():
@@ -32,6 +43,84 @@ class Config:
 
         raise ValueError("You should set DB_URL env variable")
 
+    @property
+    def db_params(self) -> dict:
+        """Property to get params of db connection pool"""
+
+        return self.get_db_params()
+
+    @property
+    def workers(self) -> int:
+        """Property to get count of application worker processes"""
+
+        return int(getenv("WEB_CONCURRENCY", "1"))
+
+    @property
+    def use_uvloop(self) -> bool:
+        """Property to get if uvloop event loop is used when installed"""
+
+        return getenv("USE_UVLOOP", "1") == "1"
+
+    @property
+    def data_version_poll_interval(self) -> float:
+        """Property to get interval in seconds between data version checks"""
+
+        return float(getenv("DATA_VERSION_POLL_INTERVAL", "30"))
+
+    @property
+    def response_cache_size(self) -> int:
+        """Property to get max count of responses in response cache"""
+
+        return int(getenv("RESPONSE_CACHE_SIZE", "10000"))
+
+    @property
+    def response_cache_max_bytes(self) -> int:
+        """Property to get max size of response cache in bytes"""
+
+        return int(getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+    @property
+    def response_cache_ttl(self) -> float:
+        """Property to get time to live of cached responses in seconds"""
+
+        return float(getenv("RESPONSE_CACHE_TTL", "3600"))
+
+    @property
+    def metrics_dir(self) -> Optional[str]:
+        """
+        Property to get directory shared by workers to merge their metrics,
+        metrics of the worker only are exposed if it isn't set
+        """
+
+        return getenv("METRICS_DIR") or None
+
+    @property
+    def metrics_export_interval(self) -> float:
+        """Property to get interval in seconds between writes of metrics"""
+
+        return float(getenv("METRICS_EXPORT_INTERVAL", "5"))
+
+    @property
+    def use_address_flat(self) -> bool:
+        """
+        Property to get if full addresses are read from address_flat
+        materialized view instead of joining all levels of address
+        """
+
+        return getenv("USE_ADDRESS_FLAT", "1") == "1"
+
+    @property
+    def cache_control(self) -> dict:
+        """
+        Property to get Cache-Control header values by class of route.
+        Every value can be overridden by CACHE_CONTROL_{CLASS} env variable.
+        """
+
+        return {
+            name: getenv(f"CACHE_CONTROL_{name.upper()}", value)
+            for name, value in self.CACHE_CONTROL.items()
+        }
+
     def load_params(self) -> dict:
         """
         Load all configuration params
@@ -62,6 +151,39 @@ class Config:
         return config.load_params()
 
     def get_db_params(self) -> dict:
-        """Get all db params"""
+        """
+        Get all db params. Every param can be overridden by env variable:
+        DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_MAX_QUERIES,
+        DB_POOL_MAX_INACTIVE_LIFETIME, DB_STATEMENT_CACHE_SIZE
+        and DB_COMMAND_TIMEOUT (no timeout if it is empty).
+        If DB_MAX_CONNECTIONS is set, pool max size is divided
+        between workers by default.
+
+        :return: Params of asyncpg pool
+        :rtype: dict
+        """
+
+        command_timeout = getenv("DB_COMMAND_TIMEOUT", "")
+        max_size = 10
+
+        if max_connections := getenv("DB_MAX_CONNECTIONS"):
+            max_size = max(1, int(max_connections) // self.workers)
 
-        return {}
+        max_size = int(getenv("DB_POOL_MAX_SIZE", str(max_size)))
+
+        return {
+            "min_size": int(
+                getenv("DB_POOL_MIN_SIZE", str(min(10, max_size)))
+            ),
+            "max_size": max_size,
+            "max_queries": int(getenv("DB_POOL_MAX_QUERIES", "50000")),
+            "max_inactive_connection_lifetime": float(
+                getenv("DB_POOL_MAX_INACTIVE_LIFETIME", "300")
+            ),
+            "statement_cache_size": int(
+                getenv("DB_STATEMENT_CACHE_SIZE", "100")
+            ),
+            "command_timeout": (
+                float(command_timeout) if command_timeout else None
+            ),
+        }
@@ -1,9 +1,10 @@
-from typing import Any
+from typing import Any, Union
 
-import asyncpgsa
-from asyncpg.pool import Pool
 from sqlalchemy import create_engine
 
+from db.pool import InstrumentedPool
+from db.snapshot import URL_PREFIX as SNAPSHOT_URL_PREFIX, SnapshotPool
+
 
 NAMING_CONVECTION = {
     "all_column_names": lambda constraint, table: "_".join(
@@ -17,21 +18,27 @@ NAMING_CONVECTION = {
 }
 
 
-async def init_db(*, config: dict) -> Pool:
+async def init_db(*, config: dict) -> Union[InstrumentedPool, SnapshotPool]:
     """
-    Initiate db connection.
+    Initiate db connection, sqlite:///path url opens read-only snapshot
+    exported by snapshot.py.
 
     :param config: Application configuration
     :type config: dict
     :raise: ValueError - wrong db connection url
     :return: Pool of db connection
-    :rtype: Pool
+    :rtype: Union[InstrumentedPool, SnapshotPool]
     """
 
     db_url = config["db_url"]
 
     if db_url.startswith("postgresql"):
-        return await asyncpgsa.create_pool(dsn=db_url)
+        return await InstrumentedPool.create(
+            dsn=db_url, **config.get("db_params", {})
+        )
+
+    if db_url.startswith(SNAPSHOT_URL_PREFIX):
+        return SnapshotPool.open(db_url.replace(SNAPSHOT_URL_PREFIX, "", 1))
 
     raise ValueError("Wrong db connection")
 
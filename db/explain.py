@@ -0,0 +1,180 @@
+import argparse
+import asyncio
+from typing import Any, List
+
+from asyncpg.pool import PoolConnectionProxy
+from asyncpgsa import compile_query
+
+from config import Config
+from db import init_db
+from logic import api
+
+
+def _biggest_parent_query(table_name: str, parent_column: str) -> str:
+    """
+    Make query which finds the parent with the most children.
+
+    :param table_name: Name of children table
+    :type table_name: str
+    :param parent_column: Name of column with parent id
+    :type parent_column: str
+    :return: Raw sql
+    :rtype: str
+    """
+
+    return f"""
+        SELECT {parent_column} FROM {table_name}
+        GROUP BY 1 ORDER BY count(*) DESC LIMIT 1
+    """
+
+
+# Substring search functions with parent id parameter and query
+# which finds the parent with the most children (the worst case)
+SUBSTRING_QUERIES = (
+    (api.get_countries_by_substring, None, None),
+    (
+        api.get_regions_in_country_by_substring,
+        "country_id",
+        _biggest_parent_query("region", "country_id"),
+    ),
+    (
+        api.get_areas_in_region_by_substring,
+        "region_id",
+        _biggest_parent_query("area", "region_id"),
+    ),
+    (api.get_localities_by_substring, None, None),
+    (
+        api.get_localities_in_area_by_substring,
+        "area_id",
+        _biggest_parent_query("locality", "area_id"),
+    ),
+    (
+        api.get_districts_in_locality_by_substring,
+        "locality_id",
+        _biggest_parent_query("district", "locality_id"),
+    ),
+    (
+        api.get_streets_in_district_by_substring,
+        "district_id",
+        _biggest_parent_query("street", "district_id"),
+    ),
+    (
+        api.get_streets_in_locality_by_substring,
+        "locality_id",
+        """
+        SELECT district.locality_id
+        FROM street JOIN district ON street.district_id = district.id
+        GROUP BY 1 ORDER BY count(*) DESC LIMIT 1
+        """,
+    ),
+    (
+        api.get_houses_in_street_by_substring,
+        "street_id",
+        _biggest_parent_query("house", "street_id"),
+    ),
+)
+
+
+class ExplainConnection:
+    """
+    Connection wrapper which explains queries instead of fetching results.
+    """
+
+    def __init__(self, conn: PoolConnectionProxy):
+        self._conn = conn
+        self.plans: List[str] = []
+
+    async def fetch(self, query: Any, *args) -> list:
+        """
+        Explain query with analyze and save plan.
+
+        :param query: SQLAlchemy query or raw sql
+        :type query: Any
+        :return: Empty list of records
+        :rtype: list
+        """
+
+        sql, params = compile_query(query)
+        plan = await self._conn.fetch(
+            f"EXPLAIN (ANALYZE, BUFFERS) {sql}", *(params or args)
+        )
+        self.plans.append("\n".join(record[0] for record in plan))
+
+        return []
+
+    async def fetchrow(self, query: Any, *args) -> None:
+        """
+        Explain query with analyze and save plan.
+
+        :param query: SQLAlchemy query or raw sql
+        :type query: Any
+        """
+
+        await self.fetch(query, *args)
+
+
+async def main(*, substring: str, limit: int, strict: bool) -> int:
+    """
+    Print plans of all substring search queries.
+
+    :param substring: Substring to search
+    :type substring: str
+    :param limit: Limit of search results
+    :type limit: int
+    :param strict: Fail if any query scans whole table
+    :type strict: bool
+    :return: Exit code
+    :rtype: int
+    """
+
+    config = Config.load_config()
+    db_pool = await init_db(config=config)
+    sequential_scans = 0
+
+    async with db_pool.acquire() as conn:
+        for function, parent_param, parent_query in SUBSTRING_QUERIES:
+            params = {"substring": substring, "limit": limit}
+
+            if parent_param is not None:
+                params[parent_param] = await conn.fetchval(parent_query) or 0
+
+            explain_conn = ExplainConnection(conn)
+            await function(explain_conn, **params)
+
+            for plan in explain_conn.plans:
+                has_seq_scan = "Seq Scan" in plan
+                sequential_scans += has_seq_scan
+                print(f"=== {function.__name__}({params})")
+                print(plan)
+                print("Sequential scan!" if has_seq_scan else "Index scan")
+                print()
+
+    await db_pool.close()
+
+    return 1 if strict and sequential_scans else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Explain substring search queries"
+    )
+    parser.add_argument(
+        "-q", "--substring", help="Substring to search", default="шев"
+    )
+    parser.add_argument(
+        "-l", "--limit", help="Limit of search results", type=int, default=0
+    )
+    parser.add_argument(
+        "--strict",
+        help="Fail if any query scans whole table",
+        action="store_true",
+    )
+
+    args = parser.parse_args()
+    exit(
+        asyncio.run(
+            main(
+                substring=args.substring, limit=args.limit, strict=args.strict
+            )
+        )
+    )
@@ -0,0 +1,48 @@
+"""Add address flat view
+
+Revision ID: 7aeb8b68f3cc
+Revises: a7812f4832e1
+Create Date: 2026-10-18 09:22:10.742346
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7aeb8b68f3cc"
+down_revision = "a7812f4832e1"
+branch_labels = None
+depends_on = None
+
+
+ADDRESS_FLAT_SELECT = """
+SELECT
+    house.id AS house_id,
+    country.name AS country,
+    region.name AS region,
+    area.name AS area,
+    locality.name AS locality,
+    district.name AS district,
+    street.name AS street,
+    house.number AS house,
+    house.index AS index
+FROM house
+    JOIN street ON house.street_id = street.id
+    JOIN district ON street.district_id = district.id
+    JOIN locality ON district.locality_id = locality.id
+    JOIN area ON locality.area_id = area.id
+    JOIN region ON area.region_id = region.id
+    JOIN country ON region.country_id = country.id
+"""
+
+
+def upgrade():
+    op.execute(f"CREATE MATERIALIZED VIEW address_flat AS {ADDRESS_FLAT_SELECT}")
+    # Unique index is required to refresh view concurrently
+    op.execute(
+        "CREATE UNIQUE INDEX ix__address_flat__house_id "
+        "ON address_flat (house_id)"
+    )
+
+
+def downgrade():
+    op.execute("DROP MATERIALIZED VIEW address_flat")
@@ -0,0 +1,53 @@
+"""Add postcode street view
+
+Revision ID: 917f14296c75
+Revises: d74f06f6bc3d
+Create Date: 2026-10-18 10:23:43.562726
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "917f14296c75"
+down_revision = "d74f06f6bc3d"
+branch_labels = None
+depends_on = None
+
+
+# Id of the first house of street with postcode is used to paginate
+# the view. It changes when that house is deleted or moved to other
+# street, so pages read across a refresh may skip or repeat rows
+POSTCODE_STREET_SELECT = """
+SELECT
+    min(house.id) AS id,
+    house.index AS index,
+    locality.id AS locality_id,
+    locality.name AS locality,
+    street.id AS street_id,
+    street.name AS street,
+    count(*) AS houses
+FROM house
+    JOIN street ON house.street_id = street.id
+    JOIN district ON street.district_id = district.id
+    JOIN locality ON district.locality_id = locality.id
+GROUP BY house.index, locality.id, street.id
+"""
+
+
+def upgrade():
+    op.execute(
+        f"CREATE MATERIALIZED VIEW postcode_street AS {POSTCODE_STREET_SELECT}"
+    )
+    # Unique index is required to refresh view concurrently
+    op.execute(
+        "CREATE UNIQUE INDEX ix__postcode_street__id ON postcode_street (id)"
+    )
+    # Pattern operator class serves both exact and prefix search by LIKE
+    op.execute(
+        "CREATE INDEX ix__postcode_street__index "
+        "ON postcode_street (index varchar_pattern_ops)"
+    )
+
+
+def downgrade():
+    op.execute("DROP MATERIALIZED VIEW postcode_street")
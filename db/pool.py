@@ -0,0 +1,200 @@
+import time
+from typing import Optional
+
+import asyncpgsa
+from asyncpg import Connection
+from asyncpg.pool import Pool, PoolConnectionProxy
+
+from utils.metrics import add_db_time
+
+
+class PoolAcquireContext:
+    """
+    Context of connection acquired from instrumented pool, time
+    of acquiring and holding connection is added to current request.
+    """
+
+    def __init__(self, pool: "InstrumentedPool", timeout: Optional[float]):
+        self._pool = pool
+        self._timeout = timeout
+        self._connection: Optional[PoolConnectionProxy] = None
+        self._started = 0.0
+
+    async def __aenter__(self) -> PoolConnectionProxy:
+        self._started = time.perf_counter()
+        self._connection = await self._pool.acquire_connection(
+            timeout=self._timeout
+        )
+        return self._connection
+
+    async def __aexit__(self, *exc_info) -> None:
+        connection, self._connection = self._connection, None
+
+        try:
+            await self._pool.release(connection)
+        finally:
+            add_db_time(time.perf_counter() - self._started)
+
+    def __await__(self):
+        return self._pool.acquire_connection(timeout=self._timeout).__await__()
+
+
+class InstrumentedPool:
+    """
+    Pool of connections which counts connections in use, waiters
+    of free connection, opened connections and latency of acquiring.
+    Other attributes are taken from asyncpg pool.
+    """
+
+    def __init__(self, *, min_size: int, max_size: int):
+        self._pool: Optional[Pool] = None
+        self.min_size = min_size
+        self.max_size = max_size
+        self.in_use = 0
+        self.waiters = 0
+        self.opened = 0
+        self.acquired = 0
+        self.acquire_seconds = 0.0
+        self.max_acquire_seconds = 0.0
+
+    def __getattr__(self, name: str):
+        if (pool := self.__dict__.get("_pool")) is None:
+            raise AttributeError(name)
+
+        return getattr(pool, name)
+
+    @classmethod
+    async def create(
+        cls, dsn: str, *, min_size: int = 10, max_size: int = 10, **params
+    ) -> "InstrumentedPool":
+        """
+        Create pool of connections.
+
+        :param dsn: Connection url
+        :type dsn: str
+        :param min_size: Count of connections opened on start
+        :type min_size: int
+        :param max_size: Max count of connections
+        :type max_size: int
+        :param params: Other params of asyncpg pool
+        :return: Instrumented pool
+        :rtype: InstrumentedPool
+        """
+
+        pool = cls(min_size=min_size, max_size=max_size)
+        pool._pool = await asyncpgsa.create_pool(
+            dsn=dsn,
+            min_size=min_size,
+            max_size=max_size,
+            init=pool._init_connection,
+            **params,
+        )
+
+        return pool
+
+    def acquire(
+        self, *, timeout: Optional[float] = None
+    ) -> PoolAcquireContext:
+        """
+        Acquire connection from pool, can be used in await expression
+        or with async with block.
+
+        :param timeout: Timeout of acquiring
+        :type timeout: Optional[float]
+        :return: Context of acquired connection
+        :rtype: PoolAcquireContext
+        """
+
+        return PoolAcquireContext(self, timeout)
+
+    async def acquire_connection(
+        self, *, timeout: Optional[float] = None
+    ) -> PoolConnectionProxy:
+        """
+        Wait for free connection and count latency of it.
+
+        :param timeout: Timeout of acquiring
+        :type timeout: Optional[float]
+        :return: Connection
+        :rtype: PoolConnectionProxy
+        """
+
+        started = time.perf_counter()
+        self.waiters += 1
+
+        try:
+            connection = await self._pool.acquire(timeout=timeout)
+        finally:
+            self.waiters -= 1
+
+        seconds = time.perf_counter() - started
+        self.acquired += 1
+        self.acquire_seconds += seconds
+        self.max_acquire_seconds = max(self.max_acquire_seconds, seconds)
+        self.in_use += 1
+
+        return connection
+
+    async def release(
+        self,
+        connection: PoolConnectionProxy,
+        *,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Release connection back to pool.
+
+        :param connection: Acquired connection
+        :type connection: PoolConnectionProxy
+        :param timeout: Timeout of releasing
+        :type timeout: Optional[float]
+        """
+
+        self.in_use -= 1
+        await self._pool.release(connection, timeout=timeout)
+
+    def stats(self) -> dict:
+        """
+        Get pool statistics.
+
+        :return: Sizes, connections in use and idle, waiters, count
+            of opened connections and latency of acquiring in seconds
+        :rtype: dict
+        """
+
+        size = None
+        idle = None
+
+        # Sizes are reported by asyncpg since 0.25
+        if hasattr(self._pool, "get_size"):
+            size = self._pool.get_size()
+            idle = self._pool.get_idle_size()
+
+        return {
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "size": size,
+            "in_use": self.in_use,
+            "idle": idle,
+            "waiters": self.waiters,
+            "opened": self.opened,
+            "acquired": self.acquired,
+            "acquire_avg": (
+                round(self.acquire_seconds / self.acquired, 6)
+                if self.acquired
+                else 0.0
+            ),
+            "acquire_max": round(self.max_acquire_seconds, 6),
+            "acquire_seconds": round(self.acquire_seconds, 6),
+        }
+
+    async def _init_connection(self, connection: Connection) -> None:
+        """
+        Count opened connections of pool, connections are reopened
+        after max queries or max inactive lifetime.
+
+        :param connection: New connection
+        :type connection: Connection
+        """
+
+        self.opened += 1
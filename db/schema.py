@@ -1,5 +1,16 @@
-from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+)
 from sqlalchemy.dialects.postgresql import ENUM
+from sqlalchemy.sql import func
 
 from db import NAMING_CONVECTION
 
@@ -12,6 +23,18 @@ countries = Table(
     Column("id", Integer, primary_key=True),
     Column("name", String(64), nullable=False),
     Column("code", String(2), nullable=False, unique=True),
+    Index(
+        "ix__country__name_trgm",
+        "name",
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    ),
+    Index(
+        "ix__country__code_trgm",
+        "code",
+        postgresql_using="gin",
+        postgresql_ops={"code": "gin_trgm_ops"},
+    ),
 )
 
 regions = Table(
@@ -27,6 +50,13 @@ regions = Table(
     ),
     Column("name", String(128), nullable=False),
     Column("geoip_name", String(128), nullable=False),
+    UniqueConstraint("country_id", "name"),
+    Index(
+        "ix__region__name_trgm",
+        "name",
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    ),
 )
 
 areas = Table(
@@ -41,6 +71,13 @@ areas = Table(
         index=True,
     ),
     Column("name", String(128), nullable=False),
+    UniqueConstraint("region_id", "name"),
+    Index(
+        "ix__area__name_trgm",
+        "name",
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    ),
 )
 
 localities = Table(
@@ -51,6 +88,13 @@ localities = Table(
         "area_id", Integer, ForeignKey("area.id"), nullable=False, index=True
     ),
     Column("name", String(128), nullable=False),
+    UniqueConstraint("area_id", "name"),
+    Index(
+        "ix__locality__name_trgm",
+        "name",
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    ),
 )
 
 districts = Table(
@@ -65,6 +109,13 @@ districts = Table(
         index=True,
     ),
     Column("name", String(128), nullable=False),
+    UniqueConstraint("locality_id", "name"),
+    Index(
+        "ix__district__name_trgm",
+        "name",
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    ),
 )
 
 streets = Table(
@@ -79,6 +130,13 @@ streets = Table(
         index=True,
     ),
     Column("name", String(128), nullable=False),
+    UniqueConstraint("district_id", "name"),
+    Index(
+        "ix__street__name_trgm",
+        "name",
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    ),
 )
 
 houses = Table(
@@ -94,6 +152,13 @@ houses = Table(
     ),
     Column("index", String(8), nullable=False, index=True),
     Column("number", String(32), nullable=False),
+    UniqueConstraint("street_id", "number"),
+    Index(
+        "ix__house__number_trgm",
+        "number",
+        postgresql_using="gin",
+        postgresql_ops={"number": "gin_trgm_ops"},
+    ),
 )
 
 alternative_names = Table(
@@ -116,4 +181,57 @@ alternative_names = Table(
         index=True,
     ),
     Column("related_id", Integer, nullable=False, index=True),
+    Column("name", String(128), nullable=False),
+    UniqueConstraint("type", "related_id", "name"),
+    Index(
+        "ix__alternative_name__name_trgm",
+        "name",
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    ),
+)
+
+data_versions = Table(
+    "data_version",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("version", Integer, nullable=False, default=0),
+    Column("updated_at", DateTime, nullable=False, server_default=func.now()),
+)
+
+source_snapshots = Table(
+    "source_snapshot",
+    metadata,
+    Column("source", String(64), primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+    Column("rows_count", Integer, nullable=False),
+    Column("updated_at", DateTime, nullable=False, server_default=func.now()),
+)
+
+address_flat = Table(
+    "address_flat",
+    metadata,
+    Column("house_id", Integer, primary_key=True),
+    Column("country", String(64), nullable=False),
+    Column("region", String(128), nullable=False),
+    Column("area", String(128), nullable=False),
+    Column("locality", String(128), nullable=False),
+    Column("district", String(128), nullable=False),
+    Column("street", String(128), nullable=False),
+    Column("house", String(32), nullable=False),
+    Column("index", String(8), nullable=False),
+    info={"is_view": True},
+)
+
+postcode_streets = Table(
+    "postcode_street",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("index", String(8), nullable=False),
+    Column("locality_id", Integer, nullable=False),
+    Column("locality", String(128), nullable=False),
+    Column("street_id", Integer, nullable=False),
+    Column("street", String(128), nullable=False),
+    Column("houses", Integer, nullable=False),
+    info={"is_view": True},
 )
@@ -0,0 +1,315 @@
+import asyncio
+import json
+from os import path
+import sqlite3
+from typing import Any, AsyncIterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from db.pool import PoolAcquireContext
+from logic.queries import SNAPSHOT_DIALECT, compile_statement
+
+
+URL_PREFIX = "sqlite:///"
+MMAP_SIZE = 1 << 30
+
+
+def _lower(value: Optional[str]) -> Optional[str]:
+    """
+    Lower unicode string, sqlite lowers only ascii letters.
+
+    :param value: String or None
+    :type value: Optional[str]
+    :return: Lowered string or None
+    :rtype: Optional[str]
+    """
+
+    return value.lower() if isinstance(value, str) else value
+
+
+def _dict_factory(cursor: sqlite3.Cursor, row: Tuple) -> dict:
+    """
+    Make dict record from row of sqlite cursor.
+
+    :param cursor: Sqlite cursor
+    :type cursor: sqlite3.Cursor
+    :param row: Row values
+    :type row: Tuple
+    :return: Record
+    :rtype: dict
+    """
+
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+class SnapshotTransaction:
+    """Transaction of read-only snapshot, it does nothing."""
+
+    async def __aenter__(self) -> "SnapshotTransaction":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+
+class SnapshotCursor:
+    """Cursor of snapshot query which yields records by chunks."""
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        sql: str,
+        args: List,
+        *,
+        prefetch: int,
+    ):
+        self._connection = connection
+        self._sql = sql
+        self._args = args
+        self._prefetch = prefetch
+
+    async def __aiter__(self) -> AsyncIterator[dict]:
+        cursor = self._connection.execute(self._sql, self._args)
+
+        while records := cursor.fetchmany(self._prefetch):
+            for record in records:
+                yield record
+
+            # Let other requests go between chunks of long results
+            await asyncio.sleep(0)
+
+
+class SnapshotConnection:
+    """
+    Connection to read-only sqlite snapshot with methods of asyncpg
+    connection used by api. Records are dicts and queries are executed
+    in event loop, they don't wait for network.
+    """
+
+    dialect_name = SNAPSHOT_DIALECT.name
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+
+    def _execute(self, query: Any, args: Tuple) -> sqlite3.Cursor:
+        """
+        Execute sql or SQLAlchemy query.
+
+        :param query: Sql with numbered parameters or SQLAlchemy query
+        :type query: Any
+        :param args: Positional arguments, lists are passed as json
+        :type args: Tuple
+        :return: Cursor of query
+        :rtype: sqlite3.Cursor
+        """
+
+        return self._connection.execute(*self._statement(query, args))
+
+    @staticmethod
+    def _statement(query: Any, args: Tuple) -> Tuple[str, List]:
+        """
+        Get sql and arguments of query.
+
+        :param query: Sql with numbered parameters or SQLAlchemy query
+            with literal values
+        :type query: Any
+        :param args: Positional arguments
+        :type args: Tuple
+        :return: Sql and arguments
+        :rtype: Tuple[str, List]
+        """
+
+        if not isinstance(query, str):
+            query, _ = compile_statement(query, SNAPSHOT_DIALECT)
+
+        return (
+            query,
+            [
+                json.dumps(arg) if isinstance(arg, (list, tuple)) else arg
+                for arg in args
+            ],
+        )
+
+    async def fetch(self, query: Any, *args) -> List[dict]:
+        """
+        Fetch records of query.
+
+        :param query: Sql with numbered parameters or SQLAlchemy query
+        :type query: Any
+        :param args: Positional arguments
+        :return: Records
+        :rtype: List[dict]
+        """
+
+        return self._execute(query, args).fetchall()
+
+    async def fetchrow(self, query: Any, *args) -> Optional[dict]:
+        """
+        Fetch first record of query.
+
+        :param query: Sql with numbered parameters or SQLAlchemy query
+        :type query: Any
+        :param args: Positional arguments
+        :return: Record or None
+        :rtype: Optional[dict]
+        """
+
+        return self._execute(query, args).fetchone()
+
+    async def fetchval(self, query: Any, *args) -> Any:
+        """
+        Fetch value of first column of first record of query.
+
+        :param query: Sql with numbered parameters or SQLAlchemy query
+        :type query: Any
+        :param args: Positional arguments
+        :return: Value or None
+        :rtype: Any
+        """
+
+        if (record := await self.fetchrow(query, *args)) is None:
+            return None
+
+        return next(iter(record.values()))
+
+    def cursor(self, query: Any, *args, prefetch: int) -> SnapshotCursor:
+        """
+        Get cursor of query.
+
+        :param query: Sql with numbered parameters or SQLAlchemy query
+        :type query: Any
+        :param args: Positional arguments
+        :param prefetch: Count of records fetched at once
+        :type prefetch: int
+        :return: Cursor
+        :rtype: SnapshotCursor
+        """
+
+        sql, args = self._statement(query, args)
+
+        return SnapshotCursor(self._connection, sql, args, prefetch=prefetch)
+
+    def transaction(self) -> SnapshotTransaction:
+        """
+        Get transaction, snapshot isn't changed so it does nothing.
+
+        :return: Transaction
+        :rtype: SnapshotTransaction
+        """
+
+        return SnapshotTransaction()
+
+
+class SnapshotPool:
+    """
+    Pool with the only connection to read-only sqlite snapshot,
+    it is shared by requests of worker because queries don't wait.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+        self.connection = SnapshotConnection(connection)
+        self.in_use = 0
+        self.acquired = 0
+
+    @classmethod
+    def open(cls, filename: str) -> "SnapshotPool":
+        """
+        Open snapshot file read-only and map it to memory.
+
+        :param filename: Path of snapshot file
+        :type filename: str
+        :raise FileNotFoundError: Snapshot file doesn't exist
+        :return: Snapshot pool
+        :rtype: SnapshotPool
+        """
+
+        if not path.isfile(filename):
+            raise FileNotFoundError(f"Snapshot {filename} doesn't exist")
+
+        connection = sqlite3.connect(
+            f"file:{quote(path.abspath(filename))}?mode=ro&immutable=1",
+            uri=True,
+        )
+        connection.row_factory = _dict_factory
+        connection.create_function("lower", 1, _lower, deterministic=True)
+        connection.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        # Lets prefix patterns of postcodes use index
+        connection.execute("PRAGMA case_sensitive_like = ON")
+
+        return cls(connection)
+
+    def acquire(
+        self, *, timeout: Optional[float] = None
+    ) -> PoolAcquireContext:
+        """
+        Acquire connection, can be used in await expression
+        or with async with block.
+
+        :param timeout: Timeout of acquiring, it is ignored
+        :type timeout: Optional[float]
+        :return: Context of acquired connection
+        :rtype: PoolAcquireContext
+        """
+
+        return PoolAcquireContext(self, timeout)
+
+    async def acquire_connection(
+        self, *, timeout: Optional[float] = None
+    ) -> SnapshotConnection:
+        """
+        Get connection to snapshot.
+
+        :param timeout: Timeout of acquiring, it is ignored
+        :type timeout: Optional[float]
+        :return: Connection
+        :rtype: SnapshotConnection
+        """
+
+        self.acquired += 1
+        self.in_use += 1
+
+        return self.connection
+
+    async def release(
+        self,
+        connection: SnapshotConnection,
+        *,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Release connection.
+
+        :param connection: Acquired connection
+        :type connection: SnapshotConnection
+        :param timeout: Timeout of releasing, it is ignored
+        :type timeout: Optional[float]
+        """
+
+        self.in_use -= 1
+
+    async def close(self) -> None:
+        """Close connection to snapshot."""
+
+        self._connection.close()
+
+    def stats(self) -> dict:
+        """
+        Get pool statistics in format of instrumented pool.
+
+        :return: Sizes, connections in use and count of acquiring
+        :rtype: dict
+        """
+
+        return {
+            "min_size": 1,
+            "max_size": 1,
+            "size": 1,
+            "in_use": self.in_use,
+            "idle": 0 if self.in_use else 1,
+            "waiters": 0,
+            "opened": 1,
+            "acquired": self.acquired,
+            "acquire_avg": 0.0,
+            "acquire_max": 0.0,
+            "acquire_seconds": 0.0,
+        }
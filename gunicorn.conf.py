@@ -0,0 +1,32 @@
+from multiprocessing import cpu_count
+from os import getenv, path
+
+from config import UPLOADS_DIR
+from utils.metrics import clear_metrics
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+bind = getenv("BIND", "0.0.0.0:8080")
+workers = int(getenv("WEB_CONCURRENCY", str(cpu_count())))
+worker_class = (
+    "aiohttp.GunicornUVLoopWebWorker"
+    if uvloop is not None and getenv("USE_UVLOOP", "1") == "1"
+    else "aiohttp.GunicornWebWorker"
+)
+reuse_port = True
+graceful_timeout = 30
+
+# Pool of every worker is sized by count of workers, every worker
+# answers with merged metrics of all of them
+metrics_dir = getenv("METRICS_DIR", path.join(UPLOADS_DIR, "metrics"))
+raw_env = [f"WEB_CONCURRENCY={workers}", f"METRICS_DIR={metrics_dir}"]
+
+
+def on_starting(server) -> None:
+    """Remove metrics of workers of previous run."""
+
+    clear_metrics(metrics_dir)
@@ -1,10 +1,24 @@
-from typing import Optional
+from typing import List, Optional
 
 from asyncpg import Record
+from asyncpg.cursor import CursorFactory
 from asyncpg.pool import PoolConnectionProxy
-from sqlalchemy.sql import select, or_, and_
+from sqlalchemy import ARRAY, Integer
+from sqlalchemy.sql import (
+    any_,
+    bindparam,
+    literal_column,
+    select,
+    or_,
+    and_,
+    union,
+)
 
+from logic.queries import register_query
 from db.schema import (
+    address_flat,
+    alternative_names,
+    postcode_streets,
     countries,
     regions,
     areas,
@@ -12,326 +26,608 @@ from db.schema import (
     districts,
     streets,
     houses,
+    data_versions,
 )
 
 
 API_MAX_LIMIT = 200
+FULL_ADDRESSES_MAX_SIZE = 5000
+FULL_ADDRESSES_PREFETCH = 500
+# Range of integer column of house ids
+HOUSE_ID_MIN = -(2 ** 31)
+HOUSE_ID_MAX = 2 ** 31 - 1
+POSTCODE_LENGTH = 5
+
+PATTERN = bindparam("pattern")
+STREETS_WITH_DISTRICTS = streets.join(
+    districts, streets.c.district_id == districts.c.id
+)
 
 
-async def get_all_countries(conn: PoolConnectionProxy, *, limit: int = 0):
-    """"""
+def _alternative_name_ids(address_type: str):
+    """
+    Select ids of records of type which alternative names match PATTERN.
+
+    :param address_type: Type of records, e.g. street
+    :type address_type: str
+    :return: Select query of related ids
+    """
+
+    return select([alternative_names.c.related_id]).where(
+        and_(
+            alternative_names.c.type == literal_column(f"'{address_type}'"),
+            alternative_names.c.name.ilike(PATTERN),
+        )
+    )
+
+
+def _name_matches(table, address_type: str):
+    """
+    Condition of name or any alternative name of record matching PATTERN.
+    Ids of alternative names are selected once by trigram index
+    and checked by hash, so it is used with condition of parent.
+
+    :param table: Table of records with name column
+    :param address_type: Type of records, e.g. street
+    :type address_type: str
+    :return: Condition
+    """
+
+    return or_(
+        table.c.name.ilike(PATTERN),
+        table.c.id.in_(_alternative_name_ids(address_type)),
+    )
+
+
+def _name_matching_ids(table, address_type: str):
+    """
+    Union of ids of records which name or alternative name match PATTERN.
+    Both parts are selected by trigram indexes, so it is used to search
+    in the whole table.
+
+    :param table: Table of records with name column
+    :param address_type: Type of records, e.g. street
+    :type address_type: str
+    :return: Select query of ids
+    """
+
+    return union(
+        select([table.c.id]).where(table.c.name.ilike(PATTERN)),
+        _alternative_name_ids(address_type),
+    )
 
-    sql = select([countries])
-    limit = max(0, min(limit, API_MAX_LIMIT))
 
-    if limit:
-        sql = sql.limit(limit)
+def page_size(limit: int) -> int:
+    """
+    Get count of records in page by requested limit.
 
-    all_countries = await conn.fetch(sql)
+    :param limit: Requested limit, 0 for default
+    :type limit: int
+    :return: Limit which is API_MAX_LIMIT at most
+    :rtype: int
+    """
+
+    return max(0, min(limit, API_MAX_LIMIT)) or API_MAX_LIMIT
+
+
+def _page(sql, id_column):
+    """
+    Order query by id and take page of records after id.
+    Bind parameters are after_id and limit.
+
+    :param sql: Select query
+    :param id_column: Id column to order and paginate by
+    :return: Select query of page
+    """
+
+    return (
+        sql.where(id_column > bindparam("after_id"))
+        .order_by(id_column)
+        .limit(bindparam("limit"))
+    )
+
+
+def _page_params(limit: int, after_id: Optional[int]) -> dict:
+    """
+    Get values of bind parameters of page query.
+
+    :param limit: Requested count of records, 0 for default
+    :type limit: int
+    :param after_id: Id of last record of previous page, None for first page
+    :type after_id: Optional[int]
+    :return: Values of after_id and limit bind parameters
+    :rtype: dict
+    """
+
+    # Ids are serial, so records of the first page are after id 0
+    return {
+        "after_id": 0 if after_id is None else after_id,
+        "limit": page_size(limit),
+    }
+
+
+ALL_COUNTRIES_QUERY = register_query(
+    "all_countries", _page(select([countries]), countries.c.id)
+)
+
+
+async def get_all_countries(
+    conn: PoolConnectionProxy,
+    *,
+    limit: int = 0,
+    after_id: Optional[int] = None,
+):
+    """"""
+
+    all_countries = await ALL_COUNTRIES_QUERY.fetch(
+        conn, **_page_params(limit, after_id)
+    )
 
     return all_countries
 
 
+COUNTRIES_BY_SUBSTRING_QUERY = register_query(
+    "countries_by_substring",
+    _page(
+        select([countries]).where(
+            or_(
+                countries.c.name.ilike(PATTERN),
+                countries.c.code.ilike(PATTERN),
+            )
+        ),
+        countries.c.id,
+    ),
+)
+
+
 async def get_countries_by_substring(
-    conn: PoolConnectionProxy, *, substring: str, limit: int = 0
+    conn: PoolConnectionProxy,
+    *,
+    substring: str,
+    limit: int = 0,
+    after_id: Optional[int] = None,
 ) -> Optional[Record]:
     """"""
 
-    sql = select([countries]).where(
-        or_(
-            countries.c.name.ilike(f"%{substring}%"),
-            countries.c.code.ilike(f"%{substring}%"),
-        )
+    all_countries = await COUNTRIES_BY_SUBSTRING_QUERY.fetch(
+        conn, pattern=f"%{substring}%", **_page_params(limit, after_id)
     )
-    limit = max(0, min(limit, API_MAX_LIMIT))
 
-    if limit:
-        sql = sql.limit(limit)
+    return all_countries
 
-    all_countries = await conn.fetch(sql)
 
-    return all_countries
+COUNTRY_QUERY = register_query(
+    "country",
+    select([countries]).where(countries.c.id == bindparam("country_id")),
+)
 
 
 async def get_country(conn: PoolConnectionProxy, *, country_id: int):
     """"""
 
-    country = await conn.fetchrow(
-        select([countries]).where(countries.c.id == country_id)
-    )
+    country = await COUNTRY_QUERY.fetchrow(conn, country_id=country_id)
 
     return country
 
 
+REGIONS_IN_COUNTRY_BY_SUBSTRING_QUERY = register_query(
+    "regions_in_country_by_substring",
+    _page(
+        select([regions]).where(
+            and_(
+                regions.c.country_id == bindparam("country_id"),
+                regions.c.name.ilike(PATTERN),
+            )
+        ),
+        regions.c.id,
+    ),
+)
+
+
 async def get_regions_in_country_by_substring(
     conn: PoolConnectionProxy,
     *,
     country_id: int,
     substring: str,
     limit: int = 0,
+    after_id: Optional[int] = None,
 ):
     """"""
 
-    sql = select([regions]).where(
-        and_(
-            regions.c.country_id == country_id,
-            regions.c.name.ilike(f"%{substring}%"),
-        )
+    all_regions = await REGIONS_IN_COUNTRY_BY_SUBSTRING_QUERY.fetch(
+        conn,
+        country_id=country_id,
+        pattern=f"%{substring}%",
+        **_page_params(limit, after_id),
     )
-    limit = max(0, min(limit, API_MAX_LIMIT))
 
-    if limit:
-        sql = sql.limit(limit)
+    return all_regions
 
-    all_regions = await conn.fetch(sql)
 
-    return all_regions
+ALL_REGIONS_IN_COUNTRY_QUERY = register_query(
+    "all_regions_in_country",
+    _page(
+        select([regions]).where(
+            regions.c.country_id == bindparam("country_id")
+        ),
+        regions.c.id,
+    ),
+)
 
 
 async def get_all_regions_in_country(
-    conn: PoolConnectionProxy, *, country_id: int, limit: int = 0
+    conn: PoolConnectionProxy,
+    *,
+    country_id: int,
+    limit: int = 0,
+    after_id: Optional[int] = None,
 ):
     """"""
 
-    sql = select([regions]).where(regions.c.country_id == country_id)
-    limit = max(0, min(limit, API_MAX_LIMIT))
+    all_regions = await ALL_REGIONS_IN_COUNTRY_QUERY.fetch(
+        conn, country_id=country_id, **_page_params(limit, after_id)
+    )
 
-    if limit:
-        sql = sql.limit(limit)
+    return all_regions
 
-    all_regions = await conn.fetch(sql)
 
-    return all_regions
+REGION_QUERY = register_query(
+    "region", select([regions]).where(regions.c.id == bindparam("region_id"))
+)
 
 
 async def get_region(conn: PoolConnectionProxy, *, region_id: int):
     """"""
 
-    region = await conn.fetchrow(
-        select([regions]).where(regions.c.id == region_id)
-    )
+    region = await REGION_QUERY.fetchrow(conn, region_id=region_id)
 
     return region
 
 
+AREAS_IN_REGION_BY_SUBSTRING_QUERY = register_query(
+    "areas_in_region_by_substring",
+    _page(
+        select([areas]).where(
+            and_(
+                areas.c.region_id == bindparam("region_id"),
+                areas.c.name.ilike(PATTERN),
+            )
+        ),
+        areas.c.id,
+    ),
+)
+
+
 async def get_areas_in_region_by_substring(
     conn: PoolConnectionProxy,
     *,
     region_id: int,
     substring: str,
     limit: int = 0,
+    after_id: Optional[int] = None,
 ):
     """"""
 
-    sql = select([areas]).where(
-        and_(
-            areas.c.region_id == region_id,
-            areas.c.name.ilike(f"%{substring}%"),
-        )
+    all_areas = await AREAS_IN_REGION_BY_SUBSTRING_QUERY.fetch(
+        conn,
+        region_id=region_id,
+        pattern=f"%{substring}%",
+        **_page_params(limit, after_id),
     )
-    limit = max(0, min(limit, API_MAX_LIMIT))
 
-    if limit:
-        sql = sql.limit(limit)
+    return all_areas
 
-    all_areas = await conn.fetch(sql)
 
-    return all_areas
+ALL_AREAS_IN_REGION_QUERY = register_query(
+    "all_areas_in_region",
+    _page(
+        select([areas]).where(areas.c.region_id == bindparam("region_id")),
+        areas.c.id,
+    ),
+)
 
 
 async def get_all_areas_in_region(
-    conn: PoolConnectionProxy, *, region_id: int, limit: int = 0
+    conn: PoolConnectionProxy,
+    *,
+    region_id: int,
+    limit: int = 0,
+    after_id: Optional[int] = None,
 ):
     """"""
 
-    sql = select([areas]).where(areas.c.region_id == region_id)
-    limit = max(0, min(limit, API_MAX_LIMIT))
+    all_areas = await ALL_AREAS_IN_REGION_QUERY.fetch(
+        conn, region_id=region_id, **_page_params(limit, after_id)
+    )
 
-    if limit:
-        sql = sql.limit(limit)
+    return all_areas
 
-    all_areas = await conn.fetch(sql)
 
-    return all_areas
+AREA_QUERY = register_query(
+    "area", select([areas]).where(areas.c.id == bindparam("area_id"))
+)
 
 
 async def get_area(conn: PoolConnectionProxy, *, area_id: int):
     """"""
 
-    area = await conn.fetchrow(select([areas]).where(areas.c.id == area_id))
+    area = await AREA_QUERY.fetchrow(conn, area_id=area_id)
 
     return area
 
 
+LOCALITIES_BY_SUBSTRING_QUERY = register_query(
+    "localities_by_substring",
+    _page(
+        select([localities]).where(
+            localities.c.id.in_(_name_matching_ids(localities, "locality"))
+        ),
+        localities.c.id,
+    ),
+)
+
+
 async def get_localities_by_substring(
-    conn: PoolConnectionProxy, *, substring: str, limit: int = 0
+    conn: PoolConnectionProxy,
+    *,
+    substring: str,
+    limit: int = 0,
+    after_id: Optional[int] = None,
 ):
     """"""
 
-    sql = select([localities]).where(
-        localities.c.name.ilike(f"%{substring}%"),
+    all_localities = await LOCALITIES_BY_SUBSTRING_QUERY.fetch(
+        conn, pattern=f"%{substring}%", **_page_params(limit, after_id)
     )
-    limit = max(0, min(limit, API_MAX_LIMIT))
 
-    if limit:
-        sql = sql.limit(limit)
+    return all_localities
 
-    all_localities = await conn.fetch(sql)
 
-    return all_localities
+ALL_LOCALITIES_QUERY = register_query(
+    "all_localities", _page(select([localities]), localities.c.id)
+)
 
 
-async def get_all_localities(conn: PoolConnectionProxy, *, limit: int = 0):
+async def get_all_localities(
+    conn: PoolConnectionProxy,
+    *,
+    limit: int = 0,
+    after_id: Optional[int] = None,
+):
     """"""
 
-    sql = select([localities])
-    limit = max(0, min(limit, API_MAX_LIMIT))
+    all_localities = await ALL_LOCALITIES_QUERY.fetch(
+        conn, **_page_params(limit, after_id)
+    )
 
-    if limit:
-        sql = sql.limit(limit)
+    return all_localities
 
-    all_localities = await conn.fetch(sql)
 
-    return all_localities
+LOCALITIES_IN_AREA_BY_SUBSTRING_QUERY = register_query(
+    "localities_in_area_by_substring",
+    _page(
+        select([localities]).where(
+            and_(
+                localities.c.area_id == bindparam("area_id"),
+                _name_matches(localities, "locality"),
+            )
+        ),
+        localities.c.id,
+    ),
+)
 
 
 async def get_localities_in_area_by_substring(
-    conn: PoolConnectionProxy, *, area_id: int, substring: str, limit: int = 0
+    conn: PoolConnectionProxy,
+    *,
+    area_id: int,
+    substring: str,
+    limit: int = 0,
+    after_id: Optional[int] = None,
 ):
     """"""
 
-    sql = select([localities]).where(
-        and_(
-            localities.c.area_id == area_id,
-            localities.c.name.ilike(f"%{substring}%"),
-        )
+    all_localities = await LOCALITIES_IN_AREA_BY_SUBSTRING_QUERY.fetch(
+        conn,
+        area_id=area_id,
+        pattern=f"%{substring}%",
+        **_page_params(limit, after_id),
     )
-    limit = max(0, min(limit, API_MAX_LIMIT))
 
-    if limit:
-        sql = sql.limit(limit)
+    return all_localities
 
-    all_localities = await conn.fetch(sql)
 
-    return all_localities
+ALL_LOCALITIES_IN_AREA_QUERY = register_query(
+    "all_localities_in_area",
+    _page(
+        select([localities]).where(
+            localities.c.area_id == bindparam("area_id")
+        ),
+        localities.c.id,
+    ),
+)
 
 
 async def get_all_localities_in_area(
-    conn: PoolConnectionProxy, *, area_id: int, limit: int = 0
+    conn: PoolConnectionProxy,
+    *,
+    area_id: int,
+    limit: int = 0,
+    after_id: Optional[int] = None,
 ):
     """"""
 
-    sql = select([localities]).where(localities.c.area_id == area_id)
-    limit = max(0, min(limit, API_MAX_LIMIT))
+    all_localities = await ALL_LOCALITIES_IN_AREA_QUERY.fetch(
+        conn, area_id=area_id, **_page_params(limit, after_id)
+    )
 
-    if limit:
-        sql = sql.limit(limit)
+    return all_localities
 
-    all_localities = await conn.fetch(sql)
 
-    return all_localities
+LOCALITY_QUERY = register_query(
+    "locality",
+    select([localities]).where(localities.c.id == bindparam("locality_id")),
+)
 
 
 async def get_locality(conn: PoolConnectionProxy, *, locality_id: int):
     """"""
 
-    locality = await conn.fetchrow(
-        select([localities]).where(localities.c.id == locality_id)
-    )
+    locality = await LOCALITY_QUERY.fetchrow(conn, locality_id=locality_id)
 
     return locality
 
 
+DISTRICTS_IN_LOCALITY_BY_SUBSTRING_QUERY = register_query(
+    "districts_in_locality_by_substring",
+    _page(
+        select([districts]).where(
+            and_(
+                districts.c.locality_id == bindparam("locality_id"),
+                districts.c.name.ilike(PATTERN),
+            )
+        ),
+        districts.c.id,
+    ),
+)
+
+
 async def get_districts_in_locality_by_substring(
     conn: PoolConnectionProxy,
     *,
     locality_id: int,
     substring: str,
     limit: int = 0,
+    after_id: Optional[int] = None,
 ):
     """"""
 
-    sql = select([districts]).where(
-        and_(
-            districts.c.locality_id == locality_id,
-            districts.c.name.ilike(f"%{substring}%"),
-        )
+    all_districts = await DISTRICTS_IN_LOCALITY_BY_SUBSTRING_QUERY.fetch(
+        conn,
+        locality_id=locality_id,
+        pattern=f"%{substring}%",
+        **_page_params(limit, after_id),
     )
-    limit = max(0, min(limit, API_MAX_LIMIT))
 
-    if limit:
-        sql = sql.limit(limit)
+    return all_districts
 
-    all_districts = await conn.fetch(sql)
 
-    return all_districts
+ALL_DISTRICTS_IN_LOCALITY_QUERY = register_query(
+    "all_districts_in_locality",
+    _page(
+        select([districts]).where(
+            districts.c.locality_id == bindparam("locality_id")
+        ),
+        districts.c.id,
+    ),
+)
 
 
 async def get_all_districts_in_locality(
-    conn: PoolConnectionProxy, *, locality_id: int, limit: int = 0
+    conn: PoolConnectionProxy,
+    *,
+    locality_id: int,
+    limit: int = 0,
+    after_id: Optional[int] = None,
 ):
     """"""
 
-    sql = select([districts]).where(districts.c.locality_id == locality_id)
-    limit = max(0, min(limit, API_MAX_LIMIT))
+    all_districts = await ALL_DISTRICTS_IN_LOCALITY_QUERY.fetch(
+        conn, locality_id=locality_id, **_page_params(limit, after_id)
+    )
 
-    if limit:
-        sql = sql.limit(limit)
+    return all_districts
 
-    all_districts = await conn.fetch(sql)
 
-    return all_districts
+DISTRICT_QUERY = register_query(
+    "district",
+    select([districts]).where(districts.c.id == bindparam("district_id")),
+)
 
 
 async def get_district(conn: PoolConnectionProxy, *, district_id: int):
     """"""
 
-    district = await conn.fetchrow(
-        select([districts]).where(districts.c.id == district_id)
-    )
+    district = await DISTRICT_QUERY.fetchrow(conn, district_id=district_id)
 
     return district
 
 
+STREETS_IN_DISTRICT_BY_SUBSTRING_QUERY = register_query(
+    "streets_in_district_by_substring",
+    _page(
+        select([streets]).where(
+            and_(
+                streets.c.district_id == bindparam("district_id"),
+                _name_matches(streets, "street"),
+            )
+        ),
+        streets.c.id,
+    ),
+)
+
+
 async def get_streets_in_district_by_substring(
     conn: PoolConnectionProxy,
     *,
     district_id: int,
     substring: str,
     limit: int = 0,
+    after_id: Optional[int] = None,
 ):
     """"""
 
-    sql = select([streets]).where(
-        and_(
-            streets.c.district_id == district_id,
-            streets.c.name.ilike(f"%{substring}%"),
-        )
+    all_streets = await STREETS_IN_DISTRICT_BY_SUBSTRING_QUERY.fetch(
+        conn,
+        district_id=district_id,
+        pattern=f"%{substring}%",
+        **_page_params(limit, after_id),
     )
-    limit = max(0, min(limit, API_MAX_LIMIT))
 
-    if limit:
-        sql = sql.limit(limit)
+    return all_streets
 
-    all_streets = await conn.fetch(sql)
 
-    return all_streets
+ALL_STREETS_IN_DISTRICT_QUERY = register_query(
+    "all_streets_in_district",
+    _page(
+        select([streets]).where(
+            streets.c.district_id == bindparam("district_id")
+        ),
+        streets.c.id,
+    ),
+)
 
 
 async def get_all_streets_in_district(
-    conn: PoolConnectionProxy, *, district_id: int, limit: int = 0
+    conn: PoolConnectionProxy,
+    *,
+    district_id: int,
+    limit: int = 0,
+    after_id: Optional[int] = None,
 ):
     """"""
 
-    sql = select([streets]).where(streets.c.district_id == district_id)
-    limit = max(0, min(limit, API_MAX_LIMIT))
+    all_streets = await ALL_STREETS_IN_DISTRICT_QUERY.fetch(
+        conn, district_id=district_id, **_page_params(limit, after_id)
+    )
 
-    if limit:
-        sql = sql.limit(limit)
+    return all_streets
 
-    all_streets = await conn.fetch(sql)
 
-    return all_streets
+STREETS_IN_LOCALITY_BY_SUBSTRING_QUERY = register_query(
+    "streets_in_locality_by_substring",
+    _page(
+        select([streets])
+        .select_from(STREETS_WITH_DISTRICTS)
+        .where(
+            and_(
+                districts.c.locality_id == bindparam("locality_id"),
+                _name_matches(streets, "street"),
+            )
+        ),
+        streets.c.id,
+    ),
+)
 
 
 async def get_streets_in_locality_by_substring(
@@ -340,116 +636,139 @@ async def get_streets_in_locality_by_substring(
     locality_id: int,
     substring: str,
     limit: int = 0,
+    after_id: Optional[int] = None,
 ):
     """"""
 
-    join = streets.join(districts, streets.c.district_id == districts.c.id)
-    sql = (
-        select([streets])
-        .select_from(join)
-        .where(
-            and_(
-                districts.c.locality_id == locality_id,
-                streets.c.name.ilike(f"%{substring}%"),
-            )
-        )
+    all_streets = await STREETS_IN_LOCALITY_BY_SUBSTRING_QUERY.fetch(
+        conn,
+        locality_id=locality_id,
+        pattern=f"%{substring}%",
+        **_page_params(limit, after_id),
     )
-    limit = max(0, min(limit, API_MAX_LIMIT))
 
-    if limit:
-        sql = sql.limit(limit)
+    return all_streets
 
-    all_streets = await conn.fetch(sql)
 
-    return all_streets
+ALL_STREETS_IN_LOCALITY_QUERY = register_query(
+    "all_streets_in_locality",
+    _page(
+        select([streets])
+        .select_from(STREETS_WITH_DISTRICTS)
+        .where(districts.c.locality_id == bindparam("locality_id")),
+        streets.c.id,
+    ),
+)
 
 
 async def get_all_streets_in_locality(
-    conn: PoolConnectionProxy, *, locality_id: int, limit: int = 0
+    conn: PoolConnectionProxy,
+    *,
+    locality_id: int,
+    limit: int = 0,
+    after_id: Optional[int] = None,
 ):
     """"""
 
-    join = streets.join(districts, streets.c.district_id == districts.c.id)
-    sql = (
-        select([streets])
-        .select_from(join)
-        .where(districts.c.locality_id == locality_id)
+    all_streets = await ALL_STREETS_IN_LOCALITY_QUERY.fetch(
+        conn, locality_id=locality_id, **_page_params(limit, after_id)
     )
-    limit = max(0, min(limit, API_MAX_LIMIT))
 
-    if limit:
-        sql = sql.limit(limit)
+    return all_streets
 
-    all_streets = await conn.fetch(sql)
 
-    return all_streets
+STREET_QUERY = register_query(
+    "street", select([streets]).where(streets.c.id == bindparam("street_id"))
+)
 
 
 async def get_street(conn: PoolConnectionProxy, *, street_id: int):
     """"""
 
-    street = await conn.fetchrow(
-        select([streets]).where(streets.c.id == street_id)
-    )
+    street = await STREET_QUERY.fetchrow(conn, street_id=street_id)
 
     return street
 
 
+HOUSES_IN_STREET_BY_SUBSTRING_QUERY = register_query(
+    "houses_in_street_by_substring",
+    _page(
+        select([houses]).where(
+            and_(
+                houses.c.street_id == bindparam("street_id"),
+                houses.c.number.ilike(PATTERN),
+            )
+        ),
+        houses.c.id,
+    ),
+)
+
+
 async def get_houses_in_street_by_substring(
     conn: PoolConnectionProxy,
     *,
     street_id: int,
     substring: str,
     limit: int = 0,
+    after_id: Optional[int] = None,
 ):
     """"""
 
-    sql = select([houses]).where(
-        and_(
-            houses.c.street_id == street_id,
-            houses.c.number.ilike(f"%{substring}%"),
-        )
+    all_houses = await HOUSES_IN_STREET_BY_SUBSTRING_QUERY.fetch(
+        conn,
+        street_id=street_id,
+        pattern=f"%{substring}%",
+        **_page_params(limit, after_id),
     )
-    limit = max(0, min(limit, API_MAX_LIMIT))
 
-    if limit:
-        sql = sql.limit(limit)
+    return all_houses
 
-    all_houses = await conn.fetch(sql)
 
-    return all_houses
+ALL_HOUSES_IN_STREET_QUERY = register_query(
+    "all_houses_in_street",
+    _page(
+        select([houses]).where(houses.c.street_id == bindparam("street_id")),
+        houses.c.id,
+    ),
+)
 
 
 async def get_all_houses_in_street(
-    conn: PoolConnectionProxy, *, street_id: int, limit: int = 0
+    conn: PoolConnectionProxy,
+    *,
+    street_id: int,
+    limit: int = 0,
+    after_id: Optional[int] = None,
 ):
     """"""
 
-    sql = select([houses]).where(houses.c.street_id == street_id)
-    limit = max(0, min(limit, API_MAX_LIMIT))
+    all_houses = await ALL_HOUSES_IN_STREET_QUERY.fetch(
+        conn, street_id=street_id, **_page_params(limit, after_id)
+    )
 
-    if limit:
-        sql = sql.limit(limit)
+    return all_houses
 
-    all_houses = await conn.fetch(sql)
 
-    return all_houses
+HOUSE_QUERY = register_query(
+    "house", select([houses]).where(houses.c.id == bindparam("house_id"))
+)
 
 
 async def get_house(conn: PoolConnectionProxy, *, house_id: int):
     """"""
 
-    house = await conn.fetchrow(
-        select([houses]).where(houses.c.id == house_id)
-    )
+    house = await HOUSE_QUERY.fetchrow(conn, house_id=house_id)
 
     return house
 
 
-async def get_full_address_by_house(
-    conn: PoolConnectionProxy, *, house_id: int
-):
-    """"""
+def _full_address_select(*columns):
+    """
+    Make select of full address columns joined from house up to country.
+
+    :param columns: Additional columns to select
+    :return: Select query without conditions
+    """
 
     join = (
         houses.join(streets, houses.c.street_id == streets.c.id)
@@ -459,23 +778,294 @@ async def get_full_address_by_house(
         .join(regions, areas.c.region_id == regions.c.id)
         .join(countries, regions.c.country_id == countries.c.id)
     )
-    sql = (
-        select(
-            [
-                countries.c.name.label("country"),
-                regions.c.name.label("region"),
-                areas.c.name.label("area"),
-                localities.c.name.label("locality"),
-                districts.c.name.label("district"),
-                streets.c.name.label("street"),
-                houses.c.number.label("house"),
-                houses.c.index.label("index"),
-            ]
-        )
-        .select_from(join)
-        .where(houses.c.id == house_id)
+
+    return select(
+        [
+            *columns,
+            countries.c.name.label("country"),
+            regions.c.name.label("region"),
+            areas.c.name.label("area"),
+            localities.c.name.label("locality"),
+            districts.c.name.label("district"),
+            streets.c.name.label("street"),
+            houses.c.number.label("house"),
+            houses.c.index.label("index"),
+        ]
+    ).select_from(join)
+
+
+def _address_flat_select(*columns):
+    """
+    Make select of full address columns from flattened addresses.
+
+    :param columns: Additional columns to select
+    :return: Select query without conditions
+    """
+
+    return select(
+        [
+            *columns,
+            address_flat.c.country,
+            address_flat.c.region,
+            address_flat.c.area,
+            address_flat.c.locality,
+            address_flat.c.district,
+            address_flat.c.street,
+            address_flat.c.house,
+            address_flat.c.index,
+        ]
     )
 
-    full_address = await conn.fetchrow(sql)
+
+HOUSE_IDS = bindparam("house_ids", type_=ARRAY(Integer))
+
+FULL_ADDRESS_QUERY = register_query(
+    "full_address",
+    _full_address_select().where(houses.c.id == bindparam("house_id")),
+)
+FLAT_FULL_ADDRESS_QUERY = register_query(
+    "flat_full_address",
+    _address_flat_select().where(
+        address_flat.c.house_id == bindparam("house_id")
+    ),
+)
+FULL_ADDRESSES_QUERY = register_query(
+    "full_addresses",
+    _full_address_select(houses.c.id)
+    .where(houses.c.id == any_(HOUSE_IDS))
+    .order_by(houses.c.id),
+)
+FLAT_FULL_ADDRESSES_QUERY = register_query(
+    "flat_full_addresses",
+    _address_flat_select(address_flat.c.house_id.label("id"))
+    .where(address_flat.c.house_id == any_(HOUSE_IDS))
+    .order_by(address_flat.c.house_id),
+)
+
+
+def _postcode_pattern(code: str) -> str:
+    """
+    Get LIKE pattern of postcode, partial postcode is searched as prefix.
+
+    :param code: Postcode or its beginning of digits
+    :type code: str
+    :return: Pattern
+    :rtype: str
+    """
+
+    return code if len(code) >= POSTCODE_LENGTH else f"{code}%"
+
+
+POSTCODE_LOCALITY_IDS = select([postcode_streets.c.locality_id]).where(
+    postcode_streets.c.index.like(PATTERN)
+)
+POSTCODE_STREET_IDS = select([postcode_streets.c.street_id]).where(
+    postcode_streets.c.index.like(PATTERN)
+)
+
+POSTCODE_STREETS_QUERY = register_query(
+    "postcode_streets",
+    _page(
+        select([postcode_streets]).where(
+            postcode_streets.c.index.like(PATTERN)
+        ),
+        postcode_streets.c.id,
+    ),
+)
+
+
+async def get_postcode_streets(
+    conn: PoolConnectionProxy,
+    *,
+    code: str,
+    limit: int = 0,
+    after_id: Optional[int] = None,
+) -> List[Record]:
+    """
+    Get pairs of locality and street with postcode from precomputed
+    mapping of postcodes.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param code: Postcode or its beginning
+    :type code: str
+    :param limit: Requested count of records, 0 for default
+    :type limit: int
+    :param after_id: Id of last record of previous page
+    :type after_id: Optional[int]
+    :return: Postcodes with locality and street and count of houses
+    :rtype: List[Record]
+    """
+
+    return await POSTCODE_STREETS_QUERY.fetch(
+        conn, pattern=_postcode_pattern(code), **_page_params(limit, after_id),
+    )
+
+
+LOCALITIES_BY_POSTCODE_QUERY = register_query(
+    "localities_by_postcode",
+    _page(
+        select([localities]).where(localities.c.id.in_(POSTCODE_LOCALITY_IDS)),
+        localities.c.id,
+    ),
+)
+
+
+async def get_localities_by_postcode(
+    conn: PoolConnectionProxy,
+    *,
+    code: str,
+    limit: int = 0,
+    after_id: Optional[int] = None,
+) -> List[Record]:
+    """
+    Get distinct localities with postcode.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param code: Postcode or its beginning
+    :type code: str
+    :param limit: Requested count of records, 0 for default
+    :type limit: int
+    :param after_id: Id of last record of previous page
+    :type after_id: Optional[int]
+    :return: Localities
+    :rtype: List[Record]
+    """
+
+    return await LOCALITIES_BY_POSTCODE_QUERY.fetch(
+        conn, pattern=_postcode_pattern(code), **_page_params(limit, after_id),
+    )
+
+
+STREETS_BY_POSTCODE_QUERY = register_query(
+    "streets_by_postcode",
+    _page(
+        select([streets]).where(streets.c.id.in_(POSTCODE_STREET_IDS)),
+        streets.c.id,
+    ),
+)
+
+
+async def get_streets_by_postcode(
+    conn: PoolConnectionProxy,
+    *,
+    code: str,
+    limit: int = 0,
+    after_id: Optional[int] = None,
+) -> List[Record]:
+    """
+    Get distinct streets with postcode.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param code: Postcode or its beginning
+    :type code: str
+    :param limit: Requested count of records, 0 for default
+    :type limit: int
+    :param after_id: Id of last record of previous page
+    :type after_id: Optional[int]
+    :return: Streets
+    :rtype: List[Record]
+    """
+
+    return await STREETS_BY_POSTCODE_QUERY.fetch(
+        conn, pattern=_postcode_pattern(code), **_page_params(limit, after_id),
+    )
+
+
+# Houses are looked up only in streets with postcode
+HOUSES_BY_POSTCODE_QUERY = register_query(
+    "houses_by_postcode",
+    _page(
+        select([houses]).where(
+            and_(
+                houses.c.street_id.in_(POSTCODE_STREET_IDS),
+                houses.c.index.like(PATTERN),
+            )
+        ),
+        houses.c.id,
+    ),
+)
+
+
+async def get_houses_by_postcode(
+    conn: PoolConnectionProxy,
+    *,
+    code: str,
+    limit: int = 0,
+    after_id: Optional[int] = None,
+) -> List[Record]:
+    """
+    Get houses with postcode.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param code: Postcode or its beginning
+    :type code: str
+    :param limit: Requested count of records, 0 for default
+    :type limit: int
+    :param after_id: Id of last record of previous page
+    :type after_id: Optional[int]
+    :return: Houses
+    :rtype: List[Record]
+    """
+
+    return await HOUSES_BY_POSTCODE_QUERY.fetch(
+        conn, pattern=_postcode_pattern(code), **_page_params(limit, after_id),
+    )
+
+
+DATA_VERSION_QUERY = register_query(
+    "data_version", select([data_versions.c.version])
+)
+
+
+async def get_full_address_by_house(
+    conn: PoolConnectionProxy, *, house_id: int, flat: bool = False
+):
+    """"""
+
+    query = FLAT_FULL_ADDRESS_QUERY if flat else FULL_ADDRESS_QUERY
+    full_address = await query.fetchrow(conn, house_id=house_id)
 
     return full_address
+
+
+def get_full_addresses_by_houses(
+    conn: PoolConnectionProxy, *, house_ids: List[int], flat: bool = False
+) -> CursorFactory:
+    """
+    Get cursor of full addresses of houses by one query.
+    Cursor must be iterated inside of transaction.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param house_ids: Ids of houses
+    :type house_ids: List[int]
+    :param flat: Read from address_flat materialized view
+    :type flat: bool
+    :return: Cursor of full addresses with house id, ordered by house id
+    :rtype: CursorFactory
+    """
+
+    query = FLAT_FULL_ADDRESSES_QUERY if flat else FULL_ADDRESSES_QUERY
+
+    return query.cursor(
+        conn, prefetch=FULL_ADDRESSES_PREFETCH, house_ids=house_ids
+    )
+
+
+async def get_data_version(conn: PoolConnectionProxy) -> int:
+    """
+    Get version of uploaded data.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :return: Data version
+    :rtype: int
+    """
+
+    version = await DATA_VERSION_QUERY.fetchval(conn)
+
+    return version or 0
@@ -0,0 +1,209 @@
+from array import array
+import asyncio
+from bisect import bisect_left
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from asyncpg.pool import PoolConnectionProxy
+from sqlalchemy.sql import select
+
+from db.schema import districts, localities, streets
+
+
+AUTOCOMPLETE_MAX_LIMIT = 200
+
+_WORD_START = re.compile(r"(?<![\w'])\w", re.UNICODE)
+_APOSTROPHES = str.maketrans({"’": "'", "ʼ": "'", "`": "'", "‘": "'"})
+
+
+def normalize(value: str) -> str:
+    """
+    Normalize name or query for prefix search.
+
+    :param value: Name or query
+    :type value: str
+    :return: Normalized value
+    :rtype: str
+    """
+
+    return " ".join(value.translate(_APOSTROPHES).casefold().split())
+
+
+class PrefixIndex:
+    """
+    In-memory prefix index of names grouped by parent id.
+
+    Every name is indexed by its suffixes which start at word boundaries,
+    so a query matches a name if it is a prefix of any word of the name
+    (including the following words).
+    """
+
+    def __init__(self, *, fields: Sequence[str]):
+        self.fields = tuple(fields)
+        self._records: List[Tuple] = []
+        self._groups: Dict[Optional[int], Tuple[list, array, array]] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @classmethod
+    def build(
+        cls,
+        records: Iterable,
+        *,
+        fields: Sequence[str],
+        parent_field: Optional[str],
+    ) -> "PrefixIndex":
+        """
+        Build prefix index from records.
+
+        :param records: Records with all fields and "name" field
+        :type records: Iterable
+        :param fields: Fields of records to return from search
+        :type fields: Sequence[str]
+        :param parent_field: Field to group records by, None for one group
+        :type parent_field: Optional[str]
+        :return: Prefix index
+        :rtype: PrefixIndex
+        """
+
+        index = cls(fields=fields)
+        unsorted_groups: Dict[Optional[int], list] = {}
+
+        for record in records:
+            record_index = len(index._records)
+            index._records.append(tuple(record[field] for field in fields))
+            name = normalize(record["name"])
+            group = unsorted_groups.setdefault(
+                record[parent_field] if parent_field else None, []
+            )
+
+            for position, match in enumerate(_WORD_START.finditer(name)):
+                start = match.start()
+                group.append((name[start:], position, record_index))
+
+        for parent_id, group in unsorted_groups.items():
+            group.sort()
+            index._groups[parent_id] = (
+                [key for key, _, _ in group],
+                array("H", (min(position, 65535) for _, position, _ in group)),
+                array("I", (record_index for _, _, record_index in group)),
+            )
+
+        return index
+
+    def search(
+        self, *, prefix: str, parent_id: Optional[int] = None, limit: int = 0
+    ) -> List[dict]:
+        """
+        Find records by prefix of any word in their names.
+        Matches at the start of the name go first, then shorter names.
+
+        :param prefix: Prefix to search
+        :type prefix: str
+        :param parent_id: Parent id of records, None for ungrouped index
+        :type parent_id: Optional[int]
+        :param limit: Max count of records, AUTOCOMPLETE_MAX_LIMIT at most
+        :type limit: int
+        :return: Found records
+        :rtype: List[dict]
+        """
+
+        prefix = normalize(prefix)
+        limit = max(0, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+        limit = limit or AUTOCOMPLETE_MAX_LIMIT
+
+        if not prefix or (group := self._groups.get(parent_id)) is None:
+            return []
+
+        keys, positions, record_indexes = group
+        name_index = self.fields.index("name")
+        ranks: Dict[int, Tuple] = {}
+
+        for key_index in range(bisect_left(keys, prefix), len(keys)):
+            if not keys[key_index].startswith(prefix):
+                break
+
+            record_index = record_indexes[key_index]
+            name = self._records[record_index][name_index]
+            rank = (positions[key_index] > 0, len(name), name, record_index)
+
+            if record_index not in ranks or rank < ranks[record_index]:
+                ranks[record_index] = rank
+
+        return [
+            dict(zip(self.fields, self._records[rank[-1]]))
+            for rank in sorted(ranks.values())[:limit]
+        ]
+
+
+class AutocompleteIndex:
+    """Prefix indexes of streets and localities."""
+
+    def __init__(self):
+        self.streets = PrefixIndex(fields=("id", "district_id", "name"))
+        self.localities = PrefixIndex(fields=("id", "area_id", "name"))
+        self.localities_in_area = self.localities
+
+    async def rebuild(self, conn: PoolConnectionProxy) -> None:
+        """
+        Rebuild indexes from database and replace current ones.
+        Indexes are built in thread of default executor, so requests
+        are answered by current ones meanwhile, and they are replaced
+        together.
+
+        :param conn: Pool of connections to database
+        :type conn: PoolConnectionProxy
+        """
+
+        join = streets.join(districts, streets.c.district_id == districts.c.id)
+        streets_records = await conn.fetch(
+            select(
+                [
+                    streets.c.id,
+                    streets.c.district_id,
+                    streets.c.name,
+                    districts.c.locality_id,
+                ]
+            ).select_from(join)
+        )
+        localities_records = await conn.fetch(select([localities]))
+
+        indexes = await asyncio.get_event_loop().run_in_executor(
+            None, self._build, streets_records, localities_records
+        )
+        # No request runs between assignments, so all indexes are new
+        self.streets, self.localities, self.localities_in_area = indexes
+
+    @staticmethod
+    def _build(
+        streets_records: Sequence, localities_records: Sequence
+    ) -> Tuple[PrefixIndex, PrefixIndex, PrefixIndex]:
+        """
+        Build indexes of streets, localities and localities by area.
+
+        :param streets_records: Records of streets with locality id
+        :type streets_records: Sequence
+        :param localities_records: Records of localities
+        :type localities_records: Sequence
+        :return: Indexes
+        :rtype: Tuple[PrefixIndex, PrefixIndex, PrefixIndex]
+        """
+
+        return (
+            PrefixIndex.build(
+                streets_records,
+                fields=("id", "district_id", "name"),
+                parent_field="locality_id",
+            ),
+            PrefixIndex.build(
+                localities_records,
+                fields=("id", "area_id", "name"),
+                parent_field=None,
+            ),
+            PrefixIndex.build(
+                localities_records,
+                fields=("id", "area_id", "name"),
+                parent_field="area_id",
+            ),
+        )
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+from aiohttp import web
+from asyncpg.pool import PoolConnectionProxy
+
+from logic.api import get_data_version
+
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[[PoolConnectionProxy], Awaitable[None]]
+
+
+class DataVersion:
+    """Version of uploaded data which is bumped by uploader."""
+
+    def __init__(self):
+        self.value: Optional[int] = None
+        self._listeners: List[Listener] = []
+
+    def add_listener(self, listener: Listener) -> None:
+        """
+        Add coroutine function which is called when data version changes.
+
+        :param listener: Coroutine function with connection argument
+        :type listener: Listener
+        """
+
+        self._listeners.append(listener)
+
+    async def refresh(self, conn: PoolConnectionProxy) -> bool:
+        """
+        Load current data version and notify listeners if it has changed.
+
+        :param conn: Pool of connections to database
+        :type conn: PoolConnectionProxy
+        :return: Has data version changed
+        :rtype: bool
+        """
+
+        version = await get_data_version(conn)
+
+        if version == self.value:
+            return False
+
+        for listener in self._listeners:
+            await listener(conn)
+
+        self.value = version
+
+        return True
+
+
+async def watch_data_version(app: web.Application, interval: float) -> None:
+    """
+    Refresh data version of application periodically.
+
+    :param app: Current application
+    :type app: web.Application
+    :param interval: Interval between checks in seconds
+    :type interval: float
+    """
+
+    while True:
+        await asyncio.sleep(interval)
+
+        try:
+            async with app["db"].acquire() as conn:
+                await app["data_version"].refresh(conn)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Can't refresh data version")
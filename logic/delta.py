@@ -0,0 +1,382 @@
+import csv
+import hashlib
+from os import makedirs, path, rename
+from shutil import rmtree
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import zlib
+
+from config import UPLOADS_DIR
+
+
+SNAPSHOTS_DIR = path.join(UPLOADS_DIR, "snapshots")
+SNAPSHOT_PARTITIONS = 256
+FINGERPRINT_FILENAME = "fingerprint"
+
+# Fields of normalized row, the first five of them are key of district
+# and rows are partitioned by it, so all streets of district are compared
+# in one partition
+ROW_FIELDS = (
+    "country_code",
+    "region",
+    "area",
+    "locality",
+    "district",
+    "street",
+    "house",
+    "index",
+    "country",
+)
+DISTRICT_KEY_SIZE = 5
+COUNTRY_CODE_FIELD = ROW_FIELDS.index("country_code")
+COUNTRY_FIELD = ROW_FIELDS.index("country")
+HOUSE_FIELD = ROW_FIELDS.index("house")
+INDEX_FIELD = ROW_FIELDS.index("index")
+
+NormalizedRow = Tuple[str, ...]
+StreetKey = Tuple[str, ...]
+
+
+def normalize_row(row: dict) -> NormalizedRow:
+    """
+    Make normalized row from formatted address row.
+
+    :param row: Formatted address row
+    :type row: dict
+    :return: Normalized row with ROW_FIELDS values
+    :rtype: NormalizedRow
+    """
+
+    return (
+        row["Country"].code,
+        row["Region"].name,
+        row["Area"].name,
+        row["Locality"].name,
+        row["District"].name,
+        row["Street"].name,
+        row["House"].number,
+        row["House"].index,
+        row["Country"].name,
+    )
+
+
+class Snapshot:
+    """
+    Normalized address rows of source snapshot in files partitioned
+    by hash of district with fingerprint of all rows.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+        with open(path.join(directory, FINGERPRINT_FILENAME)) as file:
+            self.fingerprint, partitions, rows_count = file.read().split()
+
+        self.partitions = int(partitions)
+        self.rows_count = int(rows_count)
+
+    @classmethod
+    def open(cls, directory: str) -> Optional["Snapshot"]:
+        """
+        Open snapshot if it is complete.
+
+        :param directory: Directory of snapshot
+        :type directory: str
+        :return: Snapshot or None if it doesn't exist
+        :rtype: Optional[Snapshot]
+        """
+
+        if not path.isfile(path.join(directory, FINGERPRINT_FILENAME)):
+            return None
+
+        return cls(directory)
+
+    @classmethod
+    def write(
+        cls,
+        directory: str,
+        rows: Iterable[dict],
+        *,
+        partitions: int = SNAPSHOT_PARTITIONS,
+    ) -> "Snapshot":
+        """
+        Write formatted address rows to partitions of new snapshot
+        and count fingerprint of it. Fingerprint doesn't depend on order
+        of rows.
+
+        :param directory: Directory of snapshot, it is cleared at first
+        :type directory: str
+        :param rows: Formatted address rows
+        :type rows: Iterable[dict]
+        :param partitions: Count of partitions
+        :type partitions: int
+        :return: Snapshot
+        :rtype: Snapshot
+        """
+
+        rmtree(directory, ignore_errors=True)
+        makedirs(directory)
+
+        files = [
+            open(
+                _partition_path(directory, number),
+                "w",
+                encoding="utf-8",
+                newline="",
+            )
+            for number in range(partitions)
+        ]
+        writers = [csv.writer(file, delimiter="\t") for file in files]
+        rows_count = 0
+
+        try:
+            for row in rows:
+                values = normalize_row(row)
+                writers[_partition_number(values, partitions)].writerow(values)
+                rows_count += 1
+        finally:
+            for file in files:
+                file.close()
+
+        fingerprint = hashlib.sha256()
+
+        for number in range(partitions):
+            with open(_partition_path(directory, number), "rb") as file:
+                lines = sorted(set(file))
+
+            fingerprint.update(hashlib.sha256(b"".join(lines)).digest())
+
+        with open(path.join(directory, FINGERPRINT_FILENAME), "w") as file:
+            file.write(f"{fingerprint.hexdigest()} {partitions} {rows_count}")
+
+        return cls(directory)
+
+    def read_partition(self, number: int) -> List[NormalizedRow]:
+        """
+        Read normalized rows of partition.
+
+        :param number: Number of partition
+        :type number: int
+        :return: Normalized rows
+        :rtype: List[NormalizedRow]
+        """
+
+        with open(
+            _partition_path(self.directory, number),
+            encoding="utf-8",
+            newline="",
+        ) as file:
+            return [
+                tuple(values) for values in csv.reader(file, delimiter="\t")
+            ]
+
+    def iter_rows(self) -> Iterator[NormalizedRow]:
+        """
+        Generator of normalized address rows of all partitions.
+
+        :return: Normalized address row
+        :rtype: NormalizedRow
+        """
+
+        for number in range(self.partitions):
+            yield from self.read_partition(number)
+
+    def replace(self, directory: str) -> "Snapshot":
+        """
+        Move snapshot to directory instead of snapshot which is there.
+
+        :param directory: New directory of snapshot
+        :type directory: str
+        :return: Moved snapshot
+        :rtype: Snapshot
+        """
+
+        rmtree(directory, ignore_errors=True)
+        rename(self.directory, directory)
+
+        return Snapshot(directory)
+
+
+class Delta:
+    """Changes of address rows between two snapshots."""
+
+    def __init__(self):
+        self.inserts: List[NormalizedRow] = []
+        self.deletes: List[NormalizedRow] = []
+        self.index_updates: List[NormalizedRow] = []
+        self.renames: List[Tuple[StreetKey, str]] = []
+
+    def __len__(self) -> int:
+        return (
+            len(self.inserts)
+            + len(self.deletes)
+            + len(self.index_updates)
+            + len(self.renames)
+        )
+
+
+def _partition_path(directory: str, number: int) -> str:
+    """
+    Get path of partition file.
+
+    :param directory: Directory of snapshot
+    :type directory: str
+    :param number: Number of partition
+    :type number: int
+    :return: Path of partition file
+    :rtype: str
+    """
+
+    return path.join(directory, f"part-{number:04}.tsv")
+
+
+def _partition_number(values: NormalizedRow, partitions: int) -> int:
+    """
+    Get number of partition of normalized row by its district.
+
+    :param values: Normalized row
+    :type values: NormalizedRow
+    :param partitions: Count of partitions
+    :type partitions: int
+    :return: Number of partition
+    :rtype: int
+    """
+
+    district_key = "\t".join(values[:DISTRICT_KEY_SIZE]).encode("utf-8")
+
+    return zlib.crc32(district_key) % partitions
+
+
+def _group_by_street(
+    rows: Iterable[NormalizedRow],
+) -> Dict[StreetKey, Dict[str, NormalizedRow]]:
+    """
+    Group normalized rows by street and house number.
+
+    :param rows: Normalized rows
+    :type rows: Iterable[NormalizedRow]
+    :return: Rows by house number by street key
+    :rtype: Dict[StreetKey, Dict[str, NormalizedRow]]
+    """
+
+    streets: Dict[StreetKey, Dict[str, NormalizedRow]] = {}
+
+    for values in rows:
+        street_key = values[: DISTRICT_KEY_SIZE + 1]
+        streets.setdefault(street_key, {})[values[HOUSE_FIELD]] = values
+
+    return streets
+
+
+def _houses_signature(houses: Dict[str, NormalizedRow]) -> frozenset:
+    """
+    Get street houses signature to find renamed streets.
+
+    :param houses: Rows by house number
+    :type houses: Dict[str, NormalizedRow]
+    :return: Set of house numbers and indexes
+    :rtype: frozenset
+    """
+
+    return frozenset(
+        (number, values[INDEX_FIELD]) for number, values in houses.items()
+    )
+
+
+def diff_rows(
+    old_rows: Iterable[NormalizedRow], new_rows: Iterable[NormalizedRow]
+) -> Delta:
+    """
+    Find changes between rows of old and new snapshots.
+    Street of district is considered renamed if it has disappeared
+    and a new street of the same district has the same houses.
+
+    :param old_rows: Normalized rows of old snapshot
+    :type old_rows: Iterable[NormalizedRow]
+    :param new_rows: Normalized rows of new snapshot
+    :type new_rows: Iterable[NormalizedRow]
+    :return: Changes
+    :rtype: Delta
+    """
+
+    delta = Delta()
+    old_streets = _group_by_street(old_rows)
+    new_streets = _group_by_street(new_rows)
+    vanished: Dict[Tuple, List[StreetKey]] = {}
+
+    for street_key, old_houses in old_streets.items():
+        if street_key not in new_streets:
+            signature = (
+                street_key[:DISTRICT_KEY_SIZE],
+                _houses_signature(old_houses),
+            )
+            vanished.setdefault(signature, []).append(street_key)
+
+    for street_key, new_houses in new_streets.items():
+        if (old_houses := old_streets.get(street_key)) is None:
+            signature = (
+                street_key[:DISTRICT_KEY_SIZE],
+                _houses_signature(new_houses),
+            )
+
+            if vanished.get(signature):
+                old_key = vanished[signature].pop()
+                delta.renames.append((old_key, street_key[-1]))
+            else:
+                delta.inserts.extend(new_houses.values())
+
+            continue
+
+        for number, values in new_houses.items():
+            if (old_values := old_houses.get(number)) is None:
+                delta.inserts.append(values)
+            elif old_values[INDEX_FIELD] != values[INDEX_FIELD]:
+                delta.index_updates.append(values)
+
+        delta.deletes.extend(
+            values
+            for number, values in old_houses.items()
+            if number not in new_houses
+        )
+
+    for street_keys in vanished.values():
+        for street_key in street_keys:
+            delta.deletes.extend(old_streets[street_key].values())
+
+    return delta
+
+
+def iter_deltas(old: Snapshot, new: Snapshot) -> Iterator[Delta]:
+    """
+    Generator of changes between snapshots partition by partition.
+
+    :param old: Old snapshot
+    :type old: Snapshot
+    :param new: New snapshot, partitioned as old one
+    :type new: Snapshot
+    :raise ValueError: Snapshots are partitioned differently
+    :return: Changes of partition
+    :rtype: Iterator[Delta]
+    """
+
+    if old.partitions != new.partitions:
+        raise ValueError("Snapshots are partitioned differently")
+
+    for number in range(new.partitions):
+        yield diff_rows(old.read_partition(number), new.read_partition(number))
+
+
+def snapshot_directory(source_name: str, *, new: bool = False) -> str:
+    """
+    Get directory of the last loaded or new snapshot of source.
+
+    :param source_name: Source class name
+    :type source_name: str
+    :param new: Get directory of new snapshot
+    :type new: bool
+    :return: Directory of snapshot
+    :rtype: str
+    """
+
+    return path.join(
+        SNAPSHOTS_DIR, f"{source_name}.new" if new else source_name
+    )
@@ -1,19 +1,35 @@
-class AddressEntity:
-    """Base class for address types."""
+from typing import Any
+
+
+def strip_value(value: Any) -> Any:
+    """
+    Trim string value, other values are returned as is.
+
+    :param value: Value of attribute
+    :type value: Any
+    :return: Trimmed value
+    :rtype: Any
+    """
 
-    def __setattr__(self, key, value):
-        """Trim string values in class attributes"""
+    return value.strip() if isinstance(value, str) else value
 
-        super().__setattr__(
-            key, value.strip() if isinstance(value, str) else value
-        )
+
+class AddressEntity:
+    """
+    Base class for address types. Attributes are kept in slots
+    and string values are trimmed once on construction.
+    """
+
+    __slots__ = ()
 
 
 class AddressEntityWithName(AddressEntity):
     """Base class for address types with name attribute."""
 
+    __slots__ = ("name",)
+
     def __init__(self, *, name: str):
-        self.name = name
+        self.name = strip_value(name)
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}: {self.name}>"
@@ -22,23 +38,29 @@ class AddressEntityWithName(AddressEntity):
 class Country(AddressEntityWithName):
     """Country address type."""
 
+    __slots__ = ("code",)
+
     def __init__(self, *, name: str, code: str):
         super().__init__(name=name)
-        self.code = code
+        self.code = strip_value(code)
 
 
 class Region(AddressEntityWithName):
     """Region address type."""
 
+    __slots__ = ("country_id", "geoip_name")
+
     def __init__(self, *, name: str, geoip_name: str = ""):
         super().__init__(name=name)
         self.country_id = None
-        self.geoip_name = geoip_name
+        self.geoip_name = strip_value(geoip_name)
 
 
 class Area(AddressEntityWithName):
     """Area address type."""
 
+    __slots__ = ("region_id",)
+
     def __init__(self, *, name: str):
         super().__init__(name=name)
         self.region_id = None
@@ -47,6 +69,8 @@ class Area(AddressEntityWithName):
 class Locality(AddressEntityWithName):
     """Locality address type."""
 
+    __slots__ = ("area_id",)
+
     def __init__(self, *, name: str):
         super().__init__(name=name)
         self.area_id = None
@@ -55,6 +79,8 @@ class Locality(AddressEntityWithName):
 class District(AddressEntityWithName):
     """District address type."""
 
+    __slots__ = ("locality_id",)
+
     def __init__(self, *, name: str):
         super().__init__(name=name)
         self.locality_id = None
@@ -63,6 +89,8 @@ class District(AddressEntityWithName):
 class Street(AddressEntityWithName):
     """Street address type."""
 
+    __slots__ = ("district_id",)
+
     def __init__(self, *, name: str):
         super().__init__(name=name)
         self.district_id = None
@@ -71,10 +99,12 @@ class Street(AddressEntityWithName):
 class House(AddressEntity):
     """House address type."""
 
+    __slots__ = ("number", "street_id", "index")
+
     def __init__(self, *, number: str, index: str = ""):
-        self.number = number
+        self.number = strip_value(number)
         self.street_id = None
-        self.index = index
+        self.index = strip_value(index)
 
     def __repr__(self) -> str:
         return f"<{__class__.__name__}: {self.number}>"
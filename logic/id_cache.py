@@ -0,0 +1,159 @@
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from asyncpg.pool import PoolConnectionProxy
+
+from db.schema import (
+    areas,
+    countries,
+    districts,
+    localities,
+    regions,
+    streets,
+)
+from logic.entities import AddressEntity
+
+
+# Cached address levels: (table, parent id column, key column)
+CACHED_LEVELS = {
+    "country": (countries, None, "code"),
+    "region": (regions, "country_id", "name"),
+    "area": (areas, "region_id", "name"),
+    "locality": (localities, "area_id", "name"),
+    "district": (districts, "locality_id", "name"),
+    "street": (streets, "district_id", "name"),
+}
+CACHE_MAX_SIZE = 1000000
+
+
+class IdCache:
+    """
+    Bounded LRU cache of address records identifiers
+    by level, parent id and name.
+    """
+
+    def __init__(self, *, max_size: int = CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._ids = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @staticmethod
+    def make_key(
+        *, level: str, obj: AddressEntity
+    ) -> Optional[Tuple[str, Optional[int], Hashable]]:
+        """
+        Make cache key for address object.
+
+        :param level: Address level
+        :type level: str
+        :param obj: Address object with filled parent id
+        :type obj: AddressEntity
+        :return: Cache key or None if level isn't cached
+        :rtype: Optional[Tuple[str, Optional[int], Hashable]]
+        """
+
+        if level not in CACHED_LEVELS:
+            return None
+
+        _, parent_column, key_column = CACHED_LEVELS[level]
+        parent_id = getattr(obj, parent_column) if parent_column else None
+
+        return level, parent_id, getattr(obj, key_column)
+
+    def get(self, key: Optional[Tuple]) -> Optional[int]:
+        """
+        Get cached identifier and count hit or miss.
+
+        :param key: Cache key
+        :type key: Optional[Tuple]
+        :return: Identifier if cached, otherwise None
+        :rtype: Optional[int]
+        """
+
+        if key is None:
+            return None
+
+        if (object_id := self._ids.get(key)) is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._ids.move_to_end(key)
+
+        return object_id
+
+    def set(self, key: Optional[Tuple], object_id: int) -> None:
+        """
+        Put identifier into cache and evict least recently used one
+        if cache is full.
+
+        :param key: Cache key
+        :type key: Optional[Tuple]
+        :param object_id: Identifier of address record
+        :type object_id: int
+        """
+
+        if key is None or self.max_size <= 0:
+            return
+
+        self._ids[key] = object_id
+        self._ids.move_to_end(key)
+
+        if len(self._ids) > self.max_size:
+            self._ids.popitem(last=False)
+
+    async def warm_up(self, conn: PoolConnectionProxy) -> int:
+        """
+        Fill cache by existing records level by level from top to bottom
+        while it has free space.
+
+        :param conn: Pool of connections to database
+        :type conn: PoolConnectionProxy
+        :return: Count of loaded identifiers
+        :rtype: int
+        """
+
+        loaded = 0
+
+        for level, (table, parent_column, key_column) in CACHED_LEVELS.items():
+            if (free_space := self.max_size - len(self._ids)) <= 0:
+                break
+
+            records = await conn.fetch(
+                f"""
+                SELECT
+                    id, {parent_column or "NULL"} AS parent_id, {key_column}
+                FROM {table.name}
+                LIMIT $1
+                """,
+                free_space,
+            )
+
+            for record in records:
+                self.set((level, record[1], record[2]), record["id"])
+
+            loaded += len(records)
+
+        return loaded
+
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        :return: Size, bound, hits, misses and hit ratio of cache
+        :rtype: dict
+        """
+
+        requests = self.hits + self.misses
+
+        return {
+            "size": len(self._ids),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / requests, 4) if requests else 0.0,
+        }
@@ -0,0 +1,220 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from asyncpg.cursor import CursorFactory
+from asyncpg.pool import PoolConnectionProxy
+from asyncpgsa.connection import get_dialect
+from sqlalchemy.dialects.sqlite.pysqlite import SQLiteDialect_pysqlite
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, CollectionAggregate
+
+
+DIALECT = get_dialect()
+# Dialect of read-only snapshots, parameters are numbered like in asyncpg
+SNAPSHOT_DIALECT = SQLiteDialect_pysqlite(paramstyle="pyformat")
+PLACEHOLDERS = {DIALECT.name: "$", SNAPSHOT_DIALECT.name: "?"}
+
+Statement = Tuple[str, List[Tuple[str, Optional[Callable]]]]
+
+QUERIES: Dict[str, "Query"] = {}
+
+
+class Query:
+    """
+    SQLAlchemy query compiled once to sql with positional parameters.
+    Sql text is the same for every call, so asyncpg takes prepared
+    statement from its statement cache and SQLAlchemy isn't called
+    on request.
+    """
+
+    def __init__(self, name: str, expression: Any):
+        self.name = name
+        self._expression = expression
+        self._statements: Dict[str, Statement] = {
+            DIALECT.name: compile_statement(expression, DIALECT)
+        }
+
+    def __repr__(self) -> str:
+        return f"<Query: {self.name}>"
+
+    def statement(
+        self, conn: Optional[PoolConnectionProxy] = None, **params
+    ) -> Tuple:
+        """
+        Get sql and positional arguments of query for dialect
+        of connection, sql of other dialects than postgresql is compiled
+        on first call.
+
+        :param conn: Pool of connections to database, postgresql
+            statement is returned if it isn't passed
+        :type conn: Optional[PoolConnectionProxy]
+        :param params: Values of bind parameters
+        :raise ValueError: Dialect of connection isn't supported
+        :raise KeyError: Value of bind parameter isn't passed
+        :return: Sql and arguments in order of positional parameters
+        :rtype: Tuple
+        """
+
+        dialect_name = getattr(conn, "dialect_name", DIALECT.name)
+
+        if (statement := self._statements.get(dialect_name)) is None:
+            dialect = SNAPSHOT_DIALECT
+
+            if dialect_name != dialect.name:
+                raise ValueError(f"Dialect {dialect_name} isn't supported")
+
+            statement = compile_statement(self._expression, dialect)
+            self._statements[dialect_name] = statement
+
+        sql, bind_params = statement
+
+        return (
+            sql,
+            [
+                processor(params[param]) if processor else params[param]
+                for param, processor in bind_params
+            ],
+        )
+
+    async def fetch(self, conn: PoolConnectionProxy, **params) -> List:
+        """
+        Fetch records of query.
+
+        :param conn: Pool of connections to database
+        :type conn: PoolConnectionProxy
+        :param params: Values of bind parameters
+        :return: Records
+        :rtype: List
+        """
+
+        sql, args = self.statement(conn, **params)
+
+        return await conn.fetch(sql, *args)
+
+    async def fetchrow(self, conn: PoolConnectionProxy, **params) -> Any:
+        """
+        Fetch first record of query.
+
+        :param conn: Pool of connections to database
+        :type conn: PoolConnectionProxy
+        :param params: Values of bind parameters
+        :return: Record or None
+        :rtype: Any
+        """
+
+        sql, args = self.statement(conn, **params)
+
+        return await conn.fetchrow(sql, *args)
+
+    async def fetchval(self, conn: PoolConnectionProxy, **params) -> Any:
+        """
+        Fetch value of first column of first record of query.
+
+        :param conn: Pool of connections to database
+        :type conn: PoolConnectionProxy
+        :param params: Values of bind parameters
+        :return: Value or None
+        :rtype: Any
+        """
+
+        sql, args = self.statement(conn, **params)
+
+        return await conn.fetchval(sql, *args)
+
+    def cursor(
+        self, conn: PoolConnectionProxy, *, prefetch: int, **params
+    ) -> CursorFactory:
+        """
+        Get cursor of query, it must be iterated inside of transaction.
+
+        :param conn: Pool of connections to database
+        :type conn: PoolConnectionProxy
+        :param prefetch: Count of records fetched at once
+        :type prefetch: int
+        :param params: Values of bind parameters
+        :return: Cursor
+        :rtype: CursorFactory
+        """
+
+        sql, args = self.statement(conn, **params)
+
+        return conn.cursor(sql, *args, prefetch=prefetch)
+
+
+def compile_statement(expression: Any, dialect: Any) -> Statement:
+    """
+    Compile SQLAlchemy query to sql with numbered positional parameters
+    sorted by names. Literals bound by dialect, e.g. LIMIT -1 of sqlite,
+    are put to sql.
+
+    :param expression: SQLAlchemy query with named bind parameters
+    :type expression: Any
+    :param dialect: SQLAlchemy dialect with pyformat parameters
+    :type dialect: Any
+    :return: Sql and names of bind parameters with their processors
+    :rtype: Statement
+    """
+
+    compiled = expression.compile(dialect=dialect)
+    binds = compiled.binds
+    names = sorted(param for param in compiled.params if binds[param].required)
+    processors = compiled._bind_processors
+    placeholder = PLACEHOLDERS[dialect.name]
+    sql = compiled.string % {
+        **{
+            param: compiled.render_literal_value(value, binds[param].type)
+            for param, value in compiled.params.items()
+            if not binds[param].required
+        },
+        **{
+            param: f"{placeholder}{number}"
+            for number, param in enumerate(names, 1)
+        },
+    }
+
+    return sql, [(param, processors.get(param)) for param in names]
+
+
+@compiles(BinaryExpression, "sqlite")
+def _compile_sqlite_binary(element: BinaryExpression, compiler, **kw) -> str:
+    """
+    Compile comparison with ANY of array for sqlite, array is passed
+    as json text and its values are taken by json_each.
+
+    :param element: Binary expression
+    :type element: BinaryExpression
+    :param compiler: Sql compiler of sqlite dialect
+    :return: Sql
+    :rtype: str
+    """
+
+    if element.operator is operators.eq and isinstance(
+        element.right, CollectionAggregate
+    ):
+        return "{} IN (SELECT value FROM json_each({}))".format(
+            compiler.process(element.left, **kw),
+            compiler.process(element.right.element, **kw),
+        )
+
+    return compiler.visit_binary(element, **kw)
+
+
+def register_query(name: str, expression: Any) -> Query:
+    """
+    Compile query and put it to registry.
+
+    :param name: Unique name of query
+    :type name: str
+    :param expression: SQLAlchemy query with named bind parameters
+    :type expression: Any
+    :raise ValueError: Query with the name is registered already
+    :return: Compiled query
+    :rtype: Query
+    """
+
+    if name in QUERIES:
+        raise ValueError(f"Query {name} is registered already")
+
+    QUERIES[name] = query = Query(name, expression)
+
+    return query
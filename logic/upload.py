@@ -1,7 +1,8 @@
-from typing import Optional, Union
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 from asyncpg import Record
 from asyncpg.pool import PoolConnectionProxy
+from sqlalchemy import Table
 from sqlalchemy.sql import and_, or_, select
 
 from db.schema import (
@@ -11,8 +12,18 @@ from db.schema import (
     houses,
     localities,
     regions,
+    source_snapshots,
     streets,
 )
+from logic.delta import (
+    COUNTRY_CODE_FIELD,
+    COUNTRY_FIELD,
+    HOUSE_FIELD,
+    INDEX_FIELD,
+    ROW_FIELDS,
+    Delta,
+    NormalizedRow,
+)
 from logic.entities import (
     Area,
     Country,
@@ -22,6 +33,70 @@ from logic.entities import (
     Region,
     Street,
 )
+from logic.id_cache import IdCache
+
+
+# Hierarchy levels below country in the order they have to be resolved:
+# (level, table, parent id column, extra text columns with their values)
+BULK_LEVELS = (
+    ("region", regions, "country_id", (("geoip_name", ""),)),
+    ("area", areas, "region_id", ()),
+    ("locality", localities, "area_id", ()),
+    ("district", districts, "locality_id", ()),
+    ("street", streets, "district_id", ()),
+)
+
+# Join of district with its ancestors and condition to find district
+# by names of the whole path from "input" rows
+DISTRICT_PATH_JOIN = """
+    district
+    JOIN locality ON locality.id = district.locality_id
+    JOIN area ON area.id = locality.area_id
+    JOIN region ON region.id = area.region_id
+    JOIN country ON country.id = region.country_id
+"""
+DISTRICT_PATH_CONDITION = """
+    country.code = input.code
+    AND region.name = input.region
+    AND area.name = input.area
+    AND locality.name = input.locality
+    AND district.name = input.district
+"""
+STREET_PATH_COLUMNS = "code, region, area, locality, district, street"
+
+# Join of locality with its ancestors and condition to find locality
+# by names of the whole path from "input" rows
+LOCALITY_PATH_JOIN = """
+    locality
+    JOIN area ON area.id = locality.area_id
+    JOIN region ON region.id = area.region_id
+    JOIN country ON country.id = region.country_id
+"""
+LOCALITY_PATH_CONDITION = """
+    country.code = input.code
+    AND region.name = input.region
+    AND area.name = input.area
+    AND locality.name = input.locality
+"""
+LOCALITY_PATH_COLUMNS = "code, region, area, locality"
+
+# Columns, join and condition to find records of alternative names
+ALTERNATIVE_NAME_PATHS = {
+    "locality": (
+        LOCALITY_PATH_COLUMNS,
+        LOCALITY_PATH_JOIN,
+        LOCALITY_PATH_CONDITION,
+    ),
+    "street": (
+        STREET_PATH_COLUMNS,
+        f"street, {DISTRICT_PATH_JOIN}",
+        f"""
+        street.district_id = district.id
+        AND street.name = input.street
+        AND {DISTRICT_PATH_CONDITION}
+        """,
+    ),
+}
 
 
 async def find_country(
@@ -436,3 +511,843 @@ async def add_house(
     )
 
     return house_id
+
+
+async def bulk_add_countries(
+    conn: PoolConnectionProxy, *, unique_countries: Dict[str, str]
+) -> Tuple[Dict[str, int], int]:
+    """
+    Add missing country records into database by one statement.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param unique_countries: Names of countries by code
+    :type unique_countries: Dict[str, str]
+    :return: Identifiers of added and existing countries by code
+        and count of added ones
+    :rtype: Tuple[Dict[str, int], int]
+    """
+
+    if not unique_countries:
+        return {}, 0
+
+    records = await conn.fetch(
+        """
+        WITH input (code, name) AS (
+            SELECT * FROM unnest($1::varchar[], $2::varchar[])
+        ), inserted AS (
+            INSERT INTO
+                country (name, code)
+            SELECT name, code FROM input
+            ON CONFLICT (code) DO NOTHING
+            RETURNING id, code
+        )
+        SELECT id, code, true AS created FROM inserted
+        UNION ALL
+        SELECT country.id, country.code, false AS created
+        FROM country JOIN input USING (code)
+        """,
+        list(unique_countries.keys()),
+        list(unique_countries.values()),
+    )
+    ids = {record["code"]: record["id"] for record in records}
+    created = sum(record["created"] for record in records)
+
+    # Country inserted by concurrent transaction isn't visible in snapshot
+    # of the statement, but it is committed when the statement ends
+    if missing_codes := [code for code in unique_countries if code not in ids]:
+        records = await conn.fetch(
+            "SELECT id, code FROM country WHERE code = any($1::varchar[])",
+            missing_codes,
+        )
+        ids.update((record["code"], record["id"]) for record in records)
+
+    return ids, created
+
+
+async def bulk_add_children(
+    conn: PoolConnectionProxy,
+    *,
+    table: Table,
+    parent_column: str,
+    records: Iterable[Tuple],
+    extra_columns: Sequence[str] = (),
+) -> Tuple[Dict[Tuple[int, str], int], int]:
+    """
+    Add missing named records of one hierarchy level into database
+    by one statement.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param table: Table of hierarchy level
+    :type table: Table
+    :param parent_column: Name of column with parent id
+    :type parent_column: str
+    :param records: Tuples of parent id, name and extra columns values
+    :type records: Iterable[Tuple]
+    :param extra_columns: Names of additional text columns
+    :type extra_columns: Sequence[str]
+    :return: Identifiers of added and existing records by parent id
+        and name and count of added ones
+    :rtype: Tuple[Dict[Tuple[int, str], int], int]
+    """
+
+    unique_records = {(record[0], record[1]): record for record in records}
+
+    if not unique_records:
+        return {}, 0
+
+    columns = [parent_column, "name", *extra_columns]
+    casts = ["$1::integer[]"] + [
+        f"${number}::varchar[]" for number in range(2, len(columns) + 1)
+    ]
+
+    level_records = await conn.fetch(
+        f"""
+        WITH input ({", ".join(columns)}) AS (
+            SELECT * FROM unnest({", ".join(casts)})
+        ), inserted AS (
+            INSERT INTO
+                {table.name} ({", ".join(columns)})
+            SELECT {", ".join(columns)} FROM input
+            ON CONFLICT ({parent_column}, name) DO NOTHING
+            RETURNING id, {parent_column}, name
+        )
+        SELECT id, {parent_column}, name, true AS created FROM inserted
+        UNION ALL
+        SELECT
+            {table.name}.id,
+            {table.name}.{parent_column},
+            {table.name}.name,
+            false AS created
+        FROM {table.name} JOIN input USING ({parent_column}, name)
+        """,
+        *(list(values) for values in zip(*unique_records.values())),
+    )
+
+    ids = {
+        (record[parent_column], record["name"]): record["id"]
+        for record in level_records
+    }
+    created = sum(record["created"] for record in level_records)
+    # Record inserted by concurrent transaction isn't visible in snapshot
+    # of the statement, but it is committed when the statement ends
+    if missing_keys := [key for key in unique_records if key not in ids]:
+        level_records = await conn.fetch(
+            f"""
+            SELECT
+                {table.name}.id,
+                {table.name}.{parent_column},
+                {table.name}.name
+            FROM
+                {table.name}
+                JOIN unnest($1::integer[], $2::varchar[])
+                    AS missing ({parent_column}, name)
+                    USING ({parent_column}, name)
+            """,
+            *(list(values) for values in zip(*missing_keys)),
+        )
+        ids.update(
+            ((record[parent_column], record["name"]), record["id"])
+            for record in level_records
+        )
+    return ids, created
+
+
+async def bulk_add_houses(
+    conn: PoolConnectionProxy, *, houses_list: Sequence[Tuple]
+) -> int:
+    """
+    Add missing house records into database through COPY
+    to temporary stage table. Should be called inside of transaction.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param houses_list: Street id, number and index of every house
+    :type houses_list: Sequence[Tuple]
+    :return: Count of added houses
+    :rtype: int
+    """
+
+    await conn.execute(
+        """
+        CREATE TEMPORARY TABLE IF NOT EXISTS house_stage (
+            street_id integer,
+            number varchar(32),
+            index varchar(8)
+        ) ON COMMIT DELETE ROWS
+        """
+    )
+    await conn.copy_records_to_table(
+        "house_stage",
+        records=houses_list,
+        columns=["street_id", "number", "index"],
+    )
+    status = await conn.execute(
+        """
+        INSERT INTO
+            house (street_id, number, index)
+        SELECT DISTINCT ON (street_id, number)
+            street_id, number, index
+        FROM house_stage
+        ON CONFLICT (street_id, number) DO NOTHING
+        """
+    )
+    # Rows are deleted on commit only, batches loaded in one transaction
+    # (e.g. in savepoints of delta upload) mustn't insert them again
+    await conn.execute("TRUNCATE house_stage")
+
+    return int(status.split()[-1])
+
+
+def _get_cached_ids(
+    id_cache: Optional[IdCache], *, level: str, keys: Iterable[Tuple]
+) -> Dict[Tuple, int]:
+    """
+    Get identifiers of unique keys which are present in cache.
+
+    :param id_cache: Cache of address records identifiers
+    :type id_cache: Optional[IdCache]
+    :param level: Address level
+    :type level: str
+    :param keys: Pairs of parent id and name
+    :type keys: Iterable[Tuple]
+    :return: Cached identifiers by keys
+    :rtype: Dict[Tuple, int]
+    """
+
+    if id_cache is None:
+        return {}
+
+    cached_ids = {}
+
+    for key in set(keys):
+        if (object_id := id_cache.get((level, *key))) is not None:
+            cached_ids[key] = object_id
+
+    return cached_ids
+
+
+def _set_cached_ids(
+    id_cache: Optional[IdCache], *, level: str, ids: Dict[Tuple, int]
+) -> None:
+    """
+    Put identifiers of address records into cache.
+
+    :param id_cache: Cache of address records identifiers
+    :type id_cache: Optional[IdCache]
+    :param level: Address level
+    :type level: str
+    :param ids: Identifiers by pairs of parent id and name
+    :type ids: Dict[Tuple, int]
+    """
+
+    if id_cache is None:
+        return
+
+    for key, object_id in ids.items():
+        id_cache.set((level, *key), object_id)
+
+
+async def load_batch(
+    conn: PoolConnectionProxy,
+    *,
+    rows: Sequence[NormalizedRow],
+    id_cache: Optional[IdCache] = None,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Load batch of normalized address rows level by level
+    with set-based statements in one transaction.
+    Records which are present in cache aren't sent to database.
+    Identifiers are put to cache after commit, so concurrent writers
+    sharing the cache don't refer to records which aren't committed.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param rows: Normalized address rows
+    :type rows: Sequence[NormalizedRow]
+    :param id_cache: Cache of address records identifiers
+    :type id_cache: Optional[IdCache]
+    :return: Counts of records by outcome (created, found or cached)
+        by level, records of levels above houses are counted once
+        per batch
+    :rtype: Dict[str, Dict[str, int]]
+    """
+
+    new_ids: List[Tuple[str, Dict[Tuple, int]]] = []
+    counts: Dict[str, Dict[str, int]] = {}
+
+    async with conn.transaction():
+        keys = [(None, values[COUNTRY_CODE_FIELD]) for values in rows]
+        level_ids = _get_cached_ids(id_cache, level="country", keys=keys)
+        added_ids, created = await bulk_add_countries(
+            conn,
+            unique_countries={
+                key[1]: values[COUNTRY_FIELD]
+                for key, values in zip(keys, rows)
+                if key not in level_ids
+            },
+        )
+        added_ids = {(None, code): value for code, value in added_ids.items()}
+        new_ids.append(("country", added_ids))
+        counts["country"] = _level_counts(
+            cached=len(level_ids), added=len(added_ids), created=created
+        )
+        level_ids.update(added_ids)
+        parent_ids = [level_ids[key] for key in keys]
+
+        for level, table, parent_column, extra_values in BULK_LEVELS:
+            field = ROW_FIELDS.index(level)
+            keys = [
+                (parent_id, values[field])
+                for parent_id, values in zip(parent_ids, rows)
+            ]
+            level_ids = _get_cached_ids(id_cache, level=level, keys=keys)
+            added_ids, created = await bulk_add_children(
+                conn,
+                table=table,
+                parent_column=parent_column,
+                records=(
+                    (*key, *(value for _, value in extra_values))
+                    for key in keys
+                    if key not in level_ids
+                ),
+                extra_columns=[column for column, _ in extra_values],
+            )
+            new_ids.append((level, added_ids))
+            counts[level] = _level_counts(
+                cached=len(level_ids), added=len(added_ids), created=created
+            )
+            level_ids.update(added_ids)
+            parent_ids = [level_ids[key] for key in keys]
+
+        created = await bulk_add_houses(
+            conn,
+            houses_list=[
+                (street_id, values[HOUSE_FIELD], values[INDEX_FIELD])
+                for street_id, values in zip(parent_ids, rows)
+            ],
+        )
+        counts["house"] = _level_counts(
+            cached=0, added=len(rows), created=created
+        )
+
+    for level, ids in new_ids:
+        _set_cached_ids(id_cache, level=level, ids=ids)
+
+    return counts
+
+
+def _level_counts(*, cached: int, added: int, created: int) -> Dict[str, int]:
+    """
+    Get counts of records of level by outcome.
+
+    :param cached: Count of records found in cache
+    :type cached: int
+    :param added: Count of records sent to database
+    :type added: int
+    :param created: Count of records created by database
+    :type created: int
+    :return: Counts of records by outcome: created, found, cached
+    :rtype: Dict[str, int]
+    """
+
+    counts = {"created": created, "found": added - created}
+
+    if cached:
+        counts["cached"] = cached
+
+    return counts
+
+
+def _varchar_arrays(count: int) -> str:
+    """
+    Make list of varchar array parameters for unnest.
+
+    :param count: Count of parameters
+    :type count: int
+    :return: Parameters separated by comma
+    :rtype: str
+    """
+
+    return ", ".join(f"${number}::varchar[]" for number in range(1, count + 1))
+
+
+async def bulk_delete_houses(
+    conn: PoolConnectionProxy, *, houses_list: Sequence[Tuple]
+) -> int:
+    """
+    Delete house records found by names of their streets path and numbers,
+    and delete their streets which are left without houses together
+    with alternative names of them.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param houses_list: Country code, region, area, locality, district,
+        street and house number of every house
+    :type houses_list: Sequence[Tuple]
+    :return: Count of deleted houses
+    :rtype: int
+    """
+
+    if not houses_list:
+        return 0
+
+    records = await conn.fetch(
+        f"""
+        WITH input ({STREET_PATH_COLUMNS}, number) AS (
+            SELECT * FROM unnest({_varchar_arrays(7)})
+        )
+        DELETE FROM
+            house
+        USING input, street, {DISTRICT_PATH_JOIN}
+        WHERE
+            house.street_id = street.id
+            AND house.number = input.number
+            AND street.district_id = district.id
+            AND street.name = input.street
+            AND {DISTRICT_PATH_CONDITION}
+        RETURNING house.street_id
+        """,
+        *(list(values) for values in zip(*houses_list)),
+    )
+    await conn.execute(
+        """
+        WITH deleted AS (
+            DELETE FROM
+                street
+            WHERE
+                id = any($1::integer[])
+                AND NOT EXISTS (SELECT FROM house WHERE street_id = street.id)
+            RETURNING id
+        )
+        DELETE FROM
+            alternative_name
+        WHERE
+            type = 'street'
+            AND related_id IN (SELECT id FROM deleted)
+        """,
+        list({record["street_id"] for record in records}),
+    )
+
+    return len(records)
+
+
+async def bulk_update_house_indexes(
+    conn: PoolConnectionProxy, *, houses_list: Sequence[Tuple]
+) -> int:
+    """
+    Update indexes of house records found by names of their streets path
+    and numbers.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param houses_list: Country code, region, area, locality, district,
+        street, house number and new index of every house
+    :type houses_list: Sequence[Tuple]
+    :return: Count of updated houses
+    :rtype: int
+    """
+
+    if not houses_list:
+        return 0
+
+    status = await conn.execute(
+        f"""
+        WITH input ({STREET_PATH_COLUMNS}, number, index) AS (
+            SELECT * FROM unnest({_varchar_arrays(8)})
+        )
+        UPDATE
+            house
+        SET
+            index = input.index
+        FROM input, street, {DISTRICT_PATH_JOIN}
+        WHERE
+            house.street_id = street.id
+            AND house.number = input.number
+            AND street.district_id = district.id
+            AND street.name = input.street
+            AND {DISTRICT_PATH_CONDITION}
+        """,
+        *(list(values) for values in zip(*houses_list)),
+    )
+
+    return int(status.split()[-1])
+
+
+async def bulk_rename_streets(
+    conn: PoolConnectionProxy, *, renames: Sequence[Tuple]
+) -> int:
+    """
+    Rename street records found by names of their path. Previous names
+    are kept as alternative names of streets, so search finds them.
+    Street is merged into the street of district which has the new name
+    already: houses and alternative names are moved to it. Should be
+    called inside of transaction.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param renames: Country code, region, area, locality, district,
+        street and new name of every street
+    :type renames: Sequence[Tuple]
+    :return: Count of renamed and merged streets
+    :rtype: int
+    """
+
+    if not renames:
+        return 0
+
+    records = await conn.fetch(
+        f"""
+        WITH input ({STREET_PATH_COLUMNS}, new_name) AS (
+            SELECT * FROM unnest({_varchar_arrays(7)})
+        )
+        SELECT
+            street.id,
+            street.district_id,
+            street.name AS old_name,
+            input.new_name,
+            (
+                SELECT target.id FROM street AS target
+                WHERE
+                    target.district_id = street.district_id
+                    AND target.name = input.new_name
+            ) AS target_id
+        FROM input, street, {DISTRICT_PATH_JOIN}
+        WHERE
+            street.district_id = district.id
+            AND street.name = input.street
+            AND {DISTRICT_PATH_CONDITION}
+        ORDER BY street.id
+        """,
+        *(list(values) for values in zip(*renames)),
+    )
+    # Streets which have new names by district and name
+    targets: Dict[Tuple[int, str], int] = {}
+    renamed: List[Tuple[int, str]] = []
+    merged: List[Tuple[int, int]] = []
+    old_names: List[Tuple[int, str]] = []
+
+    for record in records:
+        key = (record["district_id"], record["new_name"])
+        target_id = record["target_id"] or targets.get(key)
+
+        if target_id is None:
+            target_id = targets[key] = record["id"]
+            renamed.append((record["id"], record["new_name"]))
+        else:
+            merged.append((record["id"], target_id))
+
+        old_names.append((target_id, record["old_name"]))
+
+    if merged:
+        await _merge_streets(conn, merged=merged)
+
+    if renamed:
+        await conn.execute(
+            """
+            UPDATE
+                street
+            SET
+                name = input.new_name
+            FROM unnest($1::integer[], $2::varchar[]) AS input (id, new_name)
+            WHERE street.id = input.id
+            """,
+            *(list(values) for values in zip(*renamed)),
+        )
+
+    await conn.execute(
+        """
+        INSERT INTO
+            alternative_name (type, related_id, name)
+        SELECT 'street', id, name
+        FROM unnest($1::integer[], $2::varchar[]) AS input (id, name)
+        ON CONFLICT DO NOTHING
+        """,
+        *(list(values) for values in zip(*old_names)),
+    )
+
+    return len(records)
+
+
+async def _merge_streets(
+    conn: PoolConnectionProxy, *, merged: Sequence[Tuple[int, int]]
+) -> None:
+    """
+    Move houses and alternative names of streets to target streets
+    and delete them. Houses which target street or earlier merged
+    street has already are deleted.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param merged: Id of merged street and id of target street
+    :type merged: Sequence[Tuple[int, int]]
+    """
+
+    merge = """
+        WITH merge (street_id, target_id) AS (
+            SELECT * FROM unnest($1::integer[], $2::integer[])
+        )
+    """
+    args = [list(values) for values in zip(*merged)]
+
+    await conn.execute(
+        f"""
+        {merge}
+        DELETE FROM
+            house
+        USING merge
+        WHERE
+            house.street_id = merge.street_id
+            AND EXISTS (
+                SELECT FROM house AS other
+                WHERE
+                    other.number = house.number
+                    AND (
+                        other.street_id = merge.target_id
+                        OR other.street_id IN (
+                            SELECT earlier.street_id FROM merge AS earlier
+                            WHERE
+                                earlier.target_id = merge.target_id
+                                AND earlier.street_id < merge.street_id
+                        )
+                    )
+            )
+        """,
+        *args,
+    )
+    await conn.execute(
+        f"""
+        {merge}
+        UPDATE house SET street_id = merge.target_id
+        FROM merge
+        WHERE house.street_id = merge.street_id
+        """,
+        *args,
+    )
+    await conn.execute(
+        f"""
+        {merge}
+        INSERT INTO
+            alternative_name (type, related_id, name)
+        SELECT 'street', merge.target_id, alternative_name.name
+        FROM alternative_name JOIN merge
+            ON alternative_name.related_id = merge.street_id
+        WHERE alternative_name.type = 'street'
+        ON CONFLICT DO NOTHING
+        """,
+        *args,
+    )
+    await conn.execute(
+        f"""
+        {merge}
+        DELETE FROM
+            alternative_name
+        USING merge
+        WHERE
+            alternative_name.type = 'street'
+            AND alternative_name.related_id = merge.street_id
+        """,
+        *args,
+    )
+    await conn.execute(
+        f"""
+        {merge}
+        DELETE FROM street USING merge WHERE street.id = merge.street_id
+        """,
+        *args,
+    )
+
+
+async def bulk_add_alternative_names(
+    conn: PoolConnectionProxy, *, address_type: str, names: Sequence[Tuple]
+) -> int:
+    """
+    Add alternative names, e.g. historical ones, to records found
+    by names of their path. Names which are already added or equal
+    to the name of record are skipped.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param address_type: Type of records: locality or street
+    :type address_type: str
+    :param names: Country code, names of path of record and alternative
+        name of every record
+    :type names: Sequence[Tuple]
+    :raise ValueError: Alternative names of type aren't supported
+    :return: Count of added alternative names
+    :rtype: int
+    """
+
+    if (path := ALTERNATIVE_NAME_PATHS.get(address_type)) is None:
+        raise ValueError(f"Alternative names of {address_type} aren't added")
+
+    if not names:
+        return 0
+
+    columns, join, condition = path
+    status = await conn.execute(
+        f"""
+        WITH input ({columns}, alternative_name) AS (
+            SELECT * FROM unnest({_varchar_arrays(len(names[0]))})
+        )
+        INSERT INTO
+            alternative_name (type, related_id, name)
+        SELECT
+            '{address_type}', {address_type}.id, input.alternative_name
+        FROM input, {join}
+        WHERE
+            {condition}
+            AND {address_type}.name <> input.alternative_name
+        ON CONFLICT DO NOTHING
+        """,
+        *(list(values) for values in zip(*names)),
+    )
+
+    return int(status.split()[-1])
+
+
+async def apply_delta(conn: PoolConnectionProxy, *, delta: Delta) -> dict:
+    """
+    Apply changes between snapshots: rename streets, delete houses,
+    update indexes and add houses.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param delta: Changes between snapshots
+    :type delta: Delta
+    :return: Counts of changed records by kind of change
+    :rtype: dict
+    """
+
+    counts = {
+        "renamed streets": await bulk_rename_streets(
+            conn, renames=[(*key, name) for key, name in delta.renames]
+        ),
+        "deleted houses": await bulk_delete_houses(
+            conn,
+            houses_list=[
+                values[: HOUSE_FIELD + 1] for values in delta.deletes
+            ],
+        ),
+        "updated indexes": await bulk_update_house_indexes(
+            conn,
+            houses_list=[
+                values[: INDEX_FIELD + 1] for values in delta.index_updates
+            ],
+        ),
+        "added houses": 0,
+    }
+
+    if delta.inserts:
+        records = await load_batch(conn, rows=delta.inserts)
+        counts["added houses"] = records["house"]["created"]
+
+    return counts
+
+
+async def get_snapshot_fingerprint(
+    conn: PoolConnectionProxy, *, source: str
+) -> Optional[str]:
+    """
+    Get fingerprint of the last loaded snapshot of source.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param source: Source class name
+    :type source: str
+    :return: Fingerprint or None if source wasn't loaded by snapshot
+    :rtype: Optional[str]
+    """
+
+    fingerprint = await conn.fetchval(
+        select([source_snapshots.c.fingerprint]).where(
+            source_snapshots.c.source == source
+        )
+    )
+
+    return fingerprint
+
+
+async def set_snapshot_fingerprint(
+    conn: PoolConnectionProxy,
+    *,
+    source: str,
+    fingerprint: str,
+    rows_count: int,
+) -> None:
+    """
+    Record fingerprint of the last loaded snapshot of source.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param source: Source class name
+    :type source: str
+    :param fingerprint: Fingerprint of snapshot
+    :type fingerprint: str
+    :param rows_count: Count of rows in snapshot
+    :type rows_count: int
+    """
+
+    await conn.execute(
+        """
+        INSERT INTO
+            source_snapshot (source, fingerprint, rows_count)
+        VALUES ($1, $2, $3)
+        ON CONFLICT (source) DO UPDATE SET
+            fingerprint = excluded.fingerprint,
+            rows_count = excluded.rows_count,
+            updated_at = now()
+        """,
+        source,
+        fingerprint,
+        rows_count,
+    )
+
+
+async def bump_data_version(conn: PoolConnectionProxy) -> int:
+    """
+    Increase version of uploaded data to notify API about changes.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :return: New data version
+    :rtype: int
+    """
+
+    version = await conn.fetchval(
+        """
+        UPDATE
+            data_version
+        SET
+            version = version + 1, updated_at = now()
+        RETURNING version
+        """
+    )
+
+    return version
+
+
+async def refresh_address_flat(conn: PoolConnectionProxy) -> None:
+    """
+    Refresh flattened full addresses without locking them for readers.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    """
+
+    await conn.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY address_flat")
+
+
+async def refresh_postcode_street(conn: PoolConnectionProxy) -> None:
+    """
+    Refresh mapping of postcodes to localities and streets without locking
+    it for readers.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    """
+
+    await conn.execute(
+        "REFRESH MATERIALIZED VIEW CONCURRENTLY postcode_street"
+    )
@@ -1,19 +1,145 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+
 from aiohttp import web
 from aiohttp_swagger import setup_swagger
 
-from config import Config
+from config import UPLOADS_DIR, Config
 from db import init_db
-from views import country, region, area, locality, district, street, house
+from logic.autocomplete import AutocompleteIndex
+from logic.data_version import DataVersion, watch_data_version
+from utils.http_cache import conditional_get_middleware
+from utils.metrics import (
+    Metrics,
+    clear_metrics,
+    export_metrics,
+    metrics_middleware,
+    write_metrics,
+)
+from utils.response_cache import ResponseCache
+from views import (
+    country,
+    region,
+    area,
+    locality,
+    district,
+    street,
+    house,
+    autocomplete,
+    stats,
+    metrics,
+    postcode,
+)
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+METRICS_DIR = os.path.join(UPLOADS_DIR, "metrics")
+
+
+def setup_event_loop(*, config: dict) -> None:
+    """
+    Use uvloop event loop if it is installed and enabled.
+
+    :param config: Configuration for application
+    :type config: dict
+    """
+
+    if uvloop is not None and config["use_uvloop"]:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+def run_worker(*, host: str, port: int, reuse_port: bool = False) -> None:
+    """
+    Run application in current process until it is stopped by signal.
+
+    :param host: Host to listen
+    :type host: str
+    :param port: Port to listen
+    :type port: int
+    :param reuse_port: Share port with other workers
+    :type reuse_port: bool
+    """
+
+    setup_event_loop(config=Config.load_config())
+
+    web.run_app(
+        get_async_application(), host=host, port=port, reuse_port=reuse_port
+    )
+
+
+def run_workers(*, workers: int, host: str, port: int) -> None:
+    """
+    Pre-fork workers which share port by SO_REUSEPORT, so kernel
+    distributes connections between them. SIGTERM and SIGINT are passed
+    to workers for graceful shutdown.
+
+    :param workers: Count of worker processes
+    :type workers: int
+    :param host: Host to listen
+    :type host: str
+    :param port: Port to listen
+    :type port: int
+    """
+
+    # Pool of every worker is sized by count of workers
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    # Every worker answers with merged metrics of all of them
+    os.environ.setdefault("METRICS_DIR", METRICS_DIR)
+    clear_metrics(os.environ["METRICS_DIR"])
+
+    processes = [
+        multiprocessing.Process(
+            target=run_worker,
+            kwargs={"host": host, "port": port, "reuse_port": True},
+            name=f"worker-{number}",
+        )
+        for number in range(workers)
+    ]
+
+    def stop(signum: int, frame) -> None:
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signum)
+
+    for process in processes:
+        process.start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for process in processes:
+        process.join()
 
 
 def main() -> None:
     """Application entrypoint."""
 
-    config = Config.load_config()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", help="Host to listen", default="0.0.0.0")
+    parser.add_argument(
+        "--port", help="Port to listen", type=int, default=8080
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        help="Count of worker processes sharing the port",
+        type=int,
+        default=1,
+    )
 
-    app = init_app(config=config)
+    args = parser.parse_args()
 
-    web.run_app(app)
+    if args.workers > 1:
+        run_workers(workers=args.workers, host=args.host, port=args.port)
+    else:
+        run_worker(host=args.host, port=args.port)
 
 
 async def get_async_application() -> web.Application:
@@ -107,6 +233,100 @@ def setup_routes(*, app: web.Application) -> None:
         house.all_houses_in_street,
         allow_head=False,
     )
+    router.add_post("/houses/full", house.full_addresses_by_houses)
+
+    router.add_get(
+        "/autocomplete/street",
+        autocomplete.autocomplete_street,
+        allow_head=False,
+    )
+    router.add_get(
+        "/autocomplete/locality",
+        autocomplete.autocomplete_locality,
+        allow_head=False,
+    )
+
+    router.add_get(
+        "/index/{code:\\d{1,8}}", postcode.postcode_streets, allow_head=False
+    )
+    router.add_get(
+        "/index/{code:\\d{1,8}}/localities",
+        postcode.localities_by_postcode,
+        allow_head=False,
+    )
+    router.add_get(
+        "/index/{code:\\d{1,8}}/streets",
+        postcode.streets_by_postcode,
+        allow_head=False,
+    )
+    router.add_get(
+        "/index/{code:\\d{1,8}}/houses",
+        postcode.houses_by_postcode,
+        allow_head=False,
+    )
+    router.add_get("/stats", stats.get_stats, allow_head=False)
+    router.add_get("/metrics", metrics.get_metrics, allow_head=False)
+
+
+async def start_background_tasks(app: web.Application) -> None:
+    """
+    Load data version with dependent in-memory indexes
+    and start watching for its changes.
+
+    :param app: Current application
+    :type app: web.Application
+    """
+
+    async with app["db"].acquire() as conn:
+        await app["data_version"].refresh(conn)
+
+    app["data_version_watcher"] = asyncio.ensure_future(
+        watch_data_version(
+            app, interval=app["config"]["data_version_poll_interval"]
+        )
+    )
+
+    if app["config"]["metrics_dir"]:
+        app["metrics_exporter"] = asyncio.ensure_future(
+            export_metrics(
+                app, interval=app["config"]["metrics_export_interval"]
+            )
+        )
+
+
+async def cleanup_background_tasks(app: web.Application) -> None:
+    """
+    Stop background tasks of application.
+
+    :param app: Current application
+    :type app: web.Application
+    """
+
+    for task_name in ("data_version_watcher", "metrics_exporter"):
+        if (task := app.get(task_name)) is None:
+            continue
+
+        task.cancel()
+
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    # The last metrics of stopped worker are kept in merged ones
+    if metrics_dir := app["config"]["metrics_dir"]:
+        write_metrics(metrics_dir, app["metrics"], pool_stats={})
+
+
+async def close_db(app: web.Application) -> None:
+    """
+    Close pool of db connections waiting for acquired connections.
+
+    :param app: Current application
+    :type app: web.Application
+    """
+
+    await app["db"].close()
 
 
 async def init_app(*, config: dict) -> web.Application:
@@ -119,7 +339,9 @@ async def init_app(*, config: dict) -> web.Application:
     :rtype: web.Application
     """
 
-    app = web.Application()
+    app = web.Application(
+        middlewares=[metrics_middleware, conditional_get_middleware]
+    )
 
     setup_routes(app=app)
 
@@ -285,6 +507,48 @@ async def init_app(*, config: dict) -> web.Application:
                     },
                 },
             },
+            "PostcodeStreet": {
+                "type": "object",
+                "properties": {
+                    "id": {
+                        "type": "integer",
+                        "description": "Id of the first house of street "
+                        + "with postcode",
+                        "required": True,
+                    },
+                    "index": {
+                        "type": "string",
+                        "description": "Postcode",
+                        "required": True,
+                    },
+                    "locality_id": {
+                        "type": "integer",
+                        "description": "Locality id",
+                        "required": True,
+                    },
+                    "locality": {
+                        "type": "string",
+                        "description": "Locality name",
+                        "required": True,
+                    },
+                    "street_id": {
+                        "type": "integer",
+                        "description": "Street id",
+                        "required": True,
+                    },
+                    "street": {
+                        "type": "string",
+                        "description": "Street name",
+                        "required": True,
+                    },
+                    "houses": {
+                        "type": "integer",
+                        "description": "Count of houses of street "
+                        + "with postcode",
+                        "required": True,
+                    },
+                },
+            },
             "FullAddress": {
                 "type": "object",
                 "properties": {
@@ -335,6 +599,20 @@ async def init_app(*, config: dict) -> web.Application:
 
     app["config"] = config
     app["db"] = await init_db(config=config)
+    app["data_version"] = DataVersion()
+    app["autocomplete"] = AutocompleteIndex()
+    app["metrics"] = Metrics()
+    app["response_cache"] = ResponseCache(
+        max_size=config["response_cache_size"],
+        max_bytes=config["response_cache_max_bytes"],
+        ttl=config["response_cache_ttl"],
+    )
+    app["data_version"].add_listener(app["autocomplete"].rebuild)
+    app["data_version"].add_listener(app["response_cache"].invalidate)
+
+    app.on_startup.append(start_background_tasks)
+    app.on_cleanup.append(cleanup_background_tasks)
+    app.on_cleanup.append(close_db)
 
     return app
 
@@ -0,0 +1,217 @@
+import argparse
+import asyncio
+import datetime
+from os import makedirs, path, remove, replace
+import sqlite3
+import time
+from typing import Any, Dict, Iterator
+
+from asyncpg.pool import PoolConnectionProxy
+from sqlalchemy import Table
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from config import UPLOADS_DIR, Config
+from db import init_db
+from db.schema import metadata, postcode_streets, source_snapshots
+from logic.queries import SNAPSHOT_DIALECT
+
+
+SNAPSHOT_PATH = path.join(UPLOADS_DIR, "snapshot.db")
+BATCH_SIZE = 10000
+# Upload bookkeeping isn't needed to answer requests
+SKIPPED_TABLES = (source_snapshots,)
+# Columns of materialized views indexed by migrations
+VIEW_INDEXES = ((postcode_streets, "index"),)
+
+
+def snapshot_value(value: Any) -> Any:
+    """
+    Convert value of database record to value stored by sqlite.
+
+    :param value: Value of record
+    :type value: Any
+    :return: Value for sqlite
+    :rtype: Any
+    """
+
+    if isinstance(value, datetime.datetime):
+        return str(value)
+
+    return value
+
+
+def snapshot_indexes(table: Table) -> Iterator[str]:
+    """
+    Generator of ddl of indexes of table which are created in snapshot,
+    trigram indexes aren't supported by sqlite.
+
+    :param table: Table or materialized view
+    :type table: Table
+    :return: Ddl of index
+    :rtype: Iterator[str]
+    """
+
+    for index in table.indexes:
+        if not index.dialect_options["postgresql"]["using"]:
+            yield str(CreateIndex(index).compile(dialect=SNAPSHOT_DIALECT))
+
+    for view, column in VIEW_INDEXES:
+        if view is table:
+            yield 'CREATE INDEX ix__{0}__{1} ON {0} ("{1}")'.format(
+                view.name, column
+            )
+
+
+async def copy_table(
+    conn: PoolConnectionProxy,
+    snapshot: sqlite3.Connection,
+    *,
+    table: Table,
+    batch_size: int,
+) -> int:
+    """
+    Create table in snapshot and copy records of it from database.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param snapshot: Connection to snapshot
+    :type snapshot: sqlite3.Connection
+    :param table: Table or materialized view
+    :type table: Table
+    :param batch_size: Count of records inserted at once
+    :type batch_size: int
+    :return: Count of copied records
+    :rtype: int
+    """
+
+    snapshot.execute(str(CreateTable(table).compile(dialect=SNAPSHOT_DIALECT)))
+    columns = ", ".join(f'"{column.name}"' for column in table.columns)
+    insert = "INSERT INTO {} ({}) VALUES ({})".format(
+        table.name, columns, ", ".join("?" * len(table.columns))
+    )
+    count = 0
+    batch = []
+
+    async for record in conn.cursor(
+        f"SELECT {columns} FROM {table.name}", prefetch=batch_size
+    ):
+        batch.append(tuple(map(snapshot_value, record)))
+
+        if len(batch) >= batch_size:
+            snapshot.executemany(insert, batch)
+            count += len(batch)
+            batch.clear()
+
+    snapshot.executemany(insert, batch)
+    count += len(batch)
+
+    for ddl in snapshot_indexes(table):
+        snapshot.execute(ddl)
+
+    return count
+
+
+async def export_snapshot(
+    conn: PoolConnectionProxy, filename: str, *, batch_size: int = BATCH_SIZE
+) -> Dict[str, int]:
+    """
+    Copy tables and materialized views of database to sqlite snapshot
+    in one repeatable read transaction. Snapshot is written to temporary
+    file which replaces old snapshot at the end.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param filename: Path of snapshot file
+    :type filename: str
+    :param batch_size: Count of records inserted at once
+    :type batch_size: int
+    :return: Count of records by table
+    :rtype: Dict[str, int]
+    """
+
+    makedirs(path.dirname(path.abspath(filename)), exist_ok=True)
+    temporary = f"{filename}.tmp"
+
+    if path.exists(temporary):
+        remove(temporary)
+
+    counts = {}
+    snapshot = sqlite3.connect(temporary)
+
+    try:
+        snapshot.execute("PRAGMA journal_mode = OFF")
+        snapshot.execute("PRAGMA synchronous = OFF")
+
+        async with conn.transaction(
+            isolation="repeatable_read", readonly=True
+        ):
+            for table in metadata.sorted_tables:
+                if table not in SKIPPED_TABLES:
+                    counts[table.name] = await copy_table(
+                        conn, snapshot, table=table, batch_size=batch_size
+                    )
+
+        snapshot.commit()
+        snapshot.execute("ANALYZE")
+        snapshot.execute("VACUUM")
+    except BaseException:
+        snapshot.close()
+        remove(temporary)
+        raise
+
+    snapshot.close()
+    replace(temporary, filename)
+
+    return counts
+
+
+async def main(filename: str, *, batch_size: int = BATCH_SIZE) -> None:
+    """
+    Export database to read-only snapshot served with
+    DB_URL=sqlite:///<filename>.
+
+    :param filename: Path of snapshot file
+    :type filename: str
+    :param batch_size: Count of records inserted at once
+    :type batch_size: int
+    """
+
+    config = Config.load_config()
+    db_pool = await init_db(config=config)
+    started = time.perf_counter()
+
+    async with db_pool.acquire() as conn:
+        counts = await export_snapshot(conn, filename, batch_size=batch_size)
+
+    await db_pool.close()
+
+    for table_name, count in counts.items():
+        print(f"{table_name:20} {count:10}")
+
+    print(
+        f"Snapshot {filename} is exported "
+        f"in {time.perf_counter() - started:.1f} s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export database of DB_URL to read-only sqlite snapshot"
+    )
+    parser.add_argument(
+        "filename",
+        help="Path of snapshot file",
+        nargs="?",
+        default=SNAPSHOT_PATH,
+    )
+    parser.add_argument(
+        "--batch-size",
+        help="Count of records inserted at once",
+        type=int,
+        default=BATCH_SIZE,
+    )
+
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(
+        main(args.filename, batch_size=args.batch_size)
+    )
@@ -1,9 +1,123 @@
 from abc import ABC, abstractmethod
+from itertools import islice
+from os import path
+from typing import Iterator, List, Optional
+
+from config import UPLOADS_DIR
+from logic.delta import NormalizedRow, normalize_row
+from utils.download_cache import Download, DownloadCache
 
 
 class BaseSource(ABC):
     """Base source class."""
 
+    _url: str = ""
+
+    def __init__(
+        self,
+        *,
+        streaming: bool = False,
+        url: Optional[str] = None,
+        download_cache: Optional[DownloadCache] = None,
+    ):
+        self.streaming = streaming
+
+        if url is not None:
+            self._url = url
+
+        self._download_cache = download_cache or DownloadCache(
+            path.join(UPLOADS_DIR, "cache")
+        )
+        self._download: Optional[Download] = None
+
     @abstractmethod
     def get_address_rows(self) -> dict:
         """Generator of address rows."""
+
+    def get_raw_rows(self) -> Iterator:
+        """
+        Generator of raw rows which are parsed by parse_batch.
+        Raw rows are address rows by default.
+
+        :return: Raw row
+        :rtype: Iterator
+        """
+
+        return self.get_address_rows()
+
+    def get_raw_batches(self, *, batch_size: int) -> Iterator[list]:
+        """
+        Generator of batches of raw rows to parse them in other processes.
+
+        :param batch_size: Count of raw rows in batch
+        :type batch_size: int
+        :return: Batch of raw rows
+        :rtype: Iterator[list]
+        """
+
+        raw_rows = iter(self.get_raw_rows())
+
+        while batch := list(islice(raw_rows, batch_size)):
+            yield batch
+
+    def count_rows(self) -> Optional[int]:
+        """
+        Count address rows of source file before upload to report ETA.
+        Rows aren't counted by default.
+
+        :return: Count of address rows or None if it isn't known
+        :rtype: Optional[int]
+        """
+
+        return None
+
+    @classmethod
+    def parse_batch(cls, raw_rows: list) -> List[NormalizedRow]:
+        """
+        Parse batch of raw rows to normalized address rows.
+        It is called in other process, so it can't use source instance.
+
+        :param raw_rows: Raw rows
+        :type raw_rows: list
+        :return: Normalized address rows
+        :rtype: List[NormalizedRow]
+        """
+
+        return [normalize_row(row) for row in raw_rows]
+
+    def is_loaded(self) -> bool:
+        """
+        Check if source file is the same as the last loaded one.
+        Source file is downloaded unless it is streamed, streamed file
+        can be checked only if it isn't modified since the last download.
+
+        :return: Is source file loaded already
+        :rtype: bool
+        """
+
+        download = self._get_download()
+
+        if not self.streaming:
+            download.read_all()
+
+        return self._download_cache.is_loaded(download)
+
+    def mark_loaded(self) -> None:
+        """Remember downloaded source file as the last loaded one."""
+
+        if self._download is not None and self._download.complete:
+            self._download_cache.mark_loaded(self._download)
+
+    def _get_download(self) -> Download:
+        """
+        Get download of source file, open it by conditional or resuming
+        request at first call.
+
+        :return: Download of source file
+        :rtype: Download
+        """
+
+        if self._download is None:
+            self._download = self._download_cache.open(self._url)
+
+        return self._download
@@ -1,10 +1,10 @@
 import csv
-from io import BytesIO
 from os import path
-from urllib.request import urlopen
+from typing import Iterable, List, Optional
 from zipfile import ZipFile
 
 from config import UPLOADS_DIR
+from logic.delta import NormalizedRow
 from logic.entities import (
     Area,
     Country,
@@ -15,6 +15,7 @@ from logic.entities import (
     Street,
 )
 from source.base_source import BaseSource
+from utils.zip_stream import PushbackReader, iter_lines, iter_zip_member
 
 
 class Ukrposhta(BaseSource):
@@ -22,7 +23,12 @@ class Ukrposhta(BaseSource):
 
     _url: str = "http://services.ukrposhta.com/postindex_new/upload/houses.zip"
     _filename: str = UPLOADS_DIR + path.sep + "houses.csv"
+    _member_name: str = "houses.csv"
+    _encoding: str = "cp1251"
     _country: Country = Country(name="Україна", code="UA")
+    # Source has no districts, all streets of locality are in this one
+    _district_name: str = "-"
+    _extracted: bool = False
 
     def get_address_rows(self) -> dict:
         """
@@ -33,50 +39,169 @@ class Ukrposhta(BaseSource):
         :rtype: dict
         """
 
+        for csv_row in self.get_raw_rows():
+            for row in self._split_row(csv_row=csv_row):
+                yield self._format_row(row=row)
+
+    def get_raw_rows(self) -> List[str]:
+        """
+        Generator of csv rows of source file.
+        In streaming mode rows are read while archive is downloaded.
+
+        :raises: ValueError - problem with file downloading
+        :return: Csv row
+        :rtype: List[str]
+        """
+
+        if self.streaming:
+            yield from self._stream_rows()
+        elif self._download_file():
+            yield from self._get_rows()
+        else:
+            raise ValueError("Problem with file downloading")
+
+    def count_rows(self) -> Optional[int]:
+        """
+        Count houses of csv rows of extracted source file without parsing
+        them to address rows. Streamed file can't be read twice, so its
+        rows aren't counted.
+
+        :raises: ValueError - problem with file downloading
+        :return: Count of address rows or None if file is streamed
+        :rtype: Optional[int]
+        """
+
+        if self.streaming:
+            return None
+
         if not self._download_file():
             raise ValueError("Problem with file downloading")
 
-        for row in self._get_rows():
-            yield self._format_row(row=row)
+        return sum(csv_row[5].count(",") + 1 for csv_row in self._get_rows())
+
+    @classmethod
+    def parse_batch(cls, raw_rows: List[List[str]]) -> List[NormalizedRow]:
+        """
+        Parse batch of csv rows to normalized address rows. Rows are made
+        straight from csv rows, fields of which are trimmed once for all
+        their houses, without entities of formatted rows.
+
+        :param raw_rows: Csv rows
+        :type raw_rows: List[List[str]]
+        :return: Normalized address rows
+        :rtype: List[NormalizedRow]
+        """
+
+        country = cls._country
+        rows = []
+
+        for csv_row in raw_rows:
+            region, area, locality, index, street, houses = map(
+                str.strip, csv_row[:6]
+            )
+            head = (
+                country.code,
+                region,
+                area,
+                locality,
+                cls._district_name,
+                street,
+            )
+            tail = (index, country.name)
+
+            for house in houses.split(","):
+                rows.append((*head, house.strip(), *tail))
+
+        return rows
 
     def _download_file(self) -> bool:
         """
-        Download source file.
+        Download source file, it is extracted once for rows count
+        and rows.
 
         :return: Is it successfully downloaded
         :rtype: bool
         """
 
-        with urlopen(self._url) as downloaded_file:
-            with ZipFile(BytesIO(downloaded_file.read())) as zip_file:
-                zip_file.extractall(UPLOADS_DIR)
+        if not self._extracted:
+            with self._get_download() as download:
+                with ZipFile(download.read_all()) as zip_file:
+                    zip_file.extractall(UPLOADS_DIR)
+
+            self._extracted = True
 
         return path.isfile(self._filename)
 
-    def _get_rows(self) -> dict:
+    def _get_rows(self) -> List[str]:
+        """
+        Generator of csv rows of extracted source file.
+
+        :return: Csv row
+        :rtype: List[str]
+        """
+
+        with open(self._filename, encoding=self._encoding) as csv_file:
+            yield from self._read_csv(lines=csv_file)
+
+    def _stream_rows(self) -> List[str]:
+        """
+        Generator of csv rows decoded straight from archive member
+        while archive is downloaded to download cache by chunks.
+
+        :raises: ValueError - archive member can't be read
+        :return: Csv row
+        :rtype: List[str]
+        """
+
+        with self._get_download() as download:
+            reader = PushbackReader(download)
+            chunks = iter_zip_member(reader, name=self._member_name)
+            lines = iter_lines(chunks, encoding=self._encoding)
+
+            yield from self._read_csv(lines=lines)
+
+            # Read the rest of archive to put it to download cache
+            download.read_all()
+
+    @staticmethod
+    def _read_csv(*, lines: Iterable[str]) -> List[str]:
+        """
+        Generator of csv rows from lines of csv file without header.
+
+        :param lines: Lines of csv file
+        :type lines: Iterable[str]
+        :return: Csv row
+        :rtype: List[str]
         """
-        Generator of raw source rows.
 
+        csv_lines = csv.reader(lines, delimiter=";")
+        next(csv_lines)  # Just skip first (header) line
+        yield from csv_lines
+
+    @staticmethod
+    def _split_row(*, csv_row: List[str]) -> dict:
+        """
+        Generator of raw source rows of every house of csv row.
+
+        :param csv_row: Csv row
+        :type csv_row: List[str]
         :return: Dict of raw source row
         :rtype: dict
         """
 
-        with open(self._filename, encoding="cp1251") as csv_file:
-            csv_lines = csv.reader(csv_file, delimiter=";")
-            next(csv_lines)  # Just skip first (header) line
-            for row in csv_lines:
-                houses = row[5].split(",")
-                for house in houses:
-                    yield {
-                        "region": row[0],
-                        "area": row[1],
-                        "locality": row[2],
-                        "street": row[4],
-                        "index": row[3],
-                        "house": house,
-                    }
-
-    def _format_row(self, *, row: dict) -> dict:
+        houses = csv_row[5].split(",")
+        for house in houses:
+            yield {
+                "region": csv_row[0],
+                "area": csv_row[1],
+                "locality": csv_row[2],
+                "street": csv_row[4],
+                "index": csv_row[3],
+                "house": house,
+            }
+
+    @classmethod
+    def _format_row(cls, *, row: dict) -> dict:
         """
         Format raw row to formatted.
 
@@ -87,11 +212,11 @@ class Ukrposhta(BaseSource):
         """
 
         return {
-            "Country": self._country,
+            "Country": cls._country,
             "Region": Region(name=row.get("region")),
             "Area": Area(name=row.get("area")),
             "Locality": Locality(name=row.get("locality")),
-            "District": District(name="-"),
+            "District": District(name=cls._district_name),
             "Street": Street(name=row.get("street")),
             "House": House(number=row.get("house"), index=row.get("index")),
         }
@@ -0,0 +1,161 @@
+from logic.delta import Snapshot, diff_rows, iter_deltas
+from logic.entities import (
+    Area,
+    Country,
+    District,
+    House,
+    Locality,
+    Region,
+    Street,
+)
+
+
+DISTRICT = ("UA", "Київська", "Бучанський", "Буча", "-")
+
+
+def make_row(street: str, house: str, index: str) -> tuple:
+    return DISTRICT + (street, house, index, "Україна")
+
+
+def make_formatted_row(values: tuple) -> dict:
+    (
+        code,
+        region,
+        area,
+        locality,
+        district,
+        street,
+        number,
+        index,
+        name,
+    ) = values
+
+    return {
+        "Country": Country(name=name, code=code),
+        "Region": Region(name=region),
+        "Area": Area(name=area),
+        "Locality": Locality(name=locality),
+        "District": District(name=district),
+        "Street": Street(name=street),
+        "House": House(number=number, index=index),
+    }
+
+
+def test_diff_rows_renamed_street():
+    old_rows = [
+        make_row("вул. Леніна", "1", "08292"),
+        make_row("вул. Леніна", "2", "08292"),
+    ]
+    new_rows = [
+        make_row("вул. Вокзальна", "1", "08292"),
+        make_row("вул. Вокзальна", "2", "08292"),
+    ]
+
+    delta = diff_rows(old_rows, new_rows)
+
+    assert delta.renames == [(DISTRICT + ("вул. Леніна",), "вул. Вокзальна")]
+    assert not delta.inserts
+    assert not delta.deletes
+    assert not delta.index_updates
+
+
+def test_diff_rows_street_with_other_houses_is_not_renamed():
+    old_rows = [make_row("вул. Леніна", "1", "08292")]
+    new_rows = [
+        make_row("вул. Вокзальна", "1", "08292"),
+        make_row("вул. Вокзальна", "3", "08292"),
+    ]
+
+    delta = diff_rows(old_rows, new_rows)
+
+    assert not delta.renames
+    assert sorted(delta.inserts) == sorted(new_rows)
+    assert delta.deletes == old_rows
+
+
+def test_diff_rows_houses():
+    old_rows = [
+        make_row("вул. Тарасівська", "1", "08292"),
+        make_row("вул. Тарасівська", "2", "08292"),
+    ]
+    new_rows = [
+        make_row("вул. Тарасівська", "1", "08293"),
+        make_row("вул. Тарасівська", "3", "08292"),
+    ]
+
+    delta = diff_rows(old_rows, new_rows)
+
+    assert delta.inserts == [new_rows[1]]
+    assert delta.deletes == [old_rows[1]]
+    assert delta.index_updates == [new_rows[0]]
+    assert not delta.renames
+
+
+def test_snapshot_round_trip(tmp_path):
+    rows = [
+        make_row("вул. Тарасівська", "1", "08292"),
+        make_row("вул.\tНова", '2 "А"', "08292"),
+        ("UA", "Львівська", "Львівський", "Львів", "-", "вул. Городоцька")
+        + ("10", "79000", "Україна"),
+    ]
+
+    snapshot = Snapshot.write(
+        str(tmp_path / "snapshot"), map(make_formatted_row, rows), partitions=4
+    )
+    opened = Snapshot.open(str(tmp_path / "snapshot"))
+
+    assert opened.fingerprint == snapshot.fingerprint
+    assert opened.partitions == 4
+    assert opened.rows_count == len(rows)
+    assert sorted(opened.iter_rows()) == sorted(rows)
+
+    # Rows of district are read from the only partition
+    partitions = {}
+
+    for number in range(opened.partitions):
+        for row in opened.read_partition(number):
+            partitions.setdefault(row[:5], set()).add(number)
+
+    assert all(len(numbers) == 1 for numbers in partitions.values())
+
+
+def test_snapshot_fingerprint_ignores_order(tmp_path):
+    rows = [
+        make_row("вул. Тарасівська", str(number), "08292")
+        for number in range(10)
+    ]
+
+    first = Snapshot.write(
+        str(tmp_path / "first"), map(make_formatted_row, rows), partitions=4
+    )
+    second = Snapshot.write(
+        str(tmp_path / "second"),
+        map(make_formatted_row, reversed(rows)),
+        partitions=4,
+    )
+    changed = Snapshot.write(
+        str(tmp_path / "changed"),
+        map(make_formatted_row, rows[1:]),
+        partitions=4,
+    )
+
+    assert first.fingerprint == second.fingerprint
+    assert first.fingerprint != changed.fingerprint
+    assert not any(len(delta) for delta in iter_deltas(first, second))
+
+
+def test_snapshot_replace(tmp_path):
+    rows = [make_row("вул. Тарасівська", "1", "08292")]
+    snapshot = Snapshot.write(
+        str(tmp_path / "new"), map(make_formatted_row, rows), partitions=2
+    )
+
+    replaced = snapshot.replace(str(tmp_path / "last"))
+
+    assert Snapshot.open(str(tmp_path / "new")) is None
+    assert replaced.fingerprint == snapshot.fingerprint
+    assert list(replaced.iter_rows()) == rows
+
+
+def test_snapshot_open_incomplete(tmp_path):
+    assert Snapshot.open(str(tmp_path)) is None
@@ -0,0 +1,164 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import re
+import threading
+
+import pytest
+
+from utils.download_cache import CHUNK_SIZE, DownloadCache
+
+
+CONTENT = bytes(range(256)) * 1024
+
+
+class FileHandler(BaseHTTPRequestHandler):
+    """Handler of file with conditional and range requests."""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        validators = {value for value in server.validators.values() if value}
+        range_header = self.headers.get("Range")
+
+        if self.headers.get("If-None-Match") in validators:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        if range_header and self.headers.get("If-Range") in validators:
+            start = int(re.fullmatch(r"bytes=(\d+)-", range_header).group(1))
+
+            if start >= len(server.content):
+                self.send_response(416)
+                self.send_header("Content-Range", f"*/{len(server.content)}")
+                self.end_headers()
+                return
+
+            self.send_response(206)
+            self.send_header(
+                "Content-Range",
+                f"bytes {start}-{len(server.content) - 1}/"
+                f"{len(server.content)}",
+            )
+            body = server.content[start:]
+        else:
+            self.send_response(200)
+            body = server.content
+
+        for header, value in server.validators.items():
+            if value:
+                self.send_header(header, value)
+
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FileHandler)
+    server.content = CONTENT
+    server.validators = {"ETag": '"v1"', "Last-Modified": None}
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def url(server):
+    return f"http://127.0.0.1:{server.server_port}/houses.zip"
+
+
+def read_file(file_path):
+    with open(file_path, "rb") as file:
+        return file.read()
+
+
+def interrupt_download(cache, url):
+    with cache.open(url) as download:
+        download.read(CHUNK_SIZE)
+
+
+def test_download(server, url, tmp_path):
+    cache = DownloadCache(str(tmp_path))
+
+    with cache.open(url) as download:
+        file_path = download.read_all()
+
+    assert download.complete
+    assert read_file(file_path) == CONTENT
+    assert cache.load_meta(url)["etag"] == '"v1"'
+    assert cache.load_meta(url)["size"] == len(CONTENT)
+
+
+def test_not_modified(server, url, tmp_path):
+    cache = DownloadCache(str(tmp_path))
+
+    with cache.open(url) as download:
+        file_path = download.read_all()
+
+    with cache.open(url) as download:
+        assert download.not_modified
+        assert download.read_all() == file_path
+
+    assert server.requests[-1]["If-None-Match"] == '"v1"'
+    assert read_file(file_path) == CONTENT
+
+
+def test_resume(server, url, tmp_path):
+    cache = DownloadCache(str(tmp_path))
+    interrupt_download(cache, url)
+
+    with cache.open(url) as download:
+        file_path = download.read_all()
+
+    assert server.requests[-1]["Range"] == f"bytes={CHUNK_SIZE}-"
+    assert server.requests[-1]["If-Range"] == '"v1"'
+    assert read_file(file_path) == CONTENT
+    assert download.sha256 == cache.load_meta(url)["sha256"]
+
+
+def test_resume_changed_file(server, url, tmp_path):
+    cache = DownloadCache(str(tmp_path))
+    interrupt_download(cache, url)
+    server.content = CONTENT[::-1]
+    server.validators["ETag"] = '"v2"'
+
+    with cache.open(url) as download:
+        file_path = download.read_all()
+
+    assert read_file(file_path) == server.content
+
+
+def test_range_not_satisfiable(server, url, tmp_path):
+    cache = DownloadCache(str(tmp_path))
+    interrupt_download(cache, url)
+    server.content = CONTENT[: CHUNK_SIZE // 2]
+
+    with cache.open(url) as download:
+        file_path = download.read_all()
+
+    assert [request.get("Range") for request in server.requests[1:]] == [
+        f"bytes={CHUNK_SIZE}-",
+        None,
+    ]
+    assert read_file(file_path) == server.content
+
+
+def test_restart_without_validators(server, url, tmp_path):
+    cache = DownloadCache(str(tmp_path))
+    server.validators["ETag"] = None
+    interrupt_download(cache, url)
+
+    with cache.open(url) as download:
+        file_path = download.read_all()
+
+    assert "Range" not in server.requests[-1]
+    assert read_file(file_path) == CONTENT
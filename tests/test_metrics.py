@@ -0,0 +1,59 @@
+import os
+
+from utils.metrics import Metrics, clear_metrics, read_metrics, write_metrics
+
+
+def observe(metrics, *, status=200, seconds=0.01):
+    metrics.observe(
+        route="/countries",
+        method="GET",
+        status=status,
+        seconds=seconds,
+        size=100,
+        db_seconds=seconds / 2,
+    )
+
+
+def test_merge():
+    metrics = Metrics()
+    other = Metrics()
+    observe(metrics)
+    observe(other)
+    observe(other, status=404, seconds=1.0)
+
+    metrics.merge(other.state())
+
+    assert metrics.requests == {
+        ("/countries", "GET", "200"): 2,
+        ("/countries", "GET", "404"): 1,
+    }
+    histogram = metrics.latency[("/countries", "GET")]
+    assert histogram.count == 3
+    assert histogram.sum == 1.02
+    assert sum(histogram.counts) == 3
+
+
+def test_read_metrics_of_workers(tmp_path):
+    directory = str(tmp_path)
+    clear_metrics(directory)
+    other = Metrics()
+    observe(other)
+    write_metrics(directory, other, pool_stats={"size": 2, "acquire_max": 3})
+    os.replace(
+        tmp_path / f"worker-{os.getpid()}.json", tmp_path / "worker-1.json"
+    )
+    metrics = Metrics()
+    observe(metrics)
+    # Written metrics of current worker are replaced by live ones
+    write_metrics(directory, Metrics(), pool_stats={"size": 5})
+
+    merged, pool_stats = read_metrics(
+        directory, metrics, pool_stats={"size": 1, "acquire_max": 1}
+    )
+
+    assert merged.requests == {("/countries", "GET", "200"): 2}
+    assert pool_stats == {"size": 3, "acquire_max": 3}
+
+    clear_metrics(directory)
+
+    assert not os.listdir(directory)
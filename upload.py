@@ -1,33 +1,71 @@
 import argparse
 import asyncio
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from typing import Iterable, Iterator, List, Optional
+import zlib
 
-from asyncpg.pool import PoolConnectionProxy
+from asyncpg.pool import Pool, PoolConnectionProxy
 
 from config import Config
 from db import init_db
 from logic import upload as upload_module
 from logic.entities import AddressEntity
+from logic.delta import (
+    NormalizedRow,
+    Snapshot,
+    iter_deltas,
+    snapshot_directory,
+)
+from logic.id_cache import CACHE_MAX_SIZE, IdCache
 from source.base_source import BaseSource
 from source.ukrposhta import Ukrposhta
+from utils.progress import PROGRESS_INTERVAL, Progress
 
 
 SOURCES = {
     "Ukrposhta": Ukrposhta,
 }
+BATCH_SIZE = 50000
+WRITERS = 4
+RAW_BATCH_SIZE = 1000
+WRITER_QUEUE_SIZE = 2
+REGION_FIELD = 1
 
 
-def _class_factory(*, source_name: str) -> BaseSource:
+def _class_factory(
+    *, source_name: str, streaming: bool = False, url: Optional[str] = None
+) -> BaseSource:
     """
     Get source class instance by class name.
 
     :param source_name: Class name
     :type source_name: str
+    :param streaming: Parse source while it is downloaded
+    :type streaming: bool
+    :param url: Url of source file instead of the default one
+    :type url: Optional[str]
     :return: Source class instance
     :rtype: BaseSource
     """
 
     source_class = SOURCES.get(source_name)
-    return source_class()
+    return source_class(streaming=streaming, url=url)
+
+
+def _parse_rows(source: BaseSource) -> Iterator[NormalizedRow]:
+    """
+    Generator of normalized address rows parsed from raw rows by batches.
+
+    :param source: Source of address rows
+    :type source: BaseSource
+    :return: Normalized address row
+    :rtype: Iterator[NormalizedRow]
+    """
+
+    for raw_batch in source.get_raw_batches(batch_size=RAW_BATCH_SIZE):
+        yield from source.parse_batch(raw_batch)
 
 
 async def _add_or_find_record(
@@ -36,6 +74,8 @@ async def _add_or_find_record(
     address_type: str,
     obj: AddressEntity,
     obj_attrs: dict,
+    id_cache: IdCache,
+    progress: Progress,
 ) -> int:
     """
     Add new address record and return id of it.
@@ -49,64 +89,512 @@ async def _add_or_find_record(
     :type obj: AddressEntity
     :param obj_attrs: Additional attributes for object
     :type obj_attrs: dict
+    :param id_cache: Cache of address records identifiers
+    :type id_cache: IdCache
+    :param progress: Progress of upload
+    :type progress: Progress
     :raise: ValueError - can't find and add address record
     :return: Identifier of address record
     :rtype: int
     """
 
-    print(f"{obj}", end=" - ")
-
     for attribute_name, attribute_value in obj_attrs.items():
         if hasattr(obj, attribute_name):
             setattr(obj, attribute_name, attribute_value)
 
+    cache_key = IdCache.make_key(level=address_type, obj=obj)
+
+    if (object_id := id_cache.get(cache_key)) is not None:
+        progress.count(address_type, "cached")
+        progress.log(f"{obj} - cached [{object_id}]")
+        return object_id
+
     func_param_dict = {address_type: obj}
 
     find_function = getattr(upload_module, f"find_{address_type}")
     add_function = getattr(upload_module, f"add_{address_type}")
 
-    if (
-        existed_obj := await find_function(conn, **func_param_dict)
-    ) is not None:
-        object_id = existed_obj.get("id")
-        print("exists", end=" ")
-    elif object_id := await add_function(conn, **func_param_dict):
-        print("created", end=" ")
-    else:
-        raise ValueError(f"Can't find/add {address_type} {obj}")
-    print(f"[{object_id}]")
+    with progress.measure("db"):
+        if (
+            existed_obj := await find_function(conn, **func_param_dict)
+        ) is not None:
+            object_id = existed_obj.get("id")
+            outcome = "found"
+        elif object_id := await add_function(conn, **func_param_dict):
+            outcome = "created"
+        else:
+            raise ValueError(f"Can't find/add {address_type} {obj}")
+
+    progress.count(address_type, outcome)
+    progress.log(f"{obj} - {outcome} [{object_id}]")
+
+    id_cache.set(cache_key, object_id)
 
     return object_id
 
 
-async def main(source_name: str):
-    source = _class_factory(source_name=source_name)
+async def _load_batch(
+    *,
+    conn: PoolConnectionProxy,
+    rows: List[NormalizedRow],
+    id_cache: Optional[IdCache],
+    progress: Progress,
+) -> None:
+    """
+    Load batch of address rows with set-based statements
+    and count it in progress.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param rows: Normalized address rows
+    :type rows: List[NormalizedRow]
+    :param id_cache: Cache of address records identifiers
+    :type id_cache: Optional[IdCache]
+    :param progress: Progress of upload
+    :type progress: Progress
+    """
+
+    with progress.measure("db"):
+        records = await upload_module.load_batch(
+            conn, rows=rows, id_cache=id_cache
+        )
+
+    for level, counts in records.items():
+        for outcome, count in counts.items():
+            progress.count(level, outcome, count)
+
+    progress.add_rows(len(rows))
+
+
+async def _bulk_upload(
+    *,
+    conn: PoolConnectionProxy,
+    rows: Iterable[NormalizedRow],
+    batch_size: int,
+    id_cache: Optional[IdCache],
+    progress: Progress,
+) -> None:
+    """
+    Upload address rows by batches with set-based statements.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param rows: Normalized address rows
+    :type rows: Iterable[NormalizedRow]
+    :param batch_size: Count of address rows in one batch
+    :type batch_size: int
+    :param id_cache: Cache of address records identifiers
+    :type id_cache: Optional[IdCache]
+    :param progress: Progress of upload
+    :type progress: Progress
+    """
+
+    batch = []
+
+    for row in progress.iterate(rows, timer="parse"):
+        batch.append(row)
+
+        if len(batch) >= batch_size:
+            await _load_batch(
+                conn=conn, rows=batch, id_cache=id_cache, progress=progress
+            )
+            batch = []
+
+    if batch:
+        await _load_batch(
+            conn=conn, rows=batch, id_cache=id_cache, progress=progress
+        )
 
-    config = Config.load_config()
-    db_pool = await init_db(config=config)
+
+async def _upload(
+    *,
+    conn: PoolConnectionProxy,
+    source: BaseSource,
+    id_cache: IdCache,
+    progress: Progress,
+) -> None:
+    """
+    Upload address rows one by one.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param source: Source of address rows
+    :type source: BaseSource
+    :param id_cache: Cache of address records identifiers
+    :type id_cache: IdCache
+    :param progress: Progress of upload
+    :type progress: Progress
+    """
+
+    for row in progress.iterate(source.get_address_rows(), timer="parse"):
+
+        progress.log(row)
+
+        parent_name: str = ""
+        parent_id: int = 0
+
+        for address_type, address_attributes in row.items():
+
+            if not isinstance(address_attributes, AddressEntity):
+                continue
+
+            lowed_type = address_type.lower()
+            parent_id = await _add_or_find_record(
+                conn=conn,
+                address_type=lowed_type,
+                obj=address_attributes,
+                obj_attrs={parent_name: parent_id},
+                id_cache=id_cache,
+                progress=progress,
+            )
+            parent_name = f"{lowed_type}_id"
+
+        progress.add_rows(1)
+
+
+async def _write_batches(
+    *,
+    db_pool: Pool,
+    queue: asyncio.Queue,
+    id_cache: IdCache,
+    progress: Progress,
+) -> None:
+    """
+    Writer of pipelined upload which loads batches from queue
+    on its own connection until None is got.
+
+    :param db_pool: Pool of connections to database
+    :type db_pool: Pool
+    :param queue: Queue of batches of normalized rows
+    :type queue: asyncio.Queue
+    :param id_cache: Cache of address records identifiers
+    :type id_cache: IdCache
+    :param progress: Progress of upload, db time is summed over writers
+    :type progress: Progress
+    """
 
     async with db_pool.acquire() as conn:
+        while (batch := await queue.get()) is not None:
+            await _load_batch(
+                conn=conn, rows=batch, id_cache=id_cache, progress=progress
+            )
+
+
+async def _put_batch(
+    queue: asyncio.Queue,
+    batch: Optional[List[NormalizedRow]],
+    writer: asyncio.Task,
+) -> None:
+    """
+    Put batch to queue of writer waiting for free space.
+    Error of writer is raised instead of waiting forever.
+
+    :param queue: Queue of writer
+    :type queue: asyncio.Queue
+    :param batch: Batch of normalized rows or None to stop writer
+    :type batch: Optional[List[NormalizedRow]]
+    :param writer: Writer task of queue
+    :type writer: asyncio.Task
+    """
+
+    put = asyncio.ensure_future(queue.put(batch))
+    await asyncio.wait([put, writer], return_when=asyncio.FIRST_COMPLETED)
+
+    if not put.done():
+        put.cancel()
+        # Writer ends before it is stopped only by error
+        writer.result()
 
-        for row in source.get_address_rows():
 
-            print(row)
+async def _pipeline_upload(
+    *,
+    db_pool: Pool,
+    source: BaseSource,
+    batch_size: int,
+    id_cache: IdCache,
+    progress: Progress,
+    writers_count: int = WRITERS,
+    processes: Optional[int] = None,
+) -> None:
+    """
+    Upload address rows by pipeline: raw rows of source are parsed
+    by batches in pool of processes and parsed rows are loaded
+    by concurrent writers on separate connections. Rows are distributed
+    to writers by region, so writers don't add the same records.
+    Queues of writers are bounded, so parsing waits for slow writers.
 
-            parent_name: str = ""
-            parent_id: int = 0
+    :param db_pool: Pool of connections to database
+    :type db_pool: Pool
+    :param source: Source of address rows
+    :type source: BaseSource
+    :param batch_size: Count of address rows in one batch of writer
+    :type batch_size: int
+    :param id_cache: Cache of address records identifiers
+    :type id_cache: IdCache
+    :param progress: Progress of upload
+    :type progress: Progress
+    :param writers_count: Count of writers, should be less than pool size
+    :type writers_count: int
+    :param processes: Count of parsing processes, count of CPUs by default
+    :type processes: Optional[int]
+    """
+
+    loop = asyncio.get_event_loop()
+    processes = processes or cpu_count() or 1
+    queues = [
+        asyncio.Queue(maxsize=WRITER_QUEUE_SIZE) for _ in range(writers_count)
+    ]
+    writers = [
+        asyncio.ensure_future(
+            _write_batches(
+                db_pool=db_pool,
+                queue=queue,
+                id_cache=id_cache,
+                progress=progress,
+            )
+        )
+        for queue in queues
+    ]
+    buffers = [[] for _ in range(writers_count)]
+    parse_batch = type(source).parse_batch
+    progress.watch("queues", lambda: [queue.qsize() for queue in queues])
 
-            for address_type, address_attributes in row.items():
+    async def distribute(parsing: asyncio.Future) -> None:
+        with progress.measure("parse"):
+            rows = await parsing
 
-                if not isinstance(address_attributes, AddressEntity):
-                    continue
+        for values in rows:
+            region = values[REGION_FIELD].encode("utf-8")
+            number = zlib.crc32(region) % writers_count
+            buffers[number].append(values)
 
-                lowed_type = address_type.lower()
-                parent_id = await _add_or_find_record(
-                    conn=conn,
-                    address_type=lowed_type,
-                    obj=address_attributes,
-                    obj_attrs={parent_name: parent_id},
+            if len(buffers[number]) >= batch_size:
+                await _put_batch(
+                    queues[number], buffers[number], writers[number]
                 )
-                parent_name = f"{lowed_type}_id"
+                buffers[number] = []
+
+    try:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            parsing_batches = []
+
+            for raw_batch in progress.iterate(
+                source.get_raw_batches(batch_size=RAW_BATCH_SIZE),
+                timer="read",
+            ):
+                parsing_batches.append(
+                    loop.run_in_executor(executor, parse_batch, raw_batch)
+                )
+
+                # Keep order of rows and don't parse too far ahead
+                if len(parsing_batches) >= processes * 2:
+                    await distribute(parsing_batches.pop(0))
+
+            for parsing in parsing_batches:
+                await distribute(parsing)
+
+        for queue, batch, writer in zip(queues, buffers, writers):
+            if batch:
+                await _put_batch(queue, batch, writer)
+            await _put_batch(queue, None, writer)
+
+        await asyncio.gather(*writers)
+    finally:
+        for writer in writers:
+            writer.cancel()
+
+
+async def _delta_upload(
+    *,
+    conn: PoolConnectionProxy,
+    source: BaseSource,
+    source_name: str,
+    batch_size: int,
+    progress: Progress,
+) -> bool:
+    """
+    Upload only changes of source snapshot since the last loaded snapshot
+    in one transaction: renamed streets, deleted houses, changed indexes
+    and added houses. Whole snapshot is uploaded by committed batches
+    if the last loaded one isn't found, its fingerprint is saved after
+    the last batch.
+
+    :param conn: Pool of connections to database
+    :type conn: PoolConnectionProxy
+    :param source: Source of address rows
+    :type source: BaseSource
+    :param source_name: Source class name
+    :type source_name: str
+    :param batch_size: Count of address rows in one batch of full upload
+    :type batch_size: int
+    :param progress: Progress of upload
+    :type progress: Progress
+    :return: Is anything uploaded
+    :rtype: bool
+    """
+
+    new_snapshot = Snapshot.write(
+        snapshot_directory(source_name, new=True),
+        progress.iterate(source.get_address_rows(), timer="parse"),
+    )
+    print(f"Snapshot of {new_snapshot.rows_count} rows is written")
+
+    old_snapshot = Snapshot.open(snapshot_directory(source_name))
+    fingerprint = await upload_module.get_snapshot_fingerprint(
+        conn, source=source_name
+    )
+
+    changed = new_snapshot.fingerprint != fingerprint
+
+    if not changed:
+        print("Snapshot isn't changed since the last upload")
+    elif old_snapshot and old_snapshot.fingerprint == fingerprint:
+        async with conn.transaction():
+            counts = Counter()
+
+            for delta in progress.iterate(
+                iter_deltas(old_snapshot, new_snapshot), timer="diff"
+            ):
+                with progress.measure("db"):
+                    counts.update(
+                        await upload_module.apply_delta(conn, delta=delta)
+                    )
+
+            await upload_module.set_snapshot_fingerprint(
+                conn,
+                source=source_name,
+                fingerprint=new_snapshot.fingerprint,
+                rows_count=new_snapshot.rows_count,
+            )
+
+        for name, count in counts.items():
+            progress.count("delta", name, count)
+
+        print(", ".join(f"{count} {name}" for name, count in counts.items()))
+    else:
+        # Batches are committed one by one like in bulk upload, the only
+        # huge transaction would keep every staged row till its end
+        print("Last loaded snapshot isn't found, uploading whole snapshot")
+        progress.total = new_snapshot.rows_count
+        await _bulk_upload(
+            conn=conn,
+            rows=new_snapshot.iter_rows(),
+            batch_size=batch_size,
+            id_cache=None,
+            progress=progress,
+        )
+        await upload_module.set_snapshot_fingerprint(
+            conn,
+            source=source_name,
+            fingerprint=new_snapshot.fingerprint,
+            rows_count=new_snapshot.rows_count,
+        )
+
+    new_snapshot.replace(snapshot_directory(source_name))
+
+    return changed
+
+
+async def main(
+    source_name: str,
+    *,
+    bulk: bool = False,
+    batch_size: int = BATCH_SIZE,
+    cache_size: int = CACHE_MAX_SIZE,
+    warm_cache: bool = False,
+    streaming: bool = False,
+    force: bool = False,
+    delta: bool = False,
+    pipeline: bool = False,
+    writers: int = WRITERS,
+    processes: Optional[int] = None,
+    quiet: bool = False,
+    progress_interval: float = PROGRESS_INTERVAL,
+    url: Optional[str] = None,
+):
+    source = _class_factory(
+        source_name=source_name, streaming=streaming, url=url
+    )
+
+    if not force and source.is_loaded():
+        print("Source isn't changed since the last upload")
+        return
+
+    id_cache = IdCache(max_size=cache_size)
+    progress = Progress(interval=progress_interval, quiet=quiet)
+
+    # Delta upload knows count of rows when snapshot is written
+    if not delta:
+        with progress.measure("count"):
+            progress.total = source.count_rows()
+
+    config = Config.load_config()
+    db_pool = await init_db(config=config)
+
+    try:
+        # Main connection is held during upload, so writers need the rest
+        if pipeline and writers >= db_pool.max_size:
+            raise ValueError("Count of writers should be less than pool size")
+
+        async with db_pool.acquire() as conn:
+
+            if warm_cache:
+                loaded = await id_cache.warm_up(conn)
+                print(f"Id cache is warmed up by {loaded} records")
+
+            try:
+                changed = True
+
+                if delta:
+                    changed = await _delta_upload(
+                        conn=conn,
+                        source=source,
+                        source_name=source_name,
+                        batch_size=batch_size,
+                        progress=progress,
+                    )
+                elif pipeline:
+                    await _pipeline_upload(
+                        db_pool=db_pool,
+                        source=source,
+                        batch_size=batch_size,
+                        id_cache=id_cache,
+                        progress=progress,
+                        writers_count=writers,
+                        processes=processes,
+                    )
+                elif bulk:
+                    await _bulk_upload(
+                        conn=conn,
+                        rows=_parse_rows(source),
+                        batch_size=batch_size,
+                        id_cache=id_cache,
+                        progress=progress,
+                    )
+                else:
+                    await _upload(
+                        conn=conn,
+                        source=source,
+                        id_cache=id_cache,
+                        progress=progress,
+                    )
+
+                # Unchanged data keeps caches of the current data version
+                if changed:
+                    with progress.measure("refresh"):
+                        await upload_module.refresh_address_flat(conn)
+                        await upload_module.refresh_postcode_street(conn)
+                    print("Flattened addresses and postcodes are refreshed")
+
+                    version = await upload_module.bump_data_version(conn)
+                    print(f"Data version is bumped to {version}")
+
+                source.mark_loaded()
+            finally:
+                progress.summary(id_cache=id_cache.stats())
+
+    finally:
+        await db_pool.close()
 
 
 if __name__ == "__main__":
@@ -119,9 +607,100 @@ if __name__ == "__main__":
         required=True,
         choices=SOURCES.keys(),
     )
+    parser.add_argument(
+        "--url",
+        help="Url of source file instead of the default one, "
+        "e.g. file:///path/to/houses.zip",
+    )
+    parser.add_argument(
+        "-B",
+        "--bulk",
+        help="Upload addresses by batches with set-based statements",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--pipeline",
+        help="Parse source in pool of processes and upload addresses "
+        "by concurrent writers",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--writers",
+        help="Count of concurrent writers of pipelined upload",
+        type=int,
+        default=WRITERS,
+    )
+    parser.add_argument(
+        "--processes",
+        help="Count of parsing processes of pipelined upload, "
+        "count of CPUs by default",
+        type=int,
+    )
+    parser.add_argument(
+        "--batch-size",
+        help="Count of address rows in one batch for bulk upload",
+        type=int,
+        default=BATCH_SIZE,
+    )
+    parser.add_argument(
+        "--cache-size",
+        help="Max count of identifiers in id cache, 0 to disable it",
+        type=int,
+        default=CACHE_MAX_SIZE,
+    )
+    parser.add_argument(
+        "--warm-cache",
+        help="Fill id cache by existing records before upload",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--stream",
+        help="Parse source while it is downloaded without extracting it",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--delta",
+        help="Upload only changes since the last snapshot uploaded by delta",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        help="Don't print every uploaded row and record",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--progress-interval",
+        help="Interval in seconds between progress reports",
+        type=float,
+        default=PROGRESS_INTERVAL,
+    )
+    parser.add_argument(
+        "--force",
+        help="Upload source even if it isn't changed since the last upload",
+        action="store_true",
+    )
 
     args = parser.parse_args()
-    task = loop.create_task(main(source_name=args.source))
+    task = loop.create_task(
+        main(
+            source_name=args.source,
+            bulk=args.bulk,
+            batch_size=args.batch_size,
+            cache_size=args.cache_size,
+            warm_cache=args.warm_cache,
+            streaming=args.stream,
+            force=args.force,
+            delta=args.delta,
+            pipeline=args.pipeline,
+            writers=args.writers,
+            processes=args.processes,
+            quiet=args.quiet,
+            progress_interval=args.progress_interval,
+            url=args.url,
+        )
+    )
     value = loop.run_until_complete(asyncio.wait([task]))
 
     loop.close()
@@ -0,0 +1,342 @@
+import glob
+import hashlib
+import json
+from os import makedirs, path, remove, replace
+from typing import Optional
+from urllib.error import ContentTooShortError, HTTPError
+from urllib.request import Request, urlopen
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+class Download:
+    """
+    Stream of downloaded file. Bytes from network are appended to partial
+    file of cache, and the file is moved to cache by its checksum
+    when stream ends.
+    """
+
+    def __init__(
+        self,
+        *,
+        cache: "DownloadCache",
+        url: str,
+        response=None,
+        offset: int = 0,
+    ):
+        self.url = url
+        self.not_modified = response is None
+        self.sha256: Optional[str] = None
+        self.path: Optional[str] = None
+        self._cache = cache
+        self._response = response
+        self._prefix_size = offset
+        self._size = 0
+        self._expected_size: Optional[int] = None
+
+        if response is None:
+            self.sha256 = cache.load_meta(url)["sha256"]
+            self.path = cache.object_path(self.sha256)
+            self._file = open(self.path, "rb")
+        else:
+            self._hash = hashlib.sha256()
+
+            if content_length := response.headers.get("Content-Length"):
+                self._expected_size = offset + int(content_length)
+            self._file = open(cache.part_path(url), "a+b" if offset else "wb")
+            self._file.seek(0)
+
+    def __enter__(self) -> "Download":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def complete(self) -> bool:
+        """Is whole file downloaded"""
+
+        return self.path is not None
+
+    def read(self, size: int = CHUNK_SIZE) -> bytes:
+        """
+        Read at most size bytes of file, partially downloaded bytes go first.
+
+        :param size: Max count of bytes
+        :type size: int
+        :return: Read bytes, empty at the end of file
+        :rtype: bytes
+        """
+
+        if self._response is None:
+            return self._file.read(size)
+
+        if self._prefix_size:
+            data = self._file.read(min(size, self._prefix_size))
+            self._prefix_size -= len(data)
+        elif data := self._response.read(size):
+            self._file.write(data)
+        else:
+            self._complete()
+            return data
+
+        self._size += len(data)
+        self._hash.update(data)
+
+        return data
+
+    def read_all(self) -> str:
+        """
+        Read rest of file.
+
+        :return: Path of file in cache
+        :rtype: str
+        """
+
+        while self.read(CHUNK_SIZE):
+            pass
+
+        return self.path
+
+    def close(self) -> None:
+        """Close download, partial file is kept to resume download."""
+
+        self._file.close()
+
+        if self._response is not None:
+            self._response.close()
+
+    def _complete(self) -> None:
+        """
+        Move downloaded file to cache by its checksum.
+
+        :raise ContentTooShortError: Connection is closed before end of file,
+            partial file is kept to resume download
+        """
+
+        self.close()
+
+        if (
+            self._expected_size is not None
+            and self._size < self._expected_size
+        ):
+            raise ContentTooShortError(
+                f"Only {self._size} of {self._expected_size} bytes of "
+                f"{self.url} are downloaded",
+                None,
+            )
+
+        self._response = None
+        self.sha256 = self._hash.hexdigest()
+        self.path = self._cache.object_path(self.sha256)
+
+        replace(self._cache.part_path(self.url), self.path)
+        self._file = open(self.path, "rb")
+        self._file.seek(0, 2)
+
+        meta = self._cache.load_meta(self.url)
+        meta.update(meta.pop("partial", {}))
+        meta.update(sha256=self.sha256, size=path.getsize(self.path))
+        self._cache.save_meta(self.url, meta)
+        self._cache.prune()
+
+
+class DownloadCache:
+    """
+    Content-addressed cache of downloaded files.
+
+    The last downloaded file of every url is stored by its sha256 checksum
+    with ETag, Last-Modified and size of it and checksum of the last
+    loaded file of url.
+    """
+
+    def __init__(self, directory: str, *, timeout: Optional[float] = None):
+        self.directory = directory
+        self.timeout = timeout
+        makedirs(path.join(directory, "objects"), exist_ok=True)
+
+    def object_path(self, sha256: str) -> str:
+        """
+        Get path of cached file by checksum.
+
+        :param sha256: Checksum of file
+        :type sha256: str
+        :return: Path of file
+        :rtype: str
+        """
+
+        return path.join(self.directory, "objects", sha256)
+
+    def part_path(self, url: str) -> str:
+        """
+        Get path of partially downloaded file of url.
+
+        :param url: Url of file
+        :type url: str
+        :return: Path of partial file
+        :rtype: str
+        """
+
+        return path.join(self.directory, f"{self._url_key(url)}.part")
+
+    def load_meta(self, url: str) -> dict:
+        """
+        Load metadata of url.
+
+        :param url: Url of file
+        :type url: str
+        :return: Metadata, empty if url was never downloaded
+        :rtype: dict
+        """
+
+        try:
+            with open(self._meta_path(url)) as meta_file:
+                return json.load(meta_file)
+        except (OSError, ValueError):
+            return {}
+
+    def save_meta(self, url: str, meta: dict) -> None:
+        """
+        Save metadata of url.
+
+        :param url: Url of file
+        :type url: str
+        :param meta: Metadata
+        :type meta: dict
+        """
+
+        meta_path = self._meta_path(url)
+
+        with open(meta_path + ".tmp", "w") as meta_file:
+            json.dump({**meta, "url": url}, meta_file)
+
+        replace(meta_path + ".tmp", meta_path)
+
+    def open(self, url: str) -> Download:
+        """
+        Open download of url. Request is conditional if file is cached and
+        partial download is resumed by Range request if it has ETag
+        or Last-Modified to check that file isn't changed.
+
+        :param url: Url of file
+        :type url: str
+        :return: Download
+        :rtype: Download
+        """
+
+        meta = self.load_meta(url)
+        part_path = self.part_path(url)
+        request = Request(url)
+        offset = 0
+
+        if (partial := meta.get("partial")) and path.isfile(part_path):
+            if validator := partial["etag"] or partial["last_modified"]:
+                offset = path.getsize(part_path)
+                request.add_header("Range", f"bytes={offset}-")
+                request.add_header("If-Range", validator)
+            else:
+                # Rest of file can't be checked to be of the same version,
+                # so whole file is downloaded again
+                remove(part_path)
+        elif meta.get("sha256") and path.isfile(
+            self.object_path(meta["sha256"])
+        ):
+            if meta.get("etag"):
+                request.add_header("If-None-Match", meta["etag"])
+            if meta.get("last_modified"):
+                request.add_header("If-Modified-Since", meta["last_modified"])
+
+        try:
+            response = urlopen(request, timeout=self.timeout)
+        except HTTPError as e:
+            if e.code == 304:
+                return Download(cache=self, url=url)
+
+            if e.code == 416 and offset:
+                # Partial file is stale, download whole file again
+                remove(part_path)
+                meta.pop("partial", None)
+                self.save_meta(url, meta)
+                return self.open(url)
+
+            raise
+
+        # File responses don't have status
+        if (getattr(response, "status", None) or 200) != 206:
+            offset = 0
+
+        meta["partial"] = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        self.save_meta(url, meta)
+
+        return Download(cache=self, url=url, response=response, offset=offset)
+
+    def is_loaded(self, download: Download) -> bool:
+        """
+        Check if downloaded file is the last loaded file of url.
+
+        :param download: Complete download
+        :type download: Download
+        :return: Is file loaded already
+        :rtype: bool
+        """
+
+        loaded_sha256 = self.load_meta(download.url).get("loaded_sha256")
+
+        return download.complete and download.sha256 == loaded_sha256
+
+    def mark_loaded(self, download: Download) -> None:
+        """
+        Remember downloaded file as the last loaded file of url.
+
+        :param download: Complete download
+        :type download: Download
+        """
+
+        meta = self.load_meta(download.url)
+        meta["loaded_sha256"] = download.sha256
+        self.save_meta(download.url, meta)
+
+    def prune(self) -> None:
+        """Remove cached files which aren't the last downloaded ones."""
+
+        used = set()
+
+        for meta_path in glob.glob(path.join(self.directory, "*.json")):
+            with open(meta_path) as meta_file:
+                meta = json.load(meta_file)
+            used.add(meta.get("sha256"))
+
+        for object_path in glob.glob(
+            path.join(self.directory, "objects", "*")
+        ):
+            if path.basename(object_path) not in used:
+                remove(object_path)
+
+    def _meta_path(self, url: str) -> str:
+        """
+        Get path of metadata of url.
+
+        :param url: Url of file
+        :type url: str
+        :return: Path of metadata
+        :rtype: str
+        """
+
+        return path.join(self.directory, f"{self._url_key(url)}.json")
+
+    @staticmethod
+    def _url_key(url: str) -> str:
+        """
+        Get file name of url.
+
+        :param url: Url of file
+        :type url: str
+        :return: Hash of url
+        :rtype: str
+        """
+
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
@@ -0,0 +1,130 @@
+import hashlib
+from typing import Awaitable, Callable, Optional
+
+from aiohttp import web
+
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+DEFAULT_CACHE_CLASS = "default"
+
+
+def cache_class(name: str) -> Callable[[Handler], Handler]:
+    """
+    Decorator which sets class of handler to choose Cache-Control header
+    from configuration.
+
+    :param name: Cache class name
+    :type name: str
+    :return: Decorator
+    :rtype: Callable[[Handler], Handler]
+    """
+
+    def decorator(handler: Handler) -> Handler:
+        handler.cache_class = name
+        return handler
+
+    return decorator
+
+
+def make_etag(*parts: str) -> str:
+    """
+    Make strong entity tag from parts.
+
+    :param parts: Parts which identify response
+    :type parts: str
+    :return: Quoted entity tag
+    :rtype: str
+    """
+
+    digest = hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+    return f'"{digest[:20]}"'
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """
+    Check entity tag against If-None-Match header by weak comparison.
+
+    :param etag: Quoted entity tag
+    :type etag: str
+    :param if_none_match: Value of If-None-Match header
+    :type if_none_match: Optional[str]
+    :return: Does any tag of header match
+    :rtype: bool
+    """
+
+    if not if_none_match:
+        return False
+
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+
+        if tag == "*" or tag.replace("W/", "", 1) == etag:
+            return True
+
+    return False
+
+
+@web.middleware
+async def conditional_get_middleware(
+    request: web.Request, handler: Handler
+) -> web.StreamResponse:
+    """
+    Add ETag and Cache-Control headers to GET responses and answer
+    Not Modified to matching If-None-Match.
+
+    ETag is derived from data version and request path with query,
+    so matching requests are answered without calling handler.
+    If data version isn't loaded, ETag is a hash of response body.
+    Responses of handlers with "no-store" Cache-Control don't get ETag.
+
+    :param request: Current request
+    :type request: web.Request
+    :param handler: Next request handler
+    :type handler: Handler
+    :return: Response
+    :rtype: web.StreamResponse
+    """
+
+    if request.method != "GET":
+        return await handler(request)
+
+    route_handler = request.match_info.handler
+    name = getattr(route_handler, "cache_class", DEFAULT_CACHE_CLASS)
+    cache_control = request.app["config"]["cache_control"].get(name)
+
+    if cache_control and "no-store" in cache_control:
+        response = await handler(request)
+        response.headers["Cache-Control"] = cache_control
+        return response
+
+    if_none_match = request.headers.get("If-None-Match")
+    headers = {"Cache-Control": cache_control} if cache_control else {}
+
+    if (version := request.app["data_version"].value) is not None:
+        etag = make_etag(str(version), request.rel_url.path_qs)
+
+        if etag_matches(etag, if_none_match):
+            return web.Response(status=304, headers={"ETag": etag, **headers})
+    else:
+        etag = None
+
+    response = await handler(request)
+
+    if response.status != 200:
+        return response
+
+    if etag is None and isinstance(response.body, bytes):
+        body_digest = hashlib.sha1(response.body).hexdigest()
+        etag = make_etag(request.rel_url.path_qs, body_digest)
+
+        if etag_matches(etag, if_none_match):
+            return web.Response(status=304, headers={"ETag": etag, **headers})
+
+    if etag is not None:
+        response.headers["ETag"] = etag
+
+    response.headers.update(headers)
+
+    return response
@@ -5,19 +5,6 @@ from typing import Any
 from asyncpg import Record
 
 
-def to_json(data: Any) -> str:
-    """
-    Decorator over usual json.dumps function with specific parameters.
-
-    :param data: Data to serialize in json format
-    :param data: Any
-    :return: Json string
-    :rtype: str
-    """
-
-    return json.dumps(data, indent=4, default=perfect_json_serializer)
-
-
 def perfect_json_serializer(value: Any) -> Any:
     """
     Make some types of objects serializable to json.
@@ -32,3 +19,52 @@ def perfect_json_serializer(value: Any) -> Any:
         return value.__str__()
     elif isinstance(value, Record):
         return dict(value)
+
+
+_compact_encoder = json.JSONEncoder(
+    ensure_ascii=False, separators=(",", ":"), default=perfect_json_serializer
+)
+_pretty_encoder = json.JSONEncoder(
+    ensure_ascii=False, indent=4, default=perfect_json_serializer
+)
+
+
+def to_json(data: Any, *, pretty: bool = False) -> str:
+    """
+    Serialize data to compact or pretty printed json.
+    Records and lists of records are converted to dicts before encoding,
+    so they don't go through the default hook one by one.
+
+    :param data: Data to serialize in json format
+    :type data: Any
+    :param pretty: Indent json
+    :type pretty: bool
+    :return: Json string
+    :rtype: str
+    """
+
+    encoder = _pretty_encoder if pretty else _compact_encoder
+
+    if isinstance(data, Record):
+        data = dict(data)
+    elif isinstance(data, list):
+        data = [
+            dict(item) if isinstance(item, Record) else item for item in data
+        ]
+
+    return encoder.encode(data)
+
+
+def to_json_bytes(data: Any, *, pretty: bool = False) -> bytes:
+    """
+    Serialize data to compact or pretty printed json encoded in utf-8.
+
+    :param data: Data to serialize in json format
+    :type data: Any
+    :param pretty: Indent json
+    :type pretty: bool
+    :return: Json bytes
+    :rtype: bytes
+    """
+
+    return to_json(data, pretty=pretty).encode("utf-8")
@@ -0,0 +1,580 @@
+import asyncio
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+import glob
+import json
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from aiohttp import web
+
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+UNMATCHED_ROUTE = "unmatched"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Histograms of metrics by attribute name
+HISTOGRAMS = {
+    "latency": LATENCY_BUCKETS,
+    "response_size": SIZE_BUCKETS,
+    "db_time": LATENCY_BUCKETS,
+}
+
+# Metric name, type and help of stats of db pool
+POOL_METRICS = {
+    "min_size": ("db_pool_min_size", "gauge", "Min count of connections."),
+    "max_size": ("db_pool_max_size", "gauge", "Max count of connections."),
+    "size": ("db_pool_size", "gauge", "Open connections."),
+    "in_use": ("db_pool_in_use", "gauge", "Acquired connections."),
+    "idle": ("db_pool_idle", "gauge", "Idle connections."),
+    "waiters": ("db_pool_waiters", "gauge", "Waiters of free connection."),
+    "opened": ("db_pool_opened_total", "counter", "Opened connections."),
+    "acquired": (
+        "db_pool_acquired_total",
+        "counter",
+        "Acquired connections.",
+    ),
+    "acquire_seconds": (
+        "db_pool_acquire_seconds_total",
+        "counter",
+        "Time of waiting for free connections.",
+    ),
+    "acquire_max": (
+        "db_pool_acquire_max_seconds",
+        "gauge",
+        "Max time of waiting for free connection.",
+    ),
+}
+
+# Stats of db pools of workers which are max of them instead of sum
+MAX_POOL_STATS = ("acquire_max",)
+WORKER_FILENAME = "worker-{}.json"
+
+logger = logging.getLogger(__name__)
+
+# Seconds of acquiring and holding db connections by current request
+_db_time: ContextVar[Optional[List[float]]] = ContextVar(
+    "db_time", default=None
+)
+
+
+def add_db_time(seconds: float) -> None:
+    """
+    Add time of acquiring and holding db connection to current request.
+
+    :param seconds: Seconds of acquiring and holding connection
+    :type seconds: float
+    """
+
+    if (db_time := _db_time.get()) is not None:
+        db_time[0] += seconds
+
+
+class Histogram:
+    """Histogram of observed values by cumulative buckets."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Count value in the first bucket which is not less than it.
+
+        :param value: Observed value
+        :type value: float
+        """
+
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        """
+        Generator of samples in text exposition format.
+
+        :return: Suffix of metric name, le label value and sample value
+        :rtype: Iterator[Tuple[str, str, float]]
+        """
+
+        cumulative = 0
+
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative += count
+            yield "_bucket", _format_value(bound), cumulative
+
+        yield "_sum", "", self.sum
+        yield "_count", "", self.count
+
+    def merge(self, counts: List[int], total: float) -> None:
+        """
+        Add observations of histogram of other worker.
+
+        :param counts: Counts of values by bucket
+        :type counts: List[int]
+        :param total: Sum of values
+        :type total: float
+        """
+
+        self.counts = [a + b for a, b in zip(self.counts, counts)]
+        self.sum += total
+        self.count += sum(counts)
+
+
+class Metrics:
+    """
+    Metrics of requests of worker: counts by route template, method
+    and status, histograms of latency, response size and time
+    of acquiring and holding db connections by route template and method.
+    """
+
+    def __init__(self):
+        self.requests = Counter()
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.response_size: Dict[Tuple[str, str], Histogram] = {}
+        self.db_time: Dict[Tuple[str, str], Histogram] = {}
+
+    def observe(
+        self,
+        *,
+        route: str,
+        method: str,
+        status: int,
+        seconds: float,
+        size: Optional[int],
+        db_seconds: float,
+    ) -> None:
+        """
+        Count finished request.
+
+        :param route: Route template
+        :type route: str
+        :param method: Request method
+        :type method: str
+        :param status: Response status
+        :type status: int
+        :param seconds: Latency of request
+        :type seconds: float
+        :param size: Size of response body, None if it is unknown
+        :type size: Optional[int]
+        :param db_seconds: Time of acquiring and holding db connections
+        :type db_seconds: float
+        """
+
+        key = (route, method)
+        self.requests[(route, method, str(status))] += 1
+        _histogram(self.latency, key, LATENCY_BUCKETS).observe(seconds)
+        _histogram(self.db_time, key, LATENCY_BUCKETS).observe(db_seconds)
+
+        if size is not None:
+            _histogram(self.response_size, key, SIZE_BUCKETS).observe(size)
+
+    def state(self) -> dict:
+        """
+        Get metrics as json serializable state to merge it in other worker.
+
+        :return: Counts of requests and histograms
+        :rtype: dict
+        """
+
+        return {
+            "requests": [
+                [*key, count] for key, count in self.requests.items()
+            ],
+            **{
+                name: [
+                    [*key, histogram.counts, histogram.sum]
+                    for key, histogram in getattr(self, name).items()
+                ]
+                for name in HISTOGRAMS
+            },
+        }
+
+    def merge(self, state: dict) -> None:
+        """
+        Add metrics of other worker.
+
+        :param state: State of metrics of other worker
+        :type state: dict
+        """
+
+        for route, method, status, count in state["requests"]:
+            self.requests[(route, method, status)] += count
+
+        for name, buckets in HISTOGRAMS.items():
+            for route, method, counts, total in state[name]:
+                _histogram(
+                    getattr(self, name), (route, method), buckets
+                ).merge(counts, total)
+
+    def render(self, *, pool_stats: Optional[dict] = None) -> str:
+        """
+        Render metrics in Prometheus text exposition format.
+
+        :param pool_stats: Stats of db pool to expose as gauges
+        :type pool_stats: Optional[dict]
+        :return: Metrics text
+        :rtype: str
+        """
+
+        lines = [
+            "# HELP http_requests_total Count of handled requests.",
+            "# TYPE http_requests_total counter",
+        ]
+
+        for (route, method, status), count in sorted(self.requests.items()):
+            labels = _labels(route=route, method=method, status=status)
+            lines.append(f"http_requests_total{labels} {count}")
+
+        for name, help_text, histograms in (
+            (
+                "http_request_duration_seconds",
+                "Latency of requests.",
+                self.latency,
+            ),
+            (
+                "http_response_size_bytes",
+                "Size of response bodies.",
+                self.response_size,
+            ),
+            (
+                "http_request_db_seconds",
+                "Time of acquiring and holding db connections by requests.",
+                self.db_time,
+            ),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+
+            for (route, method), histogram in sorted(histograms.items()):
+                for suffix, le, value in histogram.samples():
+                    labels = _labels(
+                        route=route,
+                        method=method,
+                        **({"le": le} if le else {}),
+                    )
+                    lines.append(
+                        f"{name}{suffix}{labels} {_format_value(value)}"
+                    )
+
+        for stat, (name, metric_type, help_text) in POOL_METRICS.items():
+            if (value := (pool_stats or {}).get(stat)) is None:
+                continue
+
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"{name} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def merge_pool_stats(stats: List[dict]) -> dict:
+    """
+    Merge stats of db pools of workers: sizes and counters are summed.
+
+    :param stats: Stats of pools
+    :type stats: List[dict]
+    :return: Stats of all pools
+    :rtype: dict
+    """
+
+    merged = {}
+
+    for pool_stats in stats:
+        for stat, value in pool_stats.items():
+            if stat not in merged:
+                merged[stat] = value
+            elif stat in MAX_POOL_STATS:
+                merged[stat] = max(merged[stat], value)
+            else:
+                merged[stat] += value
+
+    return merged
+
+
+def _worker_path(directory: str, pid: int) -> str:
+    """
+    Get path of metrics file of worker.
+
+    :param directory: Directory of metrics of workers
+    :type directory: str
+    :param pid: Process id of worker
+    :type pid: int
+    :return: Path of file
+    :rtype: str
+    """
+
+    return os.path.join(directory, WORKER_FILENAME.format(pid))
+
+
+def _worker_paths(directory: str) -> List[str]:
+    """
+    Get paths of metrics files of all workers.
+
+    :param directory: Directory of metrics of workers
+    :type directory: str
+    :return: Paths of files
+    :rtype: List[str]
+    """
+
+    return glob.glob(os.path.join(directory, WORKER_FILENAME.format("*")))
+
+
+def write_metrics(
+    directory: str, metrics: Metrics, *, pool_stats: dict
+) -> None:
+    """
+    Write metrics of current worker to directory shared by workers.
+
+    :param directory: Directory of metrics of workers
+    :type directory: str
+    :param metrics: Metrics of current worker
+    :type metrics: Metrics
+    :param pool_stats: Stats of db pool of current worker
+    :type pool_stats: dict
+    """
+
+    worker_path = _worker_path(directory, os.getpid())
+
+    with open(worker_path + ".tmp", "w") as metrics_file:
+        json.dump({**metrics.state(), "pool": pool_stats}, metrics_file)
+
+    os.replace(worker_path + ".tmp", worker_path)
+
+
+def read_metrics(
+    directory: str, metrics: Metrics, *, pool_stats: dict
+) -> Tuple[Metrics, dict]:
+    """
+    Merge current metrics of this worker with the last written metrics
+    of other workers.
+
+    :param directory: Directory of metrics of workers
+    :type directory: str
+    :param metrics: Metrics of current worker
+    :type metrics: Metrics
+    :param pool_stats: Stats of db pool of current worker
+    :type pool_stats: dict
+    :return: Metrics and stats of db pools of all workers
+    :rtype: Tuple[Metrics, dict]
+    """
+
+    merged = Metrics()
+    merged.merge(metrics.state())
+    stats = [pool_stats]
+    own_path = _worker_path(directory, os.getpid())
+
+    for worker_path in _worker_paths(directory):
+        if worker_path == own_path:
+            continue
+
+        try:
+            with open(worker_path) as metrics_file:
+                state = json.load(metrics_file)
+        except (OSError, ValueError):
+            continue
+
+        merged.merge(state)
+        stats.append(state["pool"])
+
+    return merged, merge_pool_stats(stats)
+
+
+def clear_metrics(directory: str) -> None:
+    """
+    Create directory of metrics of workers and remove metrics
+    of previous run.
+
+    :param directory: Directory of metrics of workers
+    :type directory: str
+    """
+
+    os.makedirs(directory, exist_ok=True)
+
+    for worker_path in _worker_paths(directory):
+        os.remove(worker_path)
+
+
+async def export_metrics(app: web.Application, interval: float) -> None:
+    """
+    Write metrics of worker to directory of metrics periodically,
+    so other workers can answer with metrics of all of them.
+
+    :param app: Current application
+    :type app: web.Application
+    :param interval: Interval between writes in seconds
+    :type interval: float
+    """
+
+    while True:
+        await asyncio.sleep(interval)
+
+        try:
+            write_metrics(
+                app["config"]["metrics_dir"],
+                app["metrics"],
+                pool_stats=app["db"].stats(),
+            )
+        except OSError:
+            logger.exception("Can't write metrics")
+
+
+def _histogram(
+    histograms: Dict[Tuple[str, str], Histogram],
+    key: Tuple[str, str],
+    buckets: Tuple[float, ...],
+) -> Histogram:
+    """
+    Get histogram by key, creating it at first.
+
+    :param histograms: Histograms by route template and method
+    :type histograms: Dict[Tuple[str, str], Histogram]
+    :param key: Route template and method
+    :type key: Tuple[str, str]
+    :param buckets: Upper bounds of buckets
+    :type buckets: Tuple[float, ...]
+    :return: Histogram
+    :rtype: Histogram
+    """
+
+    if (histogram := histograms.get(key)) is None:
+        histogram = histograms[key] = Histogram(buckets)
+
+    return histogram
+
+
+def _labels(**labels: str) -> str:
+    """
+    Format labels of sample with escaped values.
+
+    :param labels: Values of labels
+    :type labels: str
+    :return: Labels in braces
+    :rtype: str
+    """
+
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            value.replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n"),
+        )
+        for name, value in labels.items()
+    )
+
+    return f"{{{pairs}}}"
+
+
+def _format_value(value) -> str:
+    """
+    Format value of sample, integers are printed without fraction.
+
+    :param value: Value
+    :return: Formatted value
+    :rtype: str
+    """
+
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+
+    return str(value)
+
+
+def _route_template(request: web.Request) -> str:
+    """
+    Get template of matched route, e.g. /house/{house_id}, to keep
+    cardinality of labels bounded.
+
+    :param request: Current request
+    :type request: web.Request
+    :return: Route template
+    :rtype: str
+    """
+
+    route = request.match_info.route
+
+    if route.resource is None or request.match_info.http_exception:
+        return UNMATCHED_ROUTE
+
+    return route.resource.canonical
+
+
+def _response_size(response: web.StreamResponse) -> Optional[int]:
+    """
+    Get size of response body.
+
+    :param response: Response
+    :type response: web.StreamResponse
+    :return: Size in bytes, None if it is unknown
+    :rtype: Optional[int]
+    """
+
+    if response.prepared:
+        return response.body_length
+
+    return response.content_length
+
+
+@web.middleware
+async def metrics_middleware(
+    request: web.Request, handler: Handler
+) -> web.StreamResponse:
+    """
+    Count request with its latency, response size and time of acquiring
+    and holding db connections by route template.
+
+    :param request: Current request
+    :type request: web.Request
+    :param handler: Next request handler
+    :type handler: Handler
+    :return: Response
+    :rtype: web.StreamResponse
+    """
+
+    started = time.perf_counter()
+    token = _db_time.set([0.0])
+    status = 500
+    size = None
+
+    try:
+        response = await handler(request)
+        status = response.status
+        size = _response_size(response)
+
+        return response
+    except web.HTTPException as exception:
+        status = exception.status
+        raise
+    finally:
+        db_time = _db_time.get()[0]
+        _db_time.reset(token)
+        request.app["metrics"].observe(
+            route=_route_template(request),
+            method=request.method,
+            status=status,
+            seconds=time.perf_counter() - started,
+            size=size,
+            db_seconds=db_time,
+        )
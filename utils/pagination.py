@@ -0,0 +1,97 @@
+import base64
+import binascii
+import json
+from typing import List, Optional, Tuple
+
+from aiohttp import web
+
+from logic.api import page_size
+from utils.response import json_response
+
+
+def encode_cursor(after_id: int) -> str:
+    """
+    Make opaque cursor of the next page.
+
+    :param after_id: Id of last record of current page
+    :type after_id: int
+    :return: Cursor
+    :rtype: str
+    """
+
+    data = json.dumps({"after_id": after_id}, separators=(",", ":"))
+
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Get id of last record of previous page from cursor.
+
+    :param cursor: Cursor
+    :type cursor: str
+    :raise ValueError: Cursor is malformed
+    :return: Id of last record of previous page
+    :rtype: int
+    """
+
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        after_id = json.loads(data)["after_id"]
+    except (binascii.Error, UnicodeDecodeError, TypeError, KeyError) as e:
+        raise ValueError("Malformed cursor") from e
+
+    if not isinstance(after_id, int) or isinstance(after_id, bool):
+        raise ValueError("Malformed cursor")
+
+    return after_id
+
+
+def get_page_params(request: web.Request) -> Tuple[int, Optional[int]]:
+    """
+    Get limit and id of last record of previous page from query params.
+
+    :param request: Current request
+    :type request: web.Request
+    :raise web.HTTPBadRequest: Cursor is malformed
+    :return: Limit and id of last record of previous page
+    :rtype: Tuple[int, Optional[int]]
+    """
+
+    limit = int(request.rel_url.query.get("limit", "0"))
+
+    if (cursor := request.rel_url.query.get("cursor")) is None:
+        return limit, None
+
+    try:
+        return limit, decode_cursor(cursor)
+    except ValueError:
+        raise web.HTTPBadRequest(text="cursor is malformed")
+
+
+def paginated_json_response(
+    request: web.Request, records: List, *, limit: int
+) -> web.Response:
+    """
+    Make json response of page of records with link to the next page
+    in Link and X-Next-Cursor headers if page is full.
+
+    :param request: Current request
+    :type request: web.Request
+    :param records: Records of page ordered by id
+    :type records: List
+    :param limit: Requested limit
+    :type limit: int
+    :return: Json response
+    :rtype: web.Response
+    """
+
+    response = json_response(request, records)
+
+    if records and len(records) >= page_size(limit):
+        cursor = encode_cursor(records[-1]["id"])
+        next_url = request.rel_url.update_query(cursor=cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+        response.headers["X-Next-Cursor"] = cursor
+
+    return response
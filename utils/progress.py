@@ -0,0 +1,182 @@
+from collections import Counter
+from contextlib import contextmanager
+import json
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+
+PROGRESS_INTERVAL = 10.0
+
+
+class Progress:
+    """
+    Progress of upload: rate of rows, counts of created and found records
+    by level, time spent in database and in parsing, depths of queues
+    and ETA. Report is printed every interval seconds and summary
+    is printed as json at the end.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = PROGRESS_INTERVAL,
+        quiet: bool = False,
+        total: Optional[int] = None,
+    ):
+        self.interval = interval
+        self.quiet = quiet
+        self.total = total
+        self.rows = 0
+        self.records: Dict[str, Counter] = {}
+        self.timers = Counter()
+        self._gauges: Dict[str, Callable[[], Any]] = {}
+        self._started = time.monotonic()
+        self._reported = self._started
+
+    def log(self, *values) -> None:
+        """
+        Print per-row output if progress isn't quiet.
+
+        :param values: Values to print
+        """
+
+        if not self.quiet:
+            print(*values)
+
+    def count(self, level: str, outcome: str, count: int = 1) -> None:
+        """
+        Count records of level by outcome.
+
+        :param level: Address level
+        :type level: str
+        :param outcome: What is done with records: created, found, cached
+        :type outcome: str
+        :param count: Count of records
+        :type count: int
+        """
+
+        self.records.setdefault(level, Counter())[outcome] += count
+
+    def add_rows(self, count: int) -> None:
+        """
+        Count uploaded address rows and print report if interval is passed.
+
+        :param count: Count of uploaded rows
+        :type count: int
+        """
+
+        self.rows += count
+
+        if time.monotonic() - self._reported >= self.interval:
+            self.report()
+
+    @contextmanager
+    def measure(self, timer: str) -> Iterator[None]:
+        """
+        Context manager to add time spent in it to timer.
+
+        :param timer: Name of timer
+        :type timer: str
+        """
+
+        started = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.timers[timer] += time.perf_counter() - started
+
+    def iterate(self, items: Iterable, *, timer: str) -> Iterator:
+        """
+        Generator of items which adds time of getting them to timer.
+
+        :param items: Items, e.g. lazily parsed rows
+        :type items: Iterable
+        :param timer: Name of timer
+        :type timer: str
+        :return: Item
+        :rtype: Iterator
+        """
+
+        iterator = iter(items)
+
+        while True:
+            with self.measure(timer):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+
+            yield item
+
+    def watch(self, name: str, gauge: Callable[[], Any]) -> None:
+        """
+        Report current value of gauge, e.g. depths of queues.
+
+        :param name: Name of gauge
+        :type name: str
+        :param gauge: Function to get current value
+        :type gauge: Callable[[], Any]
+        """
+
+        self._gauges[name] = gauge
+
+    def stats(self) -> dict:
+        """
+        Get current progress.
+
+        :return: Dict of rows, rate, ETA, records, timers and gauges
+        :rtype: dict
+        """
+
+        elapsed = time.monotonic() - self._started
+        rate = self.rows / elapsed if elapsed else 0.0
+        eta = None
+
+        if self.total is not None and rate:
+            eta = round(max(self.total - self.rows, 0) / rate, 1)
+
+        return {
+            "rows": self.rows,
+            "total": self.total,
+            "elapsed": round(elapsed, 3),
+            "rows_per_second": round(rate, 1),
+            "eta": eta,
+            "records": {
+                level: dict(counts) for level, counts in self.records.items()
+            },
+            "timers": {
+                timer: round(seconds, 3)
+                for timer, seconds in self.timers.items()
+            },
+            "gauges": {name: gauge() for name, gauge in self._gauges.items()},
+        }
+
+    def report(self) -> None:
+        """Print one line report of current progress."""
+
+        self._reported = time.monotonic()
+        stats = self.stats()
+        parts = [
+            f"{stats['rows']} rows",
+            f"{stats['rows_per_second']} rows/s",
+            *(
+                f"{timer} {seconds}s"
+                for timer, seconds in stats["timers"].items()
+            ),
+            *(f"{name} {value}" for name, value in stats["gauges"].items()),
+        ]
+
+        if stats["eta"] is not None:
+            parts.append(f"ETA {stats['eta']}s")
+
+        print("Progress:", ", ".join(parts))
+
+    def summary(self, **extra) -> None:
+        """
+        Print final progress as json.
+
+        :param extra: Additional stats, e.g. stats of id cache
+        """
+
+        print(json.dumps({**self.stats(), **extra}, ensure_ascii=False))
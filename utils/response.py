@@ -0,0 +1,89 @@
+from typing import Any, AsyncIterable
+
+from aiohttp import web
+
+from utils.json_serializer import to_json_bytes
+
+
+PRETTY_VALUES = ("1", "true", "yes")
+STREAM_CHUNK_SIZE = 500
+
+
+def is_pretty(request: web.Request) -> bool:
+    """
+    Check if pretty printed json is requested by `pretty` query param.
+
+    :param request: Current request
+    :type request: web.Request
+    :return: Is pretty printed json requested
+    :rtype: bool
+    """
+
+    return request.rel_url.query.get("pretty", "").lower() in PRETTY_VALUES
+
+
+def json_response(request: web.Request, data: Any) -> web.Response:
+    """
+    Make json response, compact by default or pretty printed
+    if `pretty` query param is set.
+
+    :param request: Current request
+    :type request: web.Request
+    :param data: Data to serialize in json format
+    :type data: Any
+    :return: Json response
+    :rtype: web.Response
+    """
+
+    pretty = is_pretty(request)
+
+    return web.Response(
+        body=to_json_bytes(data, pretty=pretty),
+        content_type="application/json",
+        charset="utf-8",
+    )
+
+
+async def json_array_stream_response(
+    request: web.Request, items: AsyncIterable
+) -> web.StreamResponse:
+    """
+    Stream items as json array, encoding them by chunks
+    of STREAM_CHUNK_SIZE items.
+
+    :param request: Current request
+    :type request: web.Request
+    :param items: Items to serialize in json format
+    :type items: AsyncIterable
+    :return: Prepared and finished stream response
+    :rtype: web.StreamResponse
+    """
+
+    pretty = is_pretty(request)
+    separator = b",\n" if pretty else b","
+
+    response = web.StreamResponse()
+    response.content_type = "application/json"
+    response.charset = "utf-8"
+    response.enable_chunked_encoding()
+    await response.prepare(request)
+
+    chunk = []
+    prefix = b"["
+
+    async for item in items:
+        chunk.append(to_json_bytes(item, pretty=pretty))
+
+        if len(chunk) >= STREAM_CHUNK_SIZE:
+            await response.write(prefix + separator.join(chunk))
+            chunk = []
+            prefix = separator
+
+    if chunk:
+        await response.write(prefix + separator.join(chunk))
+        prefix = separator
+
+    await response.write(b"[]" if prefix == b"[" else b"]")
+    await response.write_eof()
+
+    return response
@@ -0,0 +1,198 @@
+from collections import OrderedDict
+from functools import wraps
+import time
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from aiohttp import web
+from asyncpg.pool import PoolConnectionProxy
+
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+CACHED_HEADERS = ("Content-Type", "Link", "X-Next-Cursor")
+
+
+class ResponseCache:
+    """LRU cache of encoded responses with time to live and size caps."""
+
+    def __init__(
+        self, *, max_size: int = 10000, max_bytes: int = 0, ttl: float = 0
+    ):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.generation = 0
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """
+        Get cached response body with headers and count hit or miss.
+
+        :param key: Cache key
+        :type key: Hashable
+        :return: Response body and headers if cached, otherwise None
+        :rtype: Optional[Tuple[bytes, Dict[str, str]]]
+        """
+
+        if (entry := self._entries.get(key)) is None:
+            self.misses += 1
+            return None
+
+        expires_at, body, headers = entry
+
+        if expires_at and expires_at < time.monotonic():
+            self._pop(key)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+
+        return body, headers
+
+    def set(
+        self,
+        key: Hashable,
+        body: bytes,
+        headers: Dict[str, str],
+        *,
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Put response body into cache and evict least recently used ones
+        while cache exceeds its caps.
+
+        :param key: Cache key
+        :type key: Hashable
+        :param body: Encoded response body
+        :type body: bytes
+        :param headers: Headers of response to restore with body
+        :type headers: Dict[str, str]
+        :param generation: Cache generation when response was requested,
+            response isn't cached if cache was cleared after it
+        :type generation: Optional[int]
+        """
+
+        if generation is not None and generation != self.generation:
+            return
+
+        if self.max_size <= 0:
+            return
+
+        if self.max_bytes and len(body) > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._pop(key)
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0
+        self._entries[key] = (expires_at, body, headers)
+        self.size_bytes += len(body)
+
+        while len(self._entries) > self.max_size or (
+            self.max_bytes and self.size_bytes > self.max_bytes
+        ):
+            self._pop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+
+        self._entries.clear()
+        self.size_bytes = 0
+        self.generation += 1
+
+    async def invalidate(self, conn: PoolConnectionProxy) -> None:
+        """
+        Remove all cached responses when data version changes.
+
+        :param conn: Pool of connections to database
+        :type conn: PoolConnectionProxy
+        """
+
+        self.clear()
+
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        :return: Size, caps, hits, misses and evictions of cache
+        :rtype: dict
+        """
+
+        requests = self.hits + self.misses
+
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / requests, 4) if requests else 0.0,
+        }
+
+    def _pop(self, key: Hashable) -> None:
+        """
+        Remove cached response by key.
+
+        :param key: Cache key
+        :type key: Hashable
+        """
+
+        _, body, _ = self._entries.pop(key)
+        self.size_bytes -= len(body)
+
+
+def cached_response(handler: Handler) -> Handler:
+    """
+    Decorator which serves responses of handler from application
+    response cache. Key of response consists of handler, path params
+    and query params.
+
+    :param handler: Request handler
+    :type handler: Handler
+    :return: Decorated request handler
+    :rtype: Handler
+    """
+
+    @wraps(handler)
+    async def wrapper(request: web.Request) -> web.StreamResponse:
+        cache: ResponseCache = request.app["response_cache"]
+        key = (
+            handler.__module__,
+            handler.__name__,
+            tuple(sorted(request.match_info.items())),
+            tuple(sorted(request.rel_url.query.items())),
+        )
+
+        if (cached := cache.get(key)) is not None:
+            body, headers = cached
+            return web.Response(
+                body=body, headers={**headers, "X-Cache": "HIT"}
+            )
+
+        generation = cache.generation
+        response = await handler(request)
+
+        if response.status == 200 and isinstance(response.body, bytes):
+            headers = {
+                name: response.headers[name]
+                for name in CACHED_HEADERS
+                if name in response.headers
+            }
+            cache.set(key, response.body, headers, generation=generation)
+
+        response.headers["X-Cache"] = "MISS"
+
+        return response
+
+    return wrapper
@@ -0,0 +1,269 @@
+import codecs
+from os import path
+import struct
+from typing import BinaryIO, Iterable, Iterator
+import zlib
+
+
+CHUNK_SIZE = 64 * 1024
+
+LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+DATA_DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+
+FLAG_ENCRYPTED = 0x1
+FLAG_DATA_DESCRIPTOR = 0x8
+FLAG_UTF8 = 0x800
+
+METHOD_STORED = 0
+METHOD_DEFLATED = 8
+
+ZIP64_SIZE = 0xFFFFFFFF
+
+
+class PushbackReader:
+    """File-like reader of stream which can push back unused bytes."""
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._buffer = b""
+
+    def read(self, size: int) -> bytes:
+        """
+        Read at most size bytes, pushed back bytes go first.
+
+        :param size: Max count of bytes
+        :type size: int
+        :return: Read bytes, empty at the end of stream
+        :rtype: bytes
+        """
+
+        if self._buffer:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+            return data
+
+        return self._stream.read(size)
+
+    def read_exactly(self, size: int) -> bytes:
+        """
+        Read exactly size bytes.
+
+        :param size: Count of bytes
+        :type size: int
+        :raise ValueError: Stream ends earlier
+        :return: Read bytes
+        :rtype: bytes
+        """
+
+        data = b""
+
+        while len(data) < size:
+            if not (chunk := self.read(size - len(data))):
+                raise ValueError("Unexpected end of archive")
+            data += chunk
+
+        return data
+
+    def unread(self, data: bytes) -> None:
+        """
+        Push back bytes to be read again.
+
+        :param data: Bytes to push back
+        :type data: bytes
+        """
+
+        self._buffer = data + self._buffer
+
+
+def _iter_deflated(reader: PushbackReader, chunk_size: int) -> Iterator[bytes]:
+    """
+    Generator of decompressed chunks of deflated member data.
+    End of member is found by end of deflate stream.
+
+    :param reader: Reader positioned at member data
+    :type reader: PushbackReader
+    :param chunk_size: Count of bytes to read at once
+    :type chunk_size: int
+    :raise ValueError: Archive ends inside of member
+    :return: Decompressed chunks
+    :rtype: Iterator[bytes]
+    """
+
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+
+    while not decompressor.eof:
+        if not (chunk := reader.read(chunk_size)):
+            raise ValueError("Unexpected end of archive")
+
+        if data := decompressor.decompress(chunk):
+            yield data
+
+    reader.unread(decompressor.unused_data)
+
+
+def _iter_stored(
+    reader: PushbackReader, size: int, chunk_size: int
+) -> Iterator[bytes]:
+    """
+    Generator of chunks of stored member data.
+
+    :param reader: Reader positioned at member data
+    :type reader: PushbackReader
+    :param size: Size of member data
+    :type size: int
+    :param chunk_size: Count of bytes to read at once
+    :type chunk_size: int
+    :return: Chunks of data
+    :rtype: Iterator[bytes]
+    """
+
+    while size > 0:
+        chunk = reader.read_exactly(min(size, chunk_size))
+        size -= len(chunk)
+        yield chunk
+
+
+def _iter_member_data(
+    reader: PushbackReader,
+    *,
+    flags: int,
+    method: int,
+    crc: int,
+    compressed_size: int,
+    chunk_size: int,
+) -> Iterator[bytes]:
+    """
+    Generator of member data chunks which checks crc of data at the end.
+
+    :param reader: Reader positioned at member data
+    :type reader: PushbackReader
+    :param flags: General purpose flags of member
+    :type flags: int
+    :param method: Compression method of member
+    :type method: int
+    :param crc: Crc of member from local header
+    :type crc: int
+    :param compressed_size: Compressed size of member from local header
+    :type compressed_size: int
+    :param chunk_size: Count of bytes to read at once
+    :type chunk_size: int
+    :raise ValueError: Member can't be read from stream or it is corrupted
+    :return: Chunks of data
+    :rtype: Iterator[bytes]
+    """
+
+    has_descriptor = flags & FLAG_DATA_DESCRIPTOR
+
+    if flags & FLAG_ENCRYPTED:
+        raise ValueError("Encrypted archives aren't supported")
+
+    if method == METHOD_DEFLATED:
+        chunks = _iter_deflated(reader, chunk_size)
+    elif method == METHOD_STORED and not has_descriptor:
+        if compressed_size == ZIP64_SIZE:
+            raise ValueError("Stored zip64 members aren't supported")
+        chunks = _iter_stored(reader, compressed_size, chunk_size)
+    else:
+        raise ValueError(f"Compression method {method} isn't supported")
+
+    actual_crc = 0
+
+    for chunk in chunks:
+        actual_crc = zlib.crc32(chunk, actual_crc)
+        yield chunk
+
+    if has_descriptor:
+        # Signature of data descriptor is optional
+        if (signature := reader.read_exactly(4)) == DATA_DESCRIPTOR_SIGNATURE:
+            signature = reader.read_exactly(4)
+        (crc,) = struct.unpack("<I", signature)
+        reader.read_exactly(8)
+
+    if actual_crc != crc:
+        raise ValueError("Bad crc of archive member")
+
+
+def iter_zip_member(
+    reader: PushbackReader, *, name: str, chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Generator of decompressed chunks of archive member read from
+    not seekable stream by local file headers.
+
+    :param reader: Reader of zip archive stream
+    :type reader: PushbackReader
+    :param name: File name of member without directories
+    :type name: str
+    :param chunk_size: Count of bytes to read at once
+    :type chunk_size: int
+    :raise ValueError: Member isn't found or it can't be read from stream
+    :return: Decompressed chunks
+    :rtype: Iterator[bytes]
+    """
+
+    while True:
+        header = reader.read(LOCAL_HEADER.size)
+
+        if len(header) < 4 or header[:4] != LOCAL_HEADER_SIGNATURE:
+            raise ValueError(f"Member {name} isn't found in archive")
+
+        header += reader.read_exactly(LOCAL_HEADER.size - len(header))
+        (
+            _,
+            _,
+            flags,
+            method,
+            _,
+            _,
+            crc,
+            compressed_size,
+            _,
+            name_length,
+            extra_length,
+        ) = LOCAL_HEADER.unpack(header)
+
+        member_name = reader.read_exactly(name_length).decode(
+            "utf-8" if flags & FLAG_UTF8 else "cp437"
+        )
+        reader.read_exactly(extra_length)
+
+        member_data = _iter_member_data(
+            reader,
+            flags=flags,
+            method=method,
+            crc=crc,
+            compressed_size=compressed_size,
+            chunk_size=chunk_size,
+        )
+
+        if path.basename(member_name) == name:
+            yield from member_data
+            return
+
+        for _ in member_data:
+            pass
+
+
+def iter_lines(chunks: Iterable[bytes], *, encoding: str) -> Iterator[str]:
+    """
+    Generator of decoded lines with line endings from chunks of bytes.
+
+    :param chunks: Chunks of encoded text
+    :type chunks: Iterable[bytes]
+    :param encoding: Encoding of text
+    :type encoding: str
+    :return: Lines of text
+    :rtype: Iterator[str]
+    """
+
+    decoder = codecs.getincrementaldecoder(encoding)()
+    tail = ""
+
+    for chunk in chunks:
+        *lines, tail = (tail + decoder.decode(chunk)).split("\n")
+
+        for line in lines:
+            yield line + "\n"
+
+    if tail := tail + decoder.decode(b"", final=True):
+        yield tail
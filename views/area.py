@@ -5,9 +5,14 @@ from logic.api import (
     get_all_areas_in_region,
     get_area,
 )
-from utils.json_serializer import to_json
+from utils.http_cache import cache_class
+from utils.pagination import get_page_params, paginated_json_response
+from utils.response import json_response
+from utils.response_cache import cached_response
 
 
+@cache_class("hierarchy")
+@cached_response
 async def all_areas_in_region(request: web.Request):
     """
     ---
@@ -33,6 +38,16 @@ async def all_areas_in_region(request: web.Request):
           default: 200
           type: int
           requires: false
+        - in: query
+          name: cursor
+          description: Cursor of the next page from X-Next-Cursor header.
+          type: str
+          requires: false
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
     responses:
         "200":
             description: List of areas.
@@ -47,22 +62,28 @@ async def all_areas_in_region(request: web.Request):
     region_id = int(request.match_info.get("region_id", "0"))
 
     q = request.rel_url.query.get("q")
-    limit = int(request.rel_url.query.get("limit", "0"))
+    limit, after_id = get_page_params(request)
 
     async with request.app["db"].acquire() as conn:
 
         if q:
             areas_objects = await get_areas_in_region_by_substring(
-                conn, region_id=region_id, substring=q, limit=limit
+                conn,
+                region_id=region_id,
+                substring=q,
+                limit=limit,
+                after_id=after_id,
             )
         else:
             areas_objects = await get_all_areas_in_region(
-                conn, region_id=region_id, limit=limit
+                conn, region_id=region_id, limit=limit, after_id=after_id
             )
 
-    return web.json_response(text=to_json(areas_objects))
+    return paginated_json_response(request, areas_objects, limit=limit)
 
 
+@cache_class("hierarchy")
+@cached_response
 async def get_one_area(request: web.Request):
     """
     ---
@@ -78,6 +99,11 @@ async def get_one_area(request: web.Request):
           description: Area id.
           type: int
           required: true
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
     responses:
         "200":
             description: Area object.
@@ -93,4 +119,4 @@ async def get_one_area(request: web.Request):
 
         area_object = await get_area(conn, area_id=area_id)
 
-    return web.json_response(text=to_json(area_object))
+    return json_response(request, area_object)
@@ -0,0 +1,125 @@
+from aiohttp import web
+
+from utils.http_cache import cache_class
+from utils.response import json_response
+
+
+@cache_class("autocomplete")
+async def autocomplete_street(request: web.Request):
+    """
+    ---
+    description: Get streets of locality by prefix of any word in name.
+        Matches at the start of the name go first, then shorter names.
+    tags:
+        - Autocomplete
+    produces:
+        - application/json
+    parameters:
+        - in: query
+          name: locality_id
+          description: Locality for street.
+          type: int
+          required: true
+        - in: query
+          name: q
+          description: Prefix to search.
+          type: str
+          required: true
+        - in: query
+          name: limit
+          description: Max count of streets in list. Maximum is 200.
+          default: 200
+          type: int
+          requires: false
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
+    responses:
+        "200":
+            description: List of streets.
+            content:
+                application/json:
+                    schema:
+                        type: array
+                        items:
+                            $ref: "#/components/schemas/Street"
+        "400":
+            description: Locality id isn't set.
+    """
+
+    locality_id = request.rel_url.query.get("locality_id", "")
+
+    if not locality_id.isdigit():
+        raise web.HTTPBadRequest(text="locality_id is required")
+
+    q = request.rel_url.query.get("q", "")
+    limit = int(request.rel_url.query.get("limit", "0"))
+
+    streets_objects = request.app["autocomplete"].streets.search(
+        prefix=q, parent_id=int(locality_id), limit=limit
+    )
+
+    return json_response(request, streets_objects)
+
+
+@cache_class("autocomplete")
+async def autocomplete_locality(request: web.Request):
+    """
+    ---
+    description: Get localities by prefix of any word in name.
+        Matches at the start of the name go first, then shorter names.
+    tags:
+        - Autocomplete
+    produces:
+        - application/json
+    parameters:
+        - in: query
+          name: area_id
+          description: Area for locality.
+          type: int
+          requires: false
+        - in: query
+          name: q
+          description: Prefix to search.
+          type: str
+          required: true
+        - in: query
+          name: limit
+          description: Max count of localities in list. Maximum is 200.
+          default: 200
+          type: int
+          requires: false
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
+    responses:
+        "200":
+            description: List of localities.
+            content:
+                application/json:
+                    schema:
+                        type: array
+                        items:
+                            $ref: "#/components/schemas/Locality"
+    """
+
+    area_id = request.rel_url.query.get("area_id", "")
+    q = request.rel_url.query.get("q", "")
+    limit = int(request.rel_url.query.get("limit", "0"))
+
+    autocomplete = request.app["autocomplete"]
+
+    if area_id.isdigit():
+        localities_objects = autocomplete.localities_in_area.search(
+            prefix=q, parent_id=int(area_id), limit=limit
+        )
+    else:
+        localities_objects = autocomplete.localities.search(
+            prefix=q, limit=limit
+        )
+
+    return json_response(request, localities_objects)
@@ -5,9 +5,14 @@ from logic.api import (
     get_countries_by_substring,
     get_country,
 )
-from utils.json_serializer import to_json
+from utils.http_cache import cache_class
+from utils.pagination import get_page_params, paginated_json_response
+from utils.response import json_response
+from utils.response_cache import cached_response
 
 
+@cache_class("hierarchy")
+@cached_response
 async def all_countries(request: web.Request):
     """
     ---
@@ -28,6 +33,16 @@ async def all_countries(request: web.Request):
           default: 200
           type: int
           requires: false
+        - in: query
+          name: cursor
+          description: Cursor of the next page from X-Next-Cursor header.
+          type: str
+          requires: false
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
     responses:
         "200":
             description: Country object.
@@ -39,21 +54,25 @@ async def all_countries(request: web.Request):
                             $ref: "#/components/schemas/Country"
     """
 
-    q = request.match_info.get("q")
-    limit = int(request.match_info.get("limit", "0"))
+    q = request.rel_url.query.get("q")
+    limit, after_id = get_page_params(request)
 
     async with request.app["db"].acquire() as conn:
 
         if q:
             countries_objects = await get_countries_by_substring(
-                conn, substring=q, limit=limit
+                conn, substring=q, limit=limit, after_id=after_id
             )
         else:
-            countries_objects = await get_all_countries(conn, limit=limit)
+            countries_objects = await get_all_countries(
+                conn, limit=limit, after_id=after_id
+            )
 
-    return web.json_response(text=to_json(countries_objects))
+    return paginated_json_response(request, countries_objects, limit=limit)
 
 
+@cache_class("hierarchy")
+@cached_response
 async def get_one_country(request: web.Request):
     """
     ---
@@ -69,6 +88,11 @@ async def get_one_country(request: web.Request):
           description: Country id.
           type: int
           required: true
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
     responses:
         "200":
             description: Country object.
@@ -84,4 +108,4 @@ async def get_one_country(request: web.Request):
 
         country_object = await get_country(conn, country_id=country_id)
 
-    return web.json_response(text=to_json(country_object))
+    return json_response(request, country_object)
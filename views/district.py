@@ -5,9 +5,14 @@ from logic.api import (
     get_all_districts_in_locality,
     get_district,
 )
-from utils.json_serializer import to_json
+from utils.http_cache import cache_class
+from utils.pagination import get_page_params, paginated_json_response
+from utils.response import json_response
+from utils.response_cache import cached_response
 
 
+@cache_class("hierarchy")
+@cached_response
 async def all_districts_in_locality(request: web.Request):
     """
     ---
@@ -33,6 +38,16 @@ async def all_districts_in_locality(request: web.Request):
           default: 200
           type: int
           requires: false
+        - in: query
+          name: cursor
+          description: Cursor of the next page from X-Next-Cursor header.
+          type: str
+          requires: false
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
     responses:
         "200":
             description: List of districts.
@@ -47,22 +62,28 @@ async def all_districts_in_locality(request: web.Request):
     locality_id = int(request.match_info.get("locality_id", "0"))
 
     q = request.rel_url.query.get("q")
-    limit = int(request.rel_url.query.get("limit", "0"))
+    limit, after_id = get_page_params(request)
 
     async with request.app["db"].acquire() as conn:
 
         if q:
             districts_objects = await get_districts_in_locality_by_substring(
-                conn, locality_id=locality_id, substring=q, limit=limit
+                conn,
+                locality_id=locality_id,
+                substring=q,
+                limit=limit,
+                after_id=after_id,
             )
         else:
             districts_objects = await get_all_districts_in_locality(
-                conn, locality_id=locality_id, limit=limit
+                conn, locality_id=locality_id, limit=limit, after_id=after_id
             )
 
-    return web.json_response(text=to_json(districts_objects))
+    return paginated_json_response(request, districts_objects, limit=limit)
 
 
+@cache_class("hierarchy")
+@cached_response
 async def get_one_district(request: web.Request):
     """
     ---
@@ -78,6 +99,11 @@ async def get_one_district(request: web.Request):
           description: District id.
           type: int
           required: true
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
     responses:
         "200":
             description: District object.
@@ -93,4 +119,4 @@ async def get_one_district(request: web.Request):
 
         district_object = await get_district(conn, district_id=district_id)
 
-    return web.json_response(text=to_json(district_object))
+    return json_response(request, district_object)
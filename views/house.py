@@ -1,14 +1,23 @@
+import json
+
 from aiohttp import web
 
 from logic.api import (
+    FULL_ADDRESSES_MAX_SIZE,
+    HOUSE_ID_MAX,
+    HOUSE_ID_MIN,
     get_houses_in_street_by_substring,
     get_all_houses_in_street,
     get_house,
     get_full_address_by_house,
+    get_full_addresses_by_houses,
 )
-from utils.json_serializer import to_json
+from utils.http_cache import cache_class
+from utils.pagination import get_page_params, paginated_json_response
+from utils.response import json_array_stream_response, json_response
 
 
+@cache_class("house")
 async def all_houses_in_street(request: web.Request):
     """
     ---
@@ -34,6 +43,16 @@ async def all_houses_in_street(request: web.Request):
           default: 200
           type: int
           requires: false
+        - in: query
+          name: cursor
+          description: Cursor of the next page from X-Next-Cursor header.
+          type: str
+          requires: false
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
     responses:
         "200":
             description: List of houses.
@@ -48,22 +67,27 @@ async def all_houses_in_street(request: web.Request):
     street_id = int(request.match_info.get("street_id", "0"))
 
     q = request.rel_url.query.get("q")
-    limit = int(request.rel_url.query.get("limit", "0"))
+    limit, after_id = get_page_params(request)
 
     async with request.app["db"].acquire() as conn:
 
         if q:
             streets_objects = await get_houses_in_street_by_substring(
-                conn, street_id=street_id, substring=q, limit=limit
+                conn,
+                street_id=street_id,
+                substring=q,
+                limit=limit,
+                after_id=after_id,
             )
         else:
             streets_objects = await get_all_houses_in_street(
-                conn, street_id=street_id, limit=limit
+                conn, street_id=street_id, limit=limit, after_id=after_id
             )
 
-    return web.json_response(text=to_json(streets_objects))
+    return paginated_json_response(request, streets_objects, limit=limit)
 
 
+@cache_class("house")
 async def get_one_house(request: web.Request):
     """
     ---
@@ -79,6 +103,11 @@ async def get_one_house(request: web.Request):
           description: House id.
           type: int
           required: true
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
     responses:
         "200":
             description: House object.
@@ -94,9 +123,10 @@ async def get_one_house(request: web.Request):
 
         house_object = await get_house(conn, house_id=house_id)
 
-    return web.json_response(text=to_json(house_object))
+    return json_response(request, house_object)
 
 
+@cache_class("house")
 async def get_full_address_by_one_house(request: web.Request):
     """
     ---
@@ -112,6 +142,11 @@ async def get_full_address_by_one_house(request: web.Request):
           description: House id.
           type: int
           required: true
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
     responses:
         "200":
             description: Full address object by house.
@@ -125,6 +160,82 @@ async def get_full_address_by_one_house(request: web.Request):
 
     async with request.app["db"].acquire() as conn:
 
-        full_address = await get_full_address_by_house(conn, house_id=house_id)
+        full_address = await get_full_address_by_house(
+            conn,
+            house_id=house_id,
+            flat=request.app["config"]["use_address_flat"],
+        )
+
+    return json_response(request, full_address)
+
+
+async def full_addresses_by_houses(request: web.Request):
+    """
+    ---
+    description: Get full addresses by list of house ids in one query.
+        Addresses are streamed ordered by house id, unknown ids are skipped.
+    method: POST
+    tags:
+        - Houses
+    consumes:
+        - application/json
+    produces:
+        - application/json
+    parameters:
+        - in: body
+          name: house_ids
+          description: List of house ids. Maximum size is 5000.
+          required: true
+          schema:
+              type: array
+              items:
+                  type: integer
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
+    responses:
+        "200":
+            description: List of full address objects with house id.
+            content:
+                application/json:
+                    schema:
+                        type: array
+                        items:
+                            $ref: "#/components/schemas/FullAddress"
+        "400":
+            description: Body isn't a list of house ids, ids are out
+                of integer range or list is too long.
+    """
+
+    try:
+        house_ids = await request.json()
+    except json.JSONDecodeError:
+        raise web.HTTPBadRequest(text="body must be a json list of house ids")
+
+    if not isinstance(house_ids, list) or not all(
+        isinstance(house_id, int)
+        and not isinstance(house_id, bool)
+        and HOUSE_ID_MIN <= house_id <= HOUSE_ID_MAX
+        for house_id in house_ids
+    ):
+        raise web.HTTPBadRequest(text="body must be a json list of house ids")
+
+    house_ids = sorted(set(house_ids))
+
+    if len(house_ids) > FULL_ADDRESSES_MAX_SIZE:
+        raise web.HTTPBadRequest(
+            text=f"max count of house ids is {FULL_ADDRESSES_MAX_SIZE}"
+        )
+
+    async with request.app["db"].acquire() as conn:
+        async with conn.transaction():
+
+            full_addresses = get_full_addresses_by_houses(
+                conn,
+                house_ids=house_ids,
+                flat=request.app["config"]["use_address_flat"],
+            )
 
-    return web.json_response(text=to_json(full_address))
+            return await json_array_stream_response(request, full_addresses)
@@ -7,9 +7,12 @@ from logic.api import (
     get_localities_by_substring,
     get_all_localities,
 )
-from utils.json_serializer import to_json
+from utils.http_cache import cache_class
+from utils.pagination import get_page_params, paginated_json_response
+from utils.response import json_response
 
 
+@cache_class("hierarchy")
 async def all_localities(request: web.Request):
     """
     ---
@@ -30,6 +33,16 @@ async def all_localities(request: web.Request):
           default: 200
           type: int
           requires: false
+        - in: query
+          name: cursor
+          description: Cursor of the next page from X-Next-Cursor header.
+          type: str
+          requires: false
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
     responses:
         "200":
             description: List of localities.
@@ -42,20 +55,23 @@ async def all_localities(request: web.Request):
     """
 
     q = request.rel_url.query.get("q")
-    limit = int(request.rel_url.query.get("limit", "0"))
+    limit, after_id = get_page_params(request)
 
     async with request.app["db"].acquire() as conn:
 
         if q:
             localities_objects = await get_localities_by_substring(
-                conn, substring=q, limit=limit
+                conn, substring=q, limit=limit, after_id=after_id
             )
         else:
-            localities_objects = await get_all_localities(conn, limit=limit)
+            localities_objects = await get_all_localities(
+                conn, limit=limit, after_id=after_id
+            )
 
-    return web.json_response(text=to_json(localities_objects))
+    return paginated_json_response(request, localities_objects, limit=limit)
 
 
+@cache_class("hierarchy")
 async def all_localities_in_area(request: web.Request):
     """
     ---
@@ -81,6 +97,16 @@ async def all_localities_in_area(request: web.Request):
           default: 200
           type: int
           requires: false
+        - in: query
+          name: cursor
+          description: Cursor of the next page from X-Next-Cursor header.
+          type: str
+          requires: false
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
     responses:
         "200":
             description: List of localities.
@@ -95,22 +121,27 @@ async def all_localities_in_area(request: web.Request):
     area_id = int(request.match_info.get("area_id", "0"))
 
     q = request.rel_url.query.get("q")
-    limit = int(request.rel_url.query.get("limit", "0"))
+    limit, after_id = get_page_params(request)
 
     async with request.app["db"].acquire() as conn:
 
         if q:
             localities_objects = await get_localities_in_area_by_substring(
-                conn, area_id=area_id, substring=q, limit=limit
+                conn,
+                area_id=area_id,
+                substring=q,
+                limit=limit,
+                after_id=after_id,
             )
         else:
             localities_objects = await get_all_localities_in_area(
-                conn, area_id=area_id, limit=limit
+                conn, area_id=area_id, limit=limit, after_id=after_id
             )
 
-    return web.json_response(text=to_json(localities_objects))
+    return paginated_json_response(request, localities_objects, limit=limit)
 
 
+@cache_class("hierarchy")
 async def get_one_locality(request: web.Request):
     """
     ---
@@ -126,6 +157,11 @@ async def get_one_locality(request: web.Request):
           description: Locality id.
           type: int
           required: true
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
     responses:
         "200":
             description: Locality object.
@@ -141,4 +177,4 @@ async def get_one_locality(request: web.Request):
 
         locality_object = await get_locality(conn, locality_id=locality_id)
 
-    return web.json_response(text=to_json(locality_object))
+    return json_response(request, locality_object)
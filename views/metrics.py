@@ -0,0 +1,36 @@
+from aiohttp import web
+
+from utils.http_cache import cache_class
+from utils.metrics import CONTENT_TYPE, read_metrics
+
+
+@cache_class("metrics")
+async def get_metrics(request: web.Request):
+    """
+    ---
+    description: Get metrics of requests by route and of database pools
+        in Prometheus text exposition format. Metrics of all workers
+        are merged if METRICS_DIR is set, otherwise they are metrics
+        of the worker which answers the request.
+    tags:
+        - Stats
+    produces:
+        - text/plain
+    responses:
+        "200":
+            description: Metrics in text exposition format.
+    """
+
+    metrics = request.app["metrics"]
+    pool_stats = request.app["db"].stats()
+
+    if metrics_dir := request.app["config"]["metrics_dir"]:
+        metrics, pool_stats = read_metrics(
+            metrics_dir, metrics, pool_stats=pool_stats
+        )
+
+    text = metrics.render(pool_stats=pool_stats)
+
+    return web.Response(
+        body=text.encode("utf-8"), headers={"Content-Type": CONTENT_TYPE}
+    )
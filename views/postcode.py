@@ -0,0 +1,230 @@
+from aiohttp import web
+
+from logic.api import (
+    get_postcode_streets,
+    get_localities_by_postcode,
+    get_streets_by_postcode,
+    get_houses_by_postcode,
+)
+from utils.http_cache import cache_class
+from utils.pagination import get_page_params, paginated_json_response
+
+
+@cache_class("postcode")
+async def postcode_streets(request: web.Request):
+    """
+    ---
+    description: Get localities and streets with postcode.
+        Partial postcode is searched as prefix.
+    tags:
+        - Postcodes
+    produces:
+        - application/json
+    parameters:
+        - in: path
+          name: code
+          description: Postcode or its beginning.
+          type: str
+          required: true
+        - in: query
+          name: limit
+          description: Max count of postcodes in list. Maximum is 200.
+          default: 200
+          type: int
+          requires: false
+        - in: query
+          name: cursor
+          description: Cursor of the next page from X-Next-Cursor header.
+          type: str
+          requires: false
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
+    responses:
+        "200":
+            description: List of postcodes with locality and street.
+            content:
+                application/json:
+                    schema:
+                        type: array
+                        items:
+                            $ref: "#/components/schemas/PostcodeStreet"
+    """
+
+    code = request.match_info["code"]
+    limit, after_id = get_page_params(request)
+
+    async with request.app["db"].acquire() as conn:
+
+        postcodes_objects = await get_postcode_streets(
+            conn, code=code, limit=limit, after_id=after_id
+        )
+
+    return paginated_json_response(request, postcodes_objects, limit=limit)
+
+
+@cache_class("postcode")
+async def localities_by_postcode(request: web.Request):
+    """
+    ---
+    description: Get localities with postcode.
+        Partial postcode is searched as prefix.
+    tags:
+        - Postcodes
+    produces:
+        - application/json
+    parameters:
+        - in: path
+          name: code
+          description: Postcode or its beginning.
+          type: str
+          required: true
+        - in: query
+          name: limit
+          description: Max count of localities in list. Maximum is 200.
+          default: 200
+          type: int
+          requires: false
+        - in: query
+          name: cursor
+          description: Cursor of the next page from X-Next-Cursor header.
+          type: str
+          requires: false
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
+    responses:
+        "200":
+            description: List of localities.
+            content:
+                application/json:
+                    schema:
+                        type: array
+                        items:
+                            $ref: "#/components/schemas/Locality"
+    """
+
+    code = request.match_info["code"]
+    limit, after_id = get_page_params(request)
+
+    async with request.app["db"].acquire() as conn:
+
+        localities_objects = await get_localities_by_postcode(
+            conn, code=code, limit=limit, after_id=after_id
+        )
+
+    return paginated_json_response(request, localities_objects, limit=limit)
+
+
+@cache_class("postcode")
+async def streets_by_postcode(request: web.Request):
+    """
+    ---
+    description: Get streets with postcode.
+        Partial postcode is searched as prefix.
+    tags:
+        - Postcodes
+    produces:
+        - application/json
+    parameters:
+        - in: path
+          name: code
+          description: Postcode or its beginning.
+          type: str
+          required: true
+        - in: query
+          name: limit
+          description: Max count of streets in list. Maximum is 200.
+          default: 200
+          type: int
+          requires: false
+        - in: query
+          name: cursor
+          description: Cursor of the next page from X-Next-Cursor header.
+          type: str
+          requires: false
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
+    responses:
+        "200":
+            description: List of streets.
+            content:
+                application/json:
+                    schema:
+                        type: array
+                        items:
+                            $ref: "#/components/schemas/Street"
+    """
+
+    code = request.match_info["code"]
+    limit, after_id = get_page_params(request)
+
+    async with request.app["db"].acquire() as conn:
+
+        streets_objects = await get_streets_by_postcode(
+            conn, code=code, limit=limit, after_id=after_id
+        )
+
+    return paginated_json_response(request, streets_objects, limit=limit)
+
+
+@cache_class("postcode")
+async def houses_by_postcode(request: web.Request):
+    """
+    ---
+    description: Get houses with postcode.
+        Partial postcode is searched as prefix.
+    tags:
+        - Postcodes
+    produces:
+        - application/json
+    parameters:
+        - in: path
+          name: code
+          description: Postcode or its beginning.
+          type: str
+          required: true
+        - in: query
+          name: limit
+          description: Max count of houses in list. Maximum is 200.
+          default: 200
+          type: int
+          requires: false
+        - in: query
+          name: cursor
+          description: Cursor of the next page from X-Next-Cursor header.
+          type: str
+          requires: false
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
+    responses:
+        "200":
+            description: List of houses.
+            content:
+                application/json:
+                    schema:
+                        type: array
+                        items:
+                            $ref: "#/components/schemas/House"
+    """
+
+    code = request.match_info["code"]
+    limit, after_id = get_page_params(request)
+
+    async with request.app["db"].acquire() as conn:
+
+        houses_objects = await get_houses_by_postcode(
+            conn, code=code, limit=limit, after_id=after_id
+        )
+
+    return paginated_json_response(request, houses_objects, limit=limit)
@@ -5,9 +5,14 @@ from logic.api import (
     get_all_regions_in_country,
     get_region,
 )
-from utils.json_serializer import to_json
+from utils.http_cache import cache_class
+from utils.pagination import get_page_params, paginated_json_response
+from utils.response import json_response
+from utils.response_cache import cached_response
 
 
+@cache_class("hierarchy")
+@cached_response
 async def all_regions_in_country(request: web.Request):
     """
     ---
@@ -33,6 +38,16 @@ async def all_regions_in_country(request: web.Request):
           default: 200
           type: int
           requires: false
+        - in: query
+          name: cursor
+          description: Cursor of the next page from X-Next-Cursor header.
+          type: str
+          requires: false
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
     responses:
         "200":
             description: List of regions.
@@ -47,22 +62,28 @@ async def all_regions_in_country(request: web.Request):
     country_id = int(request.match_info.get("country_id", "0"))
 
     q = request.rel_url.query.get("q")
-    limit = int(request.rel_url.query.get("limit", "0"))
+    limit, after_id = get_page_params(request)
 
     async with request.app["db"].acquire() as conn:
 
         if q:
             regions_objects = await get_regions_in_country_by_substring(
-                conn, country_id=country_id, substring=q, limit=limit
+                conn,
+                country_id=country_id,
+                substring=q,
+                limit=limit,
+                after_id=after_id,
             )
         else:
             regions_objects = await get_all_regions_in_country(
-                conn, country_id=country_id, limit=limit
+                conn, country_id=country_id, limit=limit, after_id=after_id
             )
 
-    return web.json_response(text=to_json(regions_objects))
+    return paginated_json_response(request, regions_objects, limit=limit)
 
 
+@cache_class("hierarchy")
+@cached_response
 async def get_one_region(request: web.Request):
     """
     ---
@@ -78,6 +99,11 @@ async def get_one_region(request: web.Request):
           description: Region id.
           type: int
           required: true
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
     responses:
         "200":
             description: Region object.
@@ -93,4 +119,4 @@ async def get_one_region(request: web.Request):
 
         region_object = await get_region(conn, region_id=region_id)
 
-    return web.json_response(text=to_json(region_object))
+    return json_response(request, region_object)
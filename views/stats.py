@@ -0,0 +1,35 @@
+from aiohttp import web
+
+from utils.http_cache import cache_class
+from utils.response import json_response
+
+
+@cache_class("stats")
+async def get_stats(request: web.Request):
+    """
+    ---
+    description: Get live stats of database pool and response cache
+        of the worker which answers the request.
+    tags:
+        - Stats
+    produces:
+        - application/json
+    parameters:
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
+    responses:
+        "200":
+            description: Stats of database pool and response cache.
+    """
+
+    return json_response(
+        request,
+        {
+            "data_version": request.app["data_version"].value,
+            "db_pool": request.app["db"].stats(),
+            "response_cache": request.app["response_cache"].stats(),
+        },
+    )
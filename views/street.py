@@ -7,9 +7,12 @@ from logic.api import (
     get_all_streets_in_locality,
     get_street,
 )
-from utils.json_serializer import to_json
+from utils.http_cache import cache_class
+from utils.pagination import get_page_params, paginated_json_response
+from utils.response import json_response
 
 
+@cache_class("street")
 async def all_streets_in_district(request: web.Request):
     """
     ---
@@ -35,6 +38,16 @@ async def all_streets_in_district(request: web.Request):
           default: 200
           type: int
           requires: false
+        - in: query
+          name: cursor
+          description: Cursor of the next page from X-Next-Cursor header.
+          type: str
+          requires: false
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
     responses:
         "200":
             description: List of streets.
@@ -49,22 +62,27 @@ async def all_streets_in_district(request: web.Request):
     district_id = int(request.match_info.get("district_id", "0"))
 
     q = request.rel_url.query.get("q")
-    limit = int(request.rel_url.query.get("limit", "0"))
+    limit, after_id = get_page_params(request)
 
     async with request.app["db"].acquire() as conn:
 
         if q:
             streets_objects = await get_streets_in_district_by_substring(
-                conn, district_id=district_id, substring=q, limit=limit
+                conn,
+                district_id=district_id,
+                substring=q,
+                limit=limit,
+                after_id=after_id,
             )
         else:
             streets_objects = await get_all_streets_in_district(
-                conn, district_id=district_id, limit=limit
+                conn, district_id=district_id, limit=limit, after_id=after_id
             )
 
-    return web.json_response(text=to_json(streets_objects))
+    return paginated_json_response(request, streets_objects, limit=limit)
 
 
+@cache_class("street")
 async def all_streets_in_locality(request: web.Request):
     """
     ---
@@ -90,6 +108,16 @@ async def all_streets_in_locality(request: web.Request):
           default: 200
           type: int
           requires: false
+        - in: query
+          name: cursor
+          description: Cursor of the next page from X-Next-Cursor header.
+          type: str
+          requires: false
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
     responses:
         "200":
             description: List of streets.
@@ -104,22 +132,27 @@ async def all_streets_in_locality(request: web.Request):
     locality_id = int(request.match_info.get("locality_id", "0"))
 
     q = request.rel_url.query.get("q")
-    limit = int(request.rel_url.query.get("limit", "0"))
+    limit, after_id = get_page_params(request)
 
     async with request.app["db"].acquire() as conn:
 
         if q:
             streets_objects = await get_streets_in_locality_by_substring(
-                conn, locality_id=locality_id, substring=q, limit=limit
+                conn,
+                locality_id=locality_id,
+                substring=q,
+                limit=limit,
+                after_id=after_id,
             )
         else:
             streets_objects = await get_all_streets_in_locality(
-                conn, locality_id=locality_id, limit=limit
+                conn, locality_id=locality_id, limit=limit, after_id=after_id
             )
 
-    return web.json_response(text=to_json(streets_objects))
+    return paginated_json_response(request, streets_objects, limit=limit)
 
 
+@cache_class("street")
 async def get_one_street(request: web.Request):
     """
     ---
@@ -135,6 +168,11 @@ async def get_one_street(request: web.Request):
           description: Street id.
           type: int
           required: true
+        - in: query
+          name: pretty
+          description: Indent json response.
+          type: bool
+          requires: false
     responses:
         "200":
             description: Street object.
@@ -150,4 +188,4 @@ async def get_one_street(request: web.Request):
 
         street_object = await get_street(conn, street_id=street_id)
 
-    return web.json_response(text=to_json(street_object))
+    return json_response(request, street_object)